@@ -73,6 +73,63 @@ func (s *SmartContract) CreateAsset(ctx contractapi.TransactionContextInterface,
 	return ctx.GetStub().PutState(id, assetJSON)
 }
 
+// BatchResult reports the outcome for a single asset of a CreateAssets call
+type BatchResult struct {
+	ID      string `json:"ID"`
+	Created bool   `json:"created"`
+	Error   string `json:"error,omitempty"`
+}
+
+// CreateAssets issues many new assets to the world state in a single transaction.
+// Assets that already exist (or appear twice in the batch) are skipped and reported in the result.
+func (s *SmartContract) CreateAssets(ctx contractapi.TransactionContextInterface, assetsJSON string) ([]*BatchResult, error) {
+	var assets []Asset
+	err := json.Unmarshal([]byte(assetsJSON), &assets)
+	if err != nil {
+		return nil, fmt.Errorf("failed to parse assets: %v", err)
+	}
+
+	results := make([]*BatchResult, 0, len(assets))
+	// GetState does not see writes of the current transaction, so duplicates are tracked here
+	seen := make(map[string]bool, len(assets))
+	for _, asset := range assets {
+		result := &BatchResult{ID: asset.ID}
+		results = append(results, result)
+
+		if asset.ID == "" {
+			result.Error = "asset ID is required"
+			continue
+		}
+		if seen[asset.ID] {
+			result.Error = fmt.Sprintf("the asset %s is duplicated in the batch", asset.ID)
+			continue
+		}
+		seen[asset.ID] = true
+
+		exists, err := s.AssetExists(ctx, asset.ID)
+		if err != nil {
+			return nil, err
+		}
+		if exists {
+			result.Error = fmt.Sprintf("the asset %s already exists", asset.ID)
+			continue
+		}
+
+		assetJSON, err := json.Marshal(asset)
+		if err != nil {
+			return nil, err
+		}
+
+		err = ctx.GetStub().PutState(asset.ID, assetJSON)
+		if err != nil {
+			return nil, fmt.Errorf("failed to put to world state. %v", err)
+		}
+		result.Created = true
+	}
+
+	return results, nil
+}
+
 // ReadAsset returns the asset stored in the world state with given id.
 func (s *SmartContract) ReadAsset(ctx contractapi.TransactionContextInterface, id string) (*Asset, error) {
 	assetJSON, err := ctx.GetStub().GetState(id)
@@ -192,6 +249,44 @@ func (s *SmartContract) GetAllAssets(ctx contractapi.TransactionContextInterface
 	return assets, nil
 }
 
+// PaginatedQueryResult structure used for returning paginated query results and metadata
+type PaginatedQueryResult struct {
+	Records             []*Asset `json:"records"`
+	FetchedRecordsCount int32    `json:"fetchedRecordsCount"`
+	Bookmark            string   `json:"bookmark"`
+}
+
+// GetAssetsWithPagination returns one page of assets found in world state, starting at the bookmark.
+// An empty bookmark starts from the first asset; the returned bookmark is empty after the last page.
+func (s *SmartContract) GetAssetsWithPagination(ctx contractapi.TransactionContextInterface, pageSize int32, bookmark string) (*PaginatedQueryResult, error) {
+	resultsIterator, responseMetadata, err := ctx.GetStub().GetStateByRangeWithPagination("", "", pageSize, bookmark)
+	if err != nil {
+		return nil, err
+	}
+	defer resultsIterator.Close()
+
+	assets := make([]*Asset, 0, pageSize)
+	for resultsIterator.HasNext() {
+		queryResponse, err := resultsIterator.Next()
+		if err != nil {
+			return nil, err
+		}
+
+		var asset Asset
+		err = json.Unmarshal(queryResponse.Value, &asset)
+		if err != nil {
+			return nil, err
+		}
+		assets = append(assets, &asset)
+	}
+
+	return &PaginatedQueryResult{
+		Records:             assets,
+		FetchedRecordsCount: responseMetadata.FetchedRecordsCount,
+		Bookmark:            responseMetadata.Bookmark,
+	}, nil
+}
+
 func main() {
 	assetChaincode, err := contractapi.NewChaincode(&SmartContract{})
 	if err != nil {
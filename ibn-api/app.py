@@ -66,11 +66,13 @@ def main():
                 'blockchain_network': 'IBN Hyperledger Fabric',
                 'supported_operations': [
                     'CreateAsset',
+                    'CreateAssets',
                     'ReadAsset', 
                     'UpdateAsset',
                     'DeleteAsset',
                     'TransferAsset',
                     'GetAllAssets',
+                    'GetAssetsWithPagination',
                     'AssetExists',
                     'InitLedger'
                 ],
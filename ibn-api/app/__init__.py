@@ -1,5 +1,4 @@
 from flask import Flask, render_template
-from flask_pymongo import PyMongo
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
@@ -7,8 +6,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Initialize extensions
-mongo = PyMongo()
+from app.services.mongo_pool import SharedPyMongo
+
+# Initialize extensions (the MongoDB client is shared with AuthService and RBACService)
+mongo = SharedPyMongo()
 
 def create_app():
     """Application factory pattern"""
@@ -45,7 +46,23 @@ def create_app():
     app.register_blueprint(auth_bp)  # Auth routes include /api/auth prefix
     app.register_blueprint(users_bp)  # User routes include /api/users prefix
     app.register_blueprint(roles_bp)  # Role routes include /api/roles prefix
+    # Standard JWKS location for services verifying tokens locally
+    from app.routes.auth import jwks
+    app.add_url_rule('/.well-known/jwks.json', 'jwks', jwks)
     
+    # Follow committed blocks to keep the assets cache in sync with the ledger
+    if os.getenv('ASSET_SYNC_ENABLED', 'false').lower() == 'true':
+        from app.services.asset_sync import start_asset_sync
+        start_asset_sync(mongo.db)
+
+    # Compile the permission registry used by RBAC checks (lazily rebuilt on first check if this fails)
+    from app.services.permission_cache import warm_up_permission_registry
+    warm_up_permission_registry()
+
+    # Write buffered activity bookkeeping on SIGTERM as well as at exit
+    from app.services.activity_buffer import install_shutdown_flush
+    install_shutdown_flush()
+
     # Health check endpoint
     @app.route('/health')
     def health_check():
@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+
+def parse_timestamp(value):
+    """Timestamp stored either as an ISO string or as a BSON date (naive UTC)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+class DirtyTrackingMixin:
+    """
+    Dirty-field tracking cho persisted models
+    Theo kiến trúc Giai đoạn 2 - Application Layer
+
+    Once tracking is started (after loading from the database) every
+    assignment to a persisted attribute is recorded, counters changed
+    through increment() are kept as deltas and list items added through
+    append() as pushes. get_update() then returns the minimal MongoDB update
+    document instead of the whole model.
+    """
+
+    # Attributes stored in the database document
+    PERSISTED_FIELDS = ()
+
+    def _to_document(self):
+        """Full database document of the model (models override to serialize values)"""
+        return {name: getattr(self, name) for name in self.PERSISTED_FIELDS if name in self.__dict__}
+
+    def __setattr__(self, name, value):
+        dirty = self.__dict__.get('_dirty')
+        if dirty is not None and name in self.PERSISTED_FIELDS and \
+                (name not in self.__dict__ or self.__dict__[name] != value):
+            dirty.add(name)
+            # An assigned value replaces any pending increment or push
+            self.__dict__['_increments'].pop(name, None)
+            self.__dict__['_appends'].pop(name, None)
+        object.__setattr__(self, name, value)
+
+    def start_tracking(self):
+        """Start recording changes (the current state is what the database holds)"""
+        self.__dict__['_dirty'] = set()
+        self.__dict__['_increments'] = {}
+        self.__dict__['_appends'] = {}
+        return self
+
+    def increment(self, name, amount=1):
+        """Add to a counter, persisted as $inc so concurrent increments are not lost"""
+        object.__setattr__(self, name, getattr(self, name) + amount)
+        dirty = self.__dict__.get('_dirty')
+        if dirty is not None and name not in dirty:
+            increments = self.__dict__['_increments']
+            increments[name] = increments.get(name, 0) + amount
+
+    def append(self, name, value):
+        """Add to a list, persisted as $push so concurrent appends are not lost"""
+        getattr(self, name).append(value)
+        dirty = self.__dict__.get('_dirty')
+        if dirty is not None and name not in dirty:
+            self.__dict__['_appends'].setdefault(name, []).append(value)
+
+    def is_tracking(self):
+        """Check if changes are being recorded"""
+        return self.__dict__.get('_dirty') is not None
+
+    def get_changed_fields(self):
+        """Names of the attributes changed since tracking started"""
+        if not self.is_tracking():
+            return set(self.PERSISTED_FIELDS)
+        return set(self.__dict__['_dirty']) | set(self.__dict__['_increments']) | set(self.__dict__['_appends'])
+
+    def get_update(self):
+        """
+        Minimal update document for the changes, None when nothing changed
+
+        Without tracking (new object) every persisted field is $set.
+        """
+        document = self._to_document()
+        if not self.is_tracking():
+            return {'$set': document}
+
+        update = {}
+        dirty = self.__dict__['_dirty']
+        if dirty:
+            update['$set'] = {name: document[name] for name in dirty if name in document}
+        if self.__dict__['_increments']:
+            update['$inc'] = dict(self.__dict__['_increments'])
+        if self.__dict__['_appends']:
+            update['$push'] = {name: {'$each': list(values)} for name, values in self.__dict__['_appends'].items()}
+        return update or None
+
+    def mark_clean(self):
+        """Forget recorded changes after they were written"""
+        if self.is_tracking():
+            self.__dict__['_dirty'].clear()
+            self.__dict__['_increments'].clear()
+            self.__dict__['_appends'].clear()
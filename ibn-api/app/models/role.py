@@ -64,22 +64,36 @@ class Role:
         }
         return priority_map.get(self.role_name, 99)
     
+    @property
+    def permissions(self):
+        """List of permission IDs"""
+        return self._permissions
+    
+    @permissions.setter
+    def permissions(self, permission_ids):
+        self._permissions = permission_ids
+        self._permission_set = None
+    
     def add_permission(self, permission_id):
         """Add permission to role"""
-        if permission_id not in self.permissions:
+        if not self.has_permission(permission_id):
             self.permissions.append(permission_id)
+            self._permission_set = None
             self.updated_at = datetime.now(timezone.utc)
     
     def remove_permission(self, permission_id):
         """Remove permission from role"""
-        if permission_id in self.permissions:
+        if self.has_permission(permission_id):
             self.permissions.remove(permission_id)
+            self._permission_set = None
             self.updated_at = datetime.now(timezone.utc)
     
     def has_permission(self, permission_id):
         """Check if role has specific permission"""
-        return permission_id in self.permissions
-    
+        if self._permission_set is None:
+            self._permission_set = frozenset(self._permissions)
+        return permission_id in self._permission_set
+
     def can_manage_role(self, other_role):
         """Check if this role can manage another role"""
         if not isinstance(other_role, Role):
@@ -1,13 +1,22 @@
 from datetime import datetime, timezone
-from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
 
-class User:
+from .dirty_tracking import DirtyTrackingMixin, parse_timestamp
+from ..services.password_hasher import get_password_hasher
+
+class User(DirtyTrackingMixin):
     """
     User model cho enterprise user management system
     Theo kiến trúc Giai đoạn 2 - Application Layer
     """
     
+    PERSISTED_FIELDS = frozenset([
+        'user_id', 'username', 'email', 'full_name', 'role_id', 'department', 'phone',
+        'status', 'created_by', 'created_at', 'updated_at', 'last_login', 'last_activity',
+        'avatar_url', 'timezone', 'language', 'must_change_password', 'password_changed_at',
+        'password_hash', 'login_attempts', 'locked_until', 'ip_address', 'user_agent'
+    ])
+    
     def __init__(self, username, email, password=None, full_name=None, 
                  role_id=None, department=None, phone=None, status='active',
                  created_by=None, user_id=None, created_at=None, updated_at=None):
@@ -40,9 +49,9 @@ class User:
         self.created_at = created_at or datetime.now(timezone.utc)
         self.updated_at = updated_at or datetime.now(timezone.utc)
         
-        # Password handling
+        # Password handling (hashed in the password hasher process pool)
         if password:
-            self.password_hash = generate_password_hash(password)
+            self.password_hash = get_password_hasher().hash(password)
         else:
             self.password_hash = None
             
@@ -65,7 +74,7 @@ class User:
     
     def set_password(self, password):
         """Set user password with hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_password_hasher().hash(password)
         self.password_changed_at = datetime.now(timezone.utc)
         self.must_change_password = False
         self.updated_at = datetime.now(timezone.utc)
@@ -74,7 +83,7 @@ class User:
         """Check if provided password matches hash"""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return get_password_hasher().verify(self.password_hash, password)
     
     def is_active(self):
         """Check if user is active"""
@@ -110,7 +119,7 @@ class User:
             self.ip_address = ip_address
             self.user_agent = user_agent
         else:
-            self.login_attempts += 1
+            self.increment('login_attempts')
             # Lock account after 5 failed attempts
             if self.login_attempts >= 5:
                 self.lock_account()
@@ -173,21 +182,21 @@ class User:
             status=data.get('status', 'active'),
             created_by=data.get('created_by'),
             user_id=data.get('user_id'),
-            created_at=datetime.fromisoformat(data['created_at'].replace('Z', '+00:00')) if data.get('created_at') else None,
-            updated_at=datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00')) if data.get('updated_at') else None
+            created_at=parse_timestamp(data.get('created_at')),
+            updated_at=parse_timestamp(data.get('updated_at'))
         )
         
         # Set additional fields
         if data.get('password_hash'):
             user.password_hash = data['password_hash']
         if data.get('last_login'):
-            user.last_login = datetime.fromisoformat(data['last_login'].replace('Z', '+00:00'))
+            user.last_login = parse_timestamp(data['last_login'])
         if data.get('last_activity'):
-            user.last_activity = datetime.fromisoformat(data['last_activity'].replace('Z', '+00:00'))
+            user.last_activity = parse_timestamp(data['last_activity'])
         if data.get('locked_until'):
-            user.locked_until = datetime.fromisoformat(data['locked_until'].replace('Z', '+00:00'))
+            user.locked_until = parse_timestamp(data['locked_until'])
         if data.get('password_changed_at'):
-            user.password_changed_at = datetime.fromisoformat(data['password_changed_at'].replace('Z', '+00:00'))
+            user.password_changed_at = parse_timestamp(data['password_changed_at'])
         
         user.login_attempts = data.get('login_attempts', 0)
         user.avatar_url = data.get('avatar_url')
@@ -197,7 +206,10 @@ class User:
         user.ip_address = data.get('ip_address')
         user.user_agent = data.get('user_agent')
         
-        return user
+        return user.start_tracking()
+    
+    def _to_document(self):
+        return self.to_dict(include_sensitive=True)
     
     def __repr__(self):
         return f"<User {self.username} ({self.email})>"
@@ -2,12 +2,20 @@ from datetime import datetime, timezone, timedelta
 import uuid
 import secrets
 
-class UserSession:
+from .dirty_tracking import DirtyTrackingMixin, parse_timestamp
+
+class UserSession(DirtyTrackingMixin):
     """
     UserSession model cho session management và security tracking
     Theo kiến trúc Giai đoạn 2 - Application Layer
     """
     
+    PERSISTED_FIELDS = frozenset([
+        'session_id', 'user_id', 'session_token', 'refresh_token', 'ip_address', 'user_agent',
+        'is_active', 'created_at', 'updated_at', 'expires_at', 'last_activity', 'login_method',
+        'device_fingerprint', 'location', 'is_suspicious', 'refresh_count', 'issued_tokens', 'revoked_at'
+    ])
+    
     def __init__(self, user_id, session_token=None, refresh_token=None,
                  ip_address=None, user_agent=None, expires_at=None,
                  is_active=True, session_id=None, created_at=None, updated_at=None):
@@ -52,6 +60,10 @@ class UserSession:
         # Session metadata
         self.refresh_count = 0
         self.max_refresh_count = 10  # Maximum number of token refreshes
+        
+        # Access tokens issued for this session ({'jti', 'exp'}), revoked together
+        self.issued_tokens = []
+        self.revoked_at = None
     
     def _generate_refresh_token(self):
         """Generate secure refresh token"""
@@ -82,7 +94,7 @@ class UserSession:
         
         self.session_token = new_session_token
         self.refresh_token = self._generate_refresh_token()
-        self.refresh_count += 1
+        self.increment('refresh_count')
         self.last_activity = datetime.now(timezone.utc)
         self.updated_at = datetime.now(timezone.utc)
         
@@ -90,6 +102,10 @@ class UserSession:
         self.extend_session()
         return True
     
+    def add_issued_token(self, jti, exp):
+        """Remember an access token issued for this session (at most max_refresh_count + 1)"""
+        self.append('issued_tokens', {'jti': jti, 'exp': exp})
+    
     def update_activity(self, ip_address=None, user_agent=None):
         """Update session activity"""
         self.last_activity = datetime.now(timezone.utc)
@@ -108,7 +124,8 @@ class UserSession:
         """Invalidate session"""
         self.is_active = False
         self.session_token = None
-        self.updated_at = datetime.now(timezone.utc)
+        self.revoked_at = datetime.now(timezone.utc)
+        self.updated_at = self.revoked_at
     
     def mark_suspicious(self, reason=None):
         """Mark session as suspicious"""
@@ -155,7 +172,9 @@ class UserSession:
         if include_tokens:
             session_dict.update({
                 'session_token': self.session_token,
-                'refresh_token': self.refresh_token
+                'refresh_token': self.refresh_token,
+                'issued_tokens': self.issued_tokens,
+                'revoked_at': self.revoked_at.isoformat() if self.revoked_at else None
             })
         
         return session_dict
@@ -171,14 +190,14 @@ class UserSession:
             user_agent=data.get('user_agent'),
             is_active=data.get('is_active', True),
             session_id=data.get('session_id'),
-            created_at=datetime.fromisoformat(data['created_at'].replace('Z', '+00:00')) if data.get('created_at') else None,
-            updated_at=datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00')) if data.get('updated_at') else None,
-            expires_at=datetime.fromisoformat(data['expires_at'].replace('Z', '+00:00')) if data.get('expires_at') else None
+            created_at=parse_timestamp(data.get('created_at')),
+            updated_at=parse_timestamp(data.get('updated_at')),
+            expires_at=parse_timestamp(data.get('expires_at'))
         )
         
         # Set additional fields
         if data.get('last_activity'):
-            session.last_activity = datetime.fromisoformat(data['last_activity'].replace('Z', '+00:00'))
+            session.last_activity = parse_timestamp(data['last_activity'])
         
         session.login_method = data.get('login_method', 'password')
         session.device_fingerprint = data.get('device_fingerprint')
@@ -186,8 +205,14 @@ class UserSession:
         session.is_suspicious = data.get('is_suspicious', False)
         session.refresh_count = data.get('refresh_count', 0)
         session.max_refresh_count = data.get('max_refresh_count', 10)
+        session.issued_tokens = data.get('issued_tokens') or []
+        if data.get('revoked_at'):
+            session.revoked_at = parse_timestamp(data['revoked_at'])
         
-        return session
+        return session.start_tracking()
+    
+    def _to_document(self):
+        return self.to_dict(include_tokens=True)
     
     @classmethod
     def cleanup_expired_sessions(cls, sessions_collection):
@@ -1,11 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, url_for
 from datetime import datetime
 import logging
+import os
+import uuid
+from pymongo import UpdateOne, ReturnDocument
 
 from app import mongo
 from app.models.asset import Asset
 from app.models.transaction import Transaction
 from app.services.blockchain_service import BlockchainService
+from app.services.commit_tracker import get_commit_tracker
+from app.services.asset_sync import get_asset_sync
+from app.services.asset_cache import CONSISTENCY_LEVELS, get_asset_cache
+from app.services.stats_counters import (
+    ASSET_STATS_FIELDS, TRANSACTION_STATS_FIELDS, apply_update, find_before,
+    record_asset_changes, record_transaction_changes
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -17,48 +27,306 @@ assets_bp = Blueprint('assets', __name__)
 # Initialize blockchain service
 blockchain_service = BlockchainService()
 
+def _log_transaction(transaction):
+    """Log a transaction and count it in the dashboard stats (merged into the block listener's record of it)"""
+    _log_transactions([transaction.to_dict()])
+
+def _log_transactions(transaction_docs):
+    """Upsert transaction log records by tx_id, keeping fields the block listener already set"""
+    updates = []
+    for doc in transaction_docs:
+        known = {field: value for field, value in doc.items() if value is not None}
+        unknown = {field: None for field, value in doc.items() if value is None}
+        updates.append((doc['tx_id'], {'$set': known, '$setOnInsert': unknown}))
+
+    current = find_before(mongo.db.transactions, 'tx_id', {tx_id for tx_id, _ in updates}, TRANSACTION_STATS_FIELDS)
+    changes = []
+    for tx_id, update in updates:
+        before = current.get(tx_id)
+        current[tx_id] = apply_update(before, update)
+        changes.append((before, current[tx_id]))
+
+    mongo.db.transactions.bulk_write([
+        UpdateOne({'tx_id': tx_id}, update, upsert=True) for tx_id, update in updates
+    ], ordered=False)
+    record_transaction_changes(mongo.db, changes)
+
+def _update_transaction(tx_id, update):
+    """Set fields of a logged transaction, moving it between status counters"""
+    before = mongo.db.transactions.find_one_and_update(
+        {'tx_id': tx_id}, {'$set': update}, projection=TRANSACTION_STATS_FIELDS,
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is not None:
+        record_transaction_changes(mongo.db, [(before, apply_update(before, {'$set': update}))])
+
+def _adopt_fabric_tx_id(tx_id, fabric_tx_id):
+    """
+    Link a transaction logged under a local handle to its Fabric transaction ID
+
+    The block listener matches it by fabric_tx_id from then on. A record the
+    listener already made under the Fabric ID is folded into this one.
+    """
+    duplicate = mongo.db.transactions.find_one_and_delete(
+        {'tx_id': fabric_tx_id, 'source': 'block'},
+        projection={**TRANSACTION_STATS_FIELDS, 'block_number': 1}
+    )
+    update = {'fabric_tx_id': fabric_tx_id}
+    if duplicate is not None:
+        record_transaction_changes(mongo.db, [(duplicate, None)])
+        update['block_number'] = duplicate.get('block_number')
+    _update_transaction(tx_id, update)
+
+def _store_assets(asset_docs):
+    """Upsert newly created assets and move the dashboard stats (the block listener may have stored them first)"""
+    updates = []
+    for doc in asset_docs:
+        doc = dict(doc)
+        created_at = doc.pop('created_at')
+        updates.append((doc['asset_id'], {'$set': doc, '$setOnInsert': {'created_at': created_at}}))
+
+    current = find_before(mongo.db.assets, 'asset_id', {asset_id for asset_id, _ in updates}, ASSET_STATS_FIELDS)
+    changes = []
+    for asset_id, update in updates:
+        before = current.get(asset_id)
+        current[asset_id] = apply_update(before, update)
+        changes.append((before, current[asset_id]))
+
+    mongo.db.assets.bulk_write([
+        UpdateOne({'asset_id': asset_id}, update, upsert=True) for asset_id, update in updates
+    ], ordered=False)
+    record_asset_changes(mongo.db, changes)
+    get_asset_cache().invalidate_many(asset_id for asset_id, _ in updates)
+
+def _store_seeded_assets(asset_ids, tx_id):
+    """Store the assets InitLedger wrote, as read back from the ledger"""
+    asset_docs = []
+    for asset_id in asset_ids:
+        result = blockchain_service.read_asset(asset_id)
+        if not result['success']:
+            logger.warning(f"Could not read seeded asset {asset_id}: {result['error']}")
+            continue
+        asset = Asset.from_blockchain(result['data'])
+        asset.blockchain_tx_id = tx_id
+        asset_docs.append(asset.to_dict())
+    if asset_docs:
+        _store_assets(asset_docs)
+
+def _transfer_owner(asset_id, new_owner):
+    """Record a committed transfer in MongoDB, moving the asset between owner totals"""
+    update = {
+        '$set': {
+            'owner': new_owner,
+            'updated_at': datetime.utcnow(),
+            'status': 'transferred'
+        }
+    }
+    before = mongo.db.assets.find_one_and_update(
+        {'asset_id': asset_id}, update, projection=ASSET_STATS_FIELDS,
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is not None:
+        record_asset_changes(mongo.db, [(before, apply_update(before, update))])
+    get_asset_cache().invalidate(asset_id)
+
+def _wants_async():
+    """Check if client asked for asynchronous submit (?async=true or Prefer: respond-async)"""
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+def _status_unknown_response(function_name, log_args, blockchain_result):
+    """
+    Log a sent transaction whose commit outcome is unknown as pending
+
+    The transaction is not submitted again; the status endpoint (or the
+    block listener) settles the record once the outcome is known.
+    """
+    tx_id = blockchain_result['tx_id']
+    transaction = Transaction(
+        tx_id=tx_id,
+        function_name=function_name,
+        args=log_args,
+        status='pending',
+        error_message=blockchain_result['error']
+    )
+    _log_transaction(transaction)
+
+    status_url = url_for('transactions.get_transaction_status', tx_id=tx_id)
+    response = jsonify({
+        'success': True,
+        'tx_id': tx_id,
+        'status': 'pending',
+        'status_url': status_url,
+        'message': f'{function_name} was sent but its commit status is not known yet, poll status_url'
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+def _submit_async(function_name, args, log_args, on_success=None):
+    """Submit transaction, log it as pending and track commit status in the background"""
+    submitted = blockchain_service.submit_async(function_name, args)
+
+    if not submitted['success']:
+        # Log failed transaction
+        transaction = Transaction(
+            tx_id=f"failed_{uuid.uuid4().hex}",
+            function_name=function_name,
+            args=log_args,
+            status='failed',
+            error_message=submitted['error']
+        )
+        _log_transaction(transaction)
+
+        return jsonify({
+            'success': False,
+            'error': submitted['error']
+        }), 500
+
+    tx_id = submitted['tx_id']
+    transaction = Transaction(
+        tx_id=tx_id,
+        function_name=function_name,
+        args=log_args,
+        status='pending'
+    )
+    _log_transaction(transaction)
+
+    def on_complete(result):
+        if result.get('tx_id') and result['tx_id'] != tx_id:
+            # Peer CLI path: the Fabric transaction ID is only known once the invoke returns
+            _adopt_fabric_tx_id(tx_id, result['tx_id'])
+        if result['success']:
+            if on_success:
+                on_success(tx_id)
+            update = {
+                'status': 'success',
+                'result': result.get('output') or 'Transaction committed'
+            }
+            if result.get('block_number') is not None:
+                update['block_number'] = result['block_number']
+        elif result.get('status_unknown'):
+            # Still pending, the status endpoint asks again when polled
+            update = {'error_message': result.get('error')}
+        else:
+            update = {
+                'status': 'failed',
+                'error_message': result.get('error')
+            }
+        _update_transaction(tx_id, update)
+
+    get_commit_tracker().track(tx_id, submitted['wait'], on_complete)
+
+    status_url = url_for('transactions.get_transaction_status', tx_id=tx_id)
+    response = jsonify({
+        'success': True,
+        'tx_id': tx_id,
+        'status': 'pending',
+        'status_url': status_url,
+        'message': f'{function_name} submitted, poll status_url for the commit result'
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+def _page_params():
+    """Read page_size/bookmark query parameters"""
+    max_page_size = int(os.getenv('ASSET_PAGE_SIZE_MAX', 500))
+    page_size = request.args.get('page_size', 50, type=int)
+    page_size = max(1, min(page_size, max_page_size))
+    bookmark = request.args.get('bookmark', '')
+    return page_size, bookmark
+
+def _cached_assets_page(page_size, bookmark):
+    """Get one page of assets (deleted ones excluded) from MongoDB cache, paginated by asset_id"""
+    query = {'status': {'$ne': 'deleted'}}
+    if bookmark:
+        query['asset_id'] = {'$gte': bookmark}
+    cached_assets = list(mongo.db.assets.find(query).sort('asset_id', 1).limit(page_size + 1))
+
+    next_bookmark = None
+    if len(cached_assets) > page_size:
+        next_bookmark = cached_assets.pop()['asset_id']
+
+    for asset_doc in cached_assets:
+        asset_doc['_id'] = str(asset_doc['_id'])
+
+    return cached_assets, next_bookmark
+
+def _synced_cache():
+    """Block listener keeping the cache in sync, None when reads must go to the ledger"""
+    asset_sync = get_asset_sync()
+    if asset_sync and asset_sync.is_running():
+        return asset_sync
+    return None
+
 @assets_bp.route('/', methods=['GET'])
 def get_all_assets():
-    """Get all assets from blockchain and cache in MongoDB"""
+    """Get one page of assets from the synced cache or from blockchain"""
     try:
-        # Get from blockchain
-        blockchain_result = blockchain_service.get_all_assets()
+        page_size, bookmark = _page_params()
+
+        # Cache is kept up to date by the block listener, serve it directly
+        asset_sync = _synced_cache()
+        if asset_sync:
+            assets, next_bookmark = _cached_assets_page(page_size, bookmark)
+            return jsonify({
+                'success': True,
+                'data': assets,
+                'count': len(assets),
+                'page_size': page_size,
+                'bookmark': next_bookmark,
+                'has_more': bool(next_bookmark),
+                'source': 'cache',
+                'freshness': asset_sync.get_freshness()
+            })
+
+        # Get one page from blockchain, unless the circuit breaker is open
+        if blockchain_service.is_available():
+            blockchain_result = blockchain_service.get_assets_page(page_size, bookmark)
+        else:
+            blockchain_result = {'success': False, 'error': 'Blockchain circuit breaker is open'}
         
         if blockchain_result['success']:
             assets = []
+            asset_docs = []
             
             # Process blockchain data
             for asset_data in blockchain_result['data']:
                 asset = Asset.from_blockchain(asset_data)
                 assets.append(asset.to_json())
-                
-                # Update MongoDB cache
-                mongo.db.assets.update_one(
-                    {'asset_id': asset.asset_id},
-                    {'$set': asset.to_dict()},
-                    upsert=True
-                )
+                asset_docs.append(asset.to_dict())
+            
+            # Update MongoDB cache, assets new to it or changed on the ledger move the stats
+            if asset_docs:
+                befores = find_before(mongo.db.assets, 'asset_id', [doc['asset_id'] for doc in asset_docs],
+                                      ASSET_STATS_FIELDS)
+                mongo.db.assets.bulk_write([
+                    UpdateOne({'asset_id': doc['asset_id']}, {'$set': doc}, upsert=True)
+                    for doc in asset_docs
+                ], ordered=False)
+                record_asset_changes(mongo.db, [(befores.get(doc['asset_id']), doc) for doc in asset_docs])
             
             return jsonify({
                 'success': True,
                 'data': assets,
                 'count': len(assets),
+                'page_size': page_size,
+                'bookmark': blockchain_result['bookmark'],
+                'has_more': bool(blockchain_result['bookmark']),
                 'source': 'blockchain'
             })
         else:
             # Fallback to MongoDB cache
             logger.warning(f"Blockchain query failed: {blockchain_result['error']}")
-            cached_assets = list(mongo.db.assets.find({'status': 'active'}))
-            
-            assets = []
-            for asset_doc in cached_assets:
-                asset_doc['_id'] = str(asset_doc['_id'])
-                assets.append(asset_doc)
+            assets, next_bookmark = _cached_assets_page(page_size, bookmark)
             
             return jsonify({
                 'success': True,
                 'data': assets,
                 'count': len(assets),
+                'page_size': page_size,
+                'bookmark': next_bookmark,
+                'has_more': bool(next_bookmark),
                 'source': 'cache',
                 'warning': 'Using cached data due to blockchain connectivity issues'
             })
@@ -72,41 +340,60 @@ def get_all_assets():
 
 @assets_bp.route('/<asset_id>', methods=['GET'])
 def get_asset(asset_id):
-    """Get specific asset by ID"""
+    """Get specific asset by ID (?consistency=cached|bounded-staleness|strong)"""
     try:
-        # Try blockchain first
-        blockchain_result = blockchain_service.read_asset(asset_id)
-        
-        if blockchain_result['success']:
-            asset = Asset.from_blockchain(blockchain_result['data'])
-            
-            # Update MongoDB cache
-            mongo.db.assets.update_one(
-                {'asset_id': asset_id},
-                {'$set': asset.to_dict()},
-                upsert=True
-            )
-            
+        consistency = request.args.get('consistency', 'bounded-staleness')
+        if consistency not in CONSISTENCY_LEVELS:
             return jsonify({
+                'success': False,
+                'error': f'consistency must be one of: {", ".join(CONSISTENCY_LEVELS)}'
+            }), 400
+        max_staleness = request.args.get('max_staleness', type=float)
+
+        result = get_asset_cache().get(asset_id, consistency, max_staleness)
+
+        if result['success']:
+            response = {
                 'success': True,
-                'data': asset.to_json(),
-                'source': 'blockchain'
-            })
-        else:
-            # Fallback to MongoDB
-            asset_doc = mongo.db.assets.find_one({'asset_id': asset_id})
-            if asset_doc:
-                asset_doc['_id'] = str(asset_doc['_id'])
+                'data': result['data'],
+                'source': result['source'],
+                'consistency': consistency,
+                'height': result['height'],
+                'tx_id': result['tx_id']
+            }
+            asset_sync = _synced_cache()
+            if asset_sync:
+                response['freshness'] = asset_sync.get_freshness()
+            return jsonify(response)
+
+        if result['not_found']:
+            return jsonify({
+                'success': False,
+                'error': 'Asset not found'
+            }), 404
+
+        if consistency != 'strong':
+            # Ledger unavailable, fallback to any cached copy
+            logger.warning(f"Blockchain query failed: {result['error']}")
+            cached_result = get_asset_cache().get(asset_id, 'cached')
+            if cached_result['success']:
                 return jsonify({
                     'success': True,
-                    'data': asset_doc,
-                    'source': 'cache'
+                    'data': cached_result['data'],
+                    'source': 'cache',
+                    'cache_tier': cached_result['source'],
+                    'consistency': 'cached',
+                    'warning': 'Using cached data due to blockchain connectivity issues'
                 })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': 'Asset not found'
-                }), 404
+            return jsonify({
+                'success': False,
+                'error': 'Asset not found'
+            }), 404
+
+        return jsonify({
+            'success': False,
+            'error': result['error']
+        }), 503
                 
     except Exception as e:
         logger.error(f"Error getting asset {asset_id}: {e}")
@@ -156,6 +443,18 @@ def create_asset():
                 'error': f'Asset {asset.asset_id} already exists'
             }), 409
         
+        if _wants_async():
+            def store_asset(tx_id):
+                asset.blockchain_tx_id = tx_id
+                _store_assets([asset.to_dict()])
+
+            return _submit_async(
+                'CreateAsset',
+                [asset.asset_id, asset.color, asset.size, asset.owner, asset.appraised_value],
+                data,
+                on_success=store_asset
+            )
+
         # Create on blockchain
         blockchain_result = blockchain_service.create_asset(
             asset.asset_id,
@@ -174,7 +473,7 @@ def create_asset():
             asset.blockchain_tx_id = tx_id
 
             # Store in MongoDB
-            result = mongo.db.assets.insert_one(asset.to_dict())
+            _store_assets([asset.to_dict()])
 
             # Log transaction
             transaction = Transaction(
@@ -184,7 +483,7 @@ def create_asset():
                 result=result_msg,
                 status='success'
             )
-            mongo.db.transactions.insert_one(transaction.to_dict())
+            _log_transaction(transaction)
 
             return jsonify({
                 'success': True,
@@ -193,16 +492,18 @@ def create_asset():
                 'message': 'Asset created successfully',
                 'source': blockchain_result.get('data', {}).get('source', 'blockchain')
             }), 201
+        elif blockchain_result.get('status_unknown'):
+            return _status_unknown_response('CreateAsset', data, blockchain_result)
         else:
             # Log failed transaction
             transaction = Transaction(
-                tx_id=f"failed_{int(datetime.utcnow().timestamp())}",
+                tx_id=f"failed_{uuid.uuid4().hex}",
                 function_name='CreateAsset',
                 args=data,
                 status='failed',
                 error_message=blockchain_result['error']
             )
-            mongo.db.transactions.insert_one(transaction.to_dict())
+            _log_transaction(transaction)
             
             return jsonify({
                 'success': False,
@@ -216,6 +517,165 @@ def create_asset():
             'error': str(e)
         }), 500
 
+@assets_bp.route('/batch', methods=['POST'])
+def create_assets_batch():
+    """Create many assets in chunked CreateAssets transactions"""
+    try:
+        data = request.get_json()
+        items = data.get('assets') if isinstance(data, dict) else data
+
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a non-empty array of assets'
+            }), 400
+
+        max_batch_size = int(os.getenv('ASSET_BATCH_MAX_SIZE', 5000))
+        if len(items) > max_batch_size:
+            return jsonify({
+                'success': False,
+                'error': f'Batch too large: {len(items)} assets (max {max_batch_size})'
+            }), 413
+
+        # Validate every item, only valid assets are submitted
+        required_fields = ['asset_id', 'color', 'size', 'owner', 'appraised_value']
+        results = [None] * len(items)
+        valid_assets = []
+        valid_indexes = []
+
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors = ['Asset must be an object']
+            else:
+                errors = [f'Missing required field: {field}' for field in required_fields if field not in item]
+
+            asset = None
+            if not errors:
+                try:
+                    asset = Asset(
+                        asset_id=item['asset_id'],
+                        color=item['color'],
+                        size=item['size'],
+                        owner=item['owner'],
+                        appraised_value=item['appraised_value']
+                    )
+                    errors = asset.validate()
+                except (TypeError, ValueError, AttributeError) as e:
+                    errors = [f'Invalid asset data: {e}']
+
+            if errors:
+                results[index] = {
+                    'index': index,
+                    'asset_id': item.get('asset_id') if isinstance(item, dict) else None,
+                    'status': 'invalid',
+                    'errors': errors
+                }
+            else:
+                valid_assets.append(asset)
+                valid_indexes.append(index)
+
+        # Submit valid assets in chunks
+        chunks = blockchain_service.create_assets(valid_assets) if valid_assets else []
+
+        created_docs = []
+        transaction_docs = []
+        position = 0
+
+        for chunk in chunks:
+            chunk_size = len(chunk['results'])
+            chunk_assets = valid_assets[position:position + chunk_size]
+            chunk_indexes = valid_indexes[position:position + chunk_size]
+            position += chunk_size
+
+            for asset, index, item_result in zip(chunk_assets, chunk_indexes, chunk['results']):
+                if item_result.get('created'):
+                    asset.blockchain_tx_id = chunk['tx_id']
+                    created_docs.append(asset.to_dict())
+                    results[index] = {
+                        'index': index,
+                        'asset_id': asset.asset_id,
+                        'status': 'created',
+                        'tx_id': chunk['tx_id']
+                    }
+                elif item_result.get('unknown'):
+                    # Committed, but whether this asset was written or already existed is not known
+                    results[index] = {
+                        'index': index,
+                        'asset_id': asset.asset_id,
+                        'status': 'unknown',
+                        'tx_id': chunk['tx_id'],
+                        'errors': [item_result['error']]
+                    }
+                else:
+                    error = item_result.get('error', 'Asset was not created')
+                    results[index] = {
+                        'index': index,
+                        'asset_id': asset.asset_id,
+                        'status': 'exists' if 'already exists' in error else 'failed',
+                        'errors': [error]
+                    }
+
+            # One transaction log record per chunk
+            asset_ids = [asset.asset_id for asset in chunk_assets]
+            if chunk['success']:
+                transaction = Transaction(
+                    tx_id=chunk['tx_id'],
+                    function_name='CreateAssets',
+                    args={'asset_ids': asset_ids, 'count': len(asset_ids)},
+                    result=(f"{sum(1 for r in chunk['results'] if r.get('created'))} of {len(asset_ids)} assets created"
+                            if not any(r.get('unknown') for r in chunk['results'])
+                            else 'Committed, per-asset result not available'),
+                    status='success'
+                )
+            elif chunk.get('status_unknown'):
+                transaction = Transaction(
+                    tx_id=chunk['tx_id'],
+                    function_name='CreateAssets',
+                    args={'asset_ids': asset_ids, 'count': len(asset_ids)},
+                    status='pending',
+                    error_message=chunk['error']
+                )
+            else:
+                transaction = Transaction(
+                    tx_id=f"failed_{uuid.uuid4().hex}",
+                    function_name='CreateAssets',
+                    args={'asset_ids': asset_ids, 'count': len(asset_ids)},
+                    status='failed',
+                    error_message=chunk['error']
+                )
+            transaction_docs.append(transaction.to_dict())
+
+        # Bulk writes to MongoDB
+        if created_docs:
+            _store_assets(created_docs)
+        if transaction_docs:
+            _log_transactions(transaction_docs)
+
+        summary = {'total': len(items)}
+        for status in ('created', 'unknown', 'exists', 'invalid', 'failed'):
+            summary[status] = sum(1 for r in results if r['status'] == status)
+
+        if summary['created'] == summary['total']:
+            status_code = 201
+        elif summary['created'] > 0 or summary['unknown'] > 0:
+            status_code = 207
+        else:
+            status_code = 400 if summary['invalid'] == summary['total'] else 409 if summary['failed'] == 0 else 500
+
+        return jsonify({
+            'success': summary['created'] > 0 or summary['unknown'] > 0,
+            'data': results,
+            'summary': summary,
+            'tx_ids': [chunk['tx_id'] for chunk in chunks if chunk['success']]
+        }), status_code
+
+    except Exception as e:
+        logger.error(f"Error creating asset batch: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @assets_bp.route('/<asset_id>/transfer', methods=['POST'])
 def transfer_asset(asset_id):
     """Transfer asset ownership"""
@@ -243,21 +703,23 @@ def transfer_asset(asset_id):
                 'error': f'Asset {asset_id} not found'
             }), 404
         
+        if _wants_async():
+            def update_owner(tx_id):
+                _transfer_owner(asset_id, new_owner)
+
+            return _submit_async(
+                'TransferAsset',
+                [asset_id, new_owner],
+                {'asset_id': asset_id, 'new_owner': new_owner},
+                on_success=update_owner
+            )
+
         # Transfer on blockchain
         blockchain_result = blockchain_service.transfer_asset(asset_id, new_owner)
         
         if blockchain_result['success']:
             # Update MongoDB
-            mongo.db.assets.update_one(
-                {'asset_id': asset_id},
-                {
-                    '$set': {
-                        'owner': new_owner,
-                        'updated_at': datetime.utcnow(),
-                        'status': 'transferred'
-                    }
-                }
-            )
+            _transfer_owner(asset_id, new_owner)
             
             # Log transaction
             transaction = Transaction(
@@ -267,23 +729,27 @@ def transfer_asset(asset_id):
                 result=blockchain_result['result'],
                 status='success'
             )
-            mongo.db.transactions.insert_one(transaction.to_dict())
+            _log_transaction(transaction)
             
             return jsonify({
                 'success': True,
                 'message': f'Asset {asset_id} transferred to {new_owner}',
                 'tx_id': blockchain_result['tx_id']
             })
+        elif blockchain_result.get('status_unknown'):
+            return _status_unknown_response(
+                'TransferAsset', {'asset_id': asset_id, 'new_owner': new_owner}, blockchain_result
+            )
         else:
             # Log failed transaction
             transaction = Transaction(
-                tx_id=f"failed_{int(datetime.utcnow().timestamp())}",
+                tx_id=f"failed_{uuid.uuid4().hex}",
                 function_name='TransferAsset',
                 args={'asset_id': asset_id, 'new_owner': new_owner},
                 status='failed',
                 error_message=blockchain_result['error']
             )
-            mongo.db.transactions.insert_one(transaction.to_dict())
+            _log_transaction(transaction)
             
             return jsonify({
                 'success': False,
@@ -337,13 +803,18 @@ def init_ledger():
                 result=blockchain_result['result'],
                 status='success'
             )
-            mongo.db.transactions.insert_one(transaction.to_dict())
+            _log_transaction(transaction)
+
+            # Store the seeded assets, moving the dashboard stats
+            _store_seeded_assets(blockchain_result.get('asset_ids', []), blockchain_result['tx_id'])
             
             return jsonify({
                 'success': True,
                 'message': 'Ledger initialized successfully',
                 'tx_id': blockchain_result['tx_id']
             })
+        elif blockchain_result.get('status_unknown'):
+            return _status_unknown_response('InitLedger', {}, blockchain_result)
         else:
             return jsonify({
                 'success': False,
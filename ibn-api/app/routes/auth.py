@@ -5,9 +5,14 @@ Theo kiến trúc Giai đoạn 2 - Application Layer
 
 from flask import Blueprint, request, jsonify
 from datetime import datetime, timezone
+import hashlib
+import json
 import logging
+import os
 
 from ..services.auth_service import AuthService, require_auth
+from ..services.password_hasher import PasswordHasherBusy
+from ..services.jwt_keys import get_jwt_key_ring
 from ..models.user import User
 from ..models.user_session import UserSession
 
@@ -84,6 +89,16 @@ def login():
             'message': 'Login successful'
         }), 200
         
+    except PasswordHasherBusy as e:
+        # Fail fast while the password hashing pool is saturated
+        logger.warning(f"Login rejected: {e}")
+        response = jsonify({
+            'success': False,
+            'error': 'Authentication service busy, please retry'
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 503
+        
     except Exception as e:
         logger.error(f"Login endpoint error: {e}")
         return jsonify({
@@ -327,10 +342,7 @@ def change_password():
         user.set_password(new_password)
         
         # Update user in database
-        auth_service.db.users.update_one(
-            {'user_id': user_id},
-            {'$set': user.to_dict(include_sensitive=True)}
-        )
+        auth_service.db.users.update_one({'user_id': user_id}, user.get_update())
         
         logger.info(f"Password changed for user: {user.username}")
         
@@ -339,6 +351,16 @@ def change_password():
             'message': 'Password changed successfully'
         }), 200
         
+    except PasswordHasherBusy as e:
+        # Fail fast while the password hashing pool is saturated
+        logger.warning(f"Change password rejected: {e}")
+        response = jsonify({
+            'success': False,
+            'error': 'Authentication service busy, please retry'
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 503
+        
     except Exception as e:
         logger.error(f"Change password endpoint error: {e}")
         return jsonify({
@@ -414,7 +436,8 @@ def revoke_session(session_id):
         
         # Revoke session
         auth_service = AuthService()
-        result = auth_service.db.user_sessions.update_one(
+        now = datetime.now(timezone.utc).isoformat()
+        session_data = auth_service.db.user_sessions.find_one_and_update(
             {
                 'session_id': session_id,
                 'user_id': user_id,
@@ -423,17 +446,21 @@ def revoke_session(session_id):
             {
                 '$set': {
                     'is_active': False,
-                    'updated_at': datetime.now(timezone.utc).isoformat()
+                    'revoked_at': now,
+                    'updated_at': now
                 }
-            }
+            },
+            projection={'session_token': 1, 'issued_tokens': 1}
         )
         
-        if result.modified_count == 0:
+        if not session_data:
             return jsonify({
                 'success': False,
                 'error': 'Session not found or already revoked'
             }), 404
         
+        auth_service.revoke_session_tokens(session_data)
+        
         logger.info(f"Session revoked: {session_id} for user: {user_id}")
         
         return jsonify({
@@ -447,3 +474,39 @@ def revoke_session(session_id):
             'success': False,
             'error': 'Internal server error'
         }), 500
+
+@auth_bp.route('/.well-known/jwks.json', methods=['GET'])
+def jwks():
+    """
+    Public keys for verifying access tokens without calling this service
+    
+    Also served at /.well-known/jwks.json. Clients may cache the key set for
+    JWKS_MAX_AGE seconds and should refetch it when a token carries an
+    unknown kid.
+    
+    Returns:
+    {
+        "keys": [{"kty": "OKP", "crv": "Ed25519", "x": "...", "kid": "...", "alg": "EdDSA", "use": "sig"}]
+    }
+    """
+    try:
+        key_ring = get_jwt_key_ring()
+        if key_ring is None:
+            return jsonify({
+                'success': False,
+                'error': 'Tokens are signed with a shared secret, no public keys available'
+            }), 404
+        
+        key_set = key_ring.jwks()
+        response = jsonify(key_set)
+        response.set_etag(hashlib.sha256(json.dumps(key_set, sort_keys=True).encode()).hexdigest())
+        response.cache_control.public = True
+        response.cache_control.max_age = int(os.getenv('JWKS_MAX_AGE', 300))
+        return response.make_conditional(request)
+        
+    except Exception as e:
+        logger.error(f"JWKS endpoint error: {e}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
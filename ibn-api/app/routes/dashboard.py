@@ -1,8 +1,12 @@
-from flask import Blueprint, render_template, jsonify
+from flask import Blueprint, render_template, jsonify, Response
 from datetime import datetime
 import logging
+import os
 
 from app import mongo
+from app.services.stats_counters import get_dashboard_stats
+from app.services.response_cache import cached_response
+from app.services.live_feed import Subscription, get_live_feed
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -11,19 +15,22 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 dashboard_bp = Blueprint('dashboard', __name__)
 
+# Seconds a polled stats response is served from the response cache
+STATS_CACHE_TTL = float(os.getenv('STATS_CACHE_TTL', 5))
+
 @dashboard_bp.route('/dashboard')
+@cached_response(STATS_CACHE_TTL)
 def dashboard():
     """Main dashboard page"""
     try:
-        # Get basic statistics
-        total_assets = mongo.db.assets.count_documents({})
-        total_transactions = mongo.db.transactions.count_documents({})
-        success_transactions = mongo.db.transactions.count_documents({'status': 'success'})
+        # Get basic statistics and asset analytics from the materialized counters
+        yesterday = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        asset_stats, transaction_stats = get_dashboard_stats(mongo.db, yesterday, top_owners=10)
         
         # Get recent transactions
         recent_transactions = list(
             mongo.db.transactions.find()
-            .sort("timestamp", -1)
+            .sort([("timestamp", -1), ("_id", -1)])
             .limit(10)
         )
         
@@ -33,23 +40,15 @@ def dashboard():
             if 'timestamp' in tx and tx['timestamp']:
                 tx['timestamp'] = tx['timestamp'].isoformat()
         
-        # Get asset analytics
-        asset_analytics = list(mongo.db.assets.aggregate([
-            {
-                "$group": {
-                    "_id": "$owner",
-                    "total_assets": {"$sum": 1},
-                    "total_value": {"$sum": "$appraised_value"}
-                }
-            },
-            {"$sort": {"total_value": -1}},
-            {"$limit": 10}
-        ]))
+        asset_analytics = [
+            {'_id': owner['_id'], 'total_assets': owner['asset_count'], 'total_value': owner['total_value']}
+            for owner in asset_stats['top_owners']
+        ]
         
         dashboard_data = {
-            'total_assets': total_assets,
-            'total_transactions': total_transactions,
-            'success_rate': round((success_transactions / total_transactions * 100) if total_transactions > 0 else 0, 2),
+            'total_assets': asset_stats['total'],
+            'total_transactions': transaction_stats['total'],
+            'success_rate': transaction_stats['success_rate'],
             'recent_transactions': recent_transactions,
             'asset_analytics': asset_analytics,
             'last_updated': datetime.utcnow().isoformat()
@@ -68,56 +67,29 @@ def dashboard():
         }), 500
 
 @dashboard_bp.route('/api/dashboard/stats')
+@cached_response(STATS_CACHE_TTL)
 def dashboard_stats():
     """Get dashboard statistics as JSON"""
     try:
-        # Asset statistics
-        total_assets = mongo.db.assets.count_documents({})
-        active_assets = mongo.db.assets.count_documents({'status': 'active'})
-        
-        # Transaction statistics
-        total_transactions = mongo.db.transactions.count_documents({})
-        success_transactions = mongo.db.transactions.count_documents({'status': 'success'})
-        failed_transactions = mongo.db.transactions.count_documents({'status': 'failed'})
-        pending_transactions = mongo.db.transactions.count_documents({'status': 'pending'})
-        
-        # Recent activity (last 24 hours)
+        # Asset and transaction statistics, recent activity from the start of today
         yesterday = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        recent_assets = mongo.db.assets.count_documents({
-            'created_at': {'$gte': yesterday}
-        })
-        recent_transactions = mongo.db.transactions.count_documents({
-            'timestamp': {'$gte': yesterday}
-        })
-        
-        # Top asset owners
-        top_owners = list(mongo.db.assets.aggregate([
-            {
-                '$group': {
-                    '_id': '$owner',
-                    'asset_count': {'$sum': 1},
-                    'total_value': {'$sum': '$appraised_value'}
-                }
-            },
-            {'$sort': {'total_value': -1}},
-            {'$limit': 5}
-        ]))
+        asset_stats, transaction_stats = get_dashboard_stats(mongo.db, yesterday)
         
         stats = {
             'assets': {
-                'total': total_assets,
-                'active': active_assets,
-                'recent_24h': recent_assets
+                'total': asset_stats['total'],
+                'active': asset_stats['active'],
+                'recent_24h': asset_stats['recent_24h']
             },
             'transactions': {
-                'total': total_transactions,
-                'success': success_transactions,
-                'failed': failed_transactions,
-                'pending': pending_transactions,
-                'success_rate': round((success_transactions / total_transactions * 100) if total_transactions > 0 else 0, 2),
-                'recent_24h': recent_transactions
+                'total': transaction_stats['total'],
+                'success': transaction_stats['success'],
+                'failed': transaction_stats['failed'],
+                'pending': transaction_stats['pending'],
+                'success_rate': transaction_stats['success_rate'],
+                'recent_24h': transaction_stats['recent_24h']
             },
-            'top_owners': top_owners,
+            'top_owners': asset_stats['top_owners'],
             'timestamp': datetime.utcnow().isoformat()
         }
         
@@ -132,3 +104,34 @@ def dashboard_stats():
             'success': False,
             'error': str(e)
         }), 500
+
+@dashboard_bp.route('/api/dashboard/events')
+def dashboard_events():
+    """
+    Live dashboard feed as server-sent events
+    
+    Events: transaction and asset (the changed document), stats (same shape
+    as /api/dashboard/stats) and network (peer/channel status), the last
+    two only when they change. The latest stats and network events are sent
+    right after connecting.
+    """
+    feed = get_live_feed(mongo.db)
+    subscription = feed.subscribe()
+    heartbeat = float(os.getenv('LIVE_FEED_HEARTBEAT', 15))
+    
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                message = subscription.get(timeout=heartbeat)
+                if message is Subscription.CLOSED:
+                    break
+                # Comment lines keep proxies from timing out idle connections
+                yield message if message is not None else ': keep-alive\n\n'
+        finally:
+            feed.unsubscribe(subscription)
+    
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,10 +1,21 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 import logging
+import os
 
 from app import mongo
 from app.models.transaction import NetworkStatus
 from app.services.blockchain_service import BlockchainService
+from app.services.asset_sync import get_asset_sync
+from app.services.single_flight import get_single_flight
+from app.services.circuit_breaker import get_circuit_breakers_status
+from app.services.mongo_pool import get_pool_stats
+from app.services.token_cache import get_token_cache
+from app.services.password_hasher import get_password_hasher
+from app.services.activity_buffer import get_activity_buffer
+from app.services.token_revocation import get_revocation_list
+from app.services.response_cache import cached_response, get_response_cache
+from app.services.live_feed import get_live_feed
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -104,7 +115,17 @@ def health_check():
             'data': {
                 'api_status': 'healthy',
                 'database_status': 'healthy',
+                'database_pool': get_pool_stats(),
                 'blockchain_status': 'healthy' if blockchain_healthy else 'unavailable',
+                'asset_sync': get_asset_sync().get_status() if get_asset_sync() else None,
+                'query_coalescing': get_single_flight().get_stats(),
+                'circuit_breakers': get_circuit_breakers_status(),
+                'token_cache': get_token_cache().get_stats(),
+                'password_hasher': get_password_hasher().get_stats(),
+                'activity_buffer': get_activity_buffer().get_stats(),
+                'token_revocation': get_revocation_list().get_stats(),
+                'response_cache': get_response_cache().get_stats(),
+                'live_feed': get_live_feed().get_stats() if get_live_feed() else None,
                 'timestamp': datetime.utcnow().isoformat()
             }
         })
@@ -121,6 +142,7 @@ def health_check():
         }), 500
 
 @network_bp.route('/info', methods=['GET'])
+@cached_response(float(os.getenv('NETWORK_INFO_CACHE_TTL', 300)))
 def get_network_info():
     """Get network configuration information"""
     try:
@@ -142,11 +164,13 @@ def get_network_info():
             'api_version': '1.0.0',
             'supported_functions': [
                 'CreateAsset',
+                'CreateAssets',
                 'ReadAsset',
                 'UpdateAsset', 
                 'DeleteAsset',
                 'TransferAsset',
                 'GetAllAssets',
+                'GetAssetsWithPagination',
                 'AssetExists',
                 'InitLedger'
             ]
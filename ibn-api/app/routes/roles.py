@@ -4,7 +4,6 @@ Theo kiến trúc Giai đoạn 2 - Application Layer
 """
 
 from flask import Blueprint, request, jsonify
-from datetime import datetime, timezone
 import logging
 
 from ..services.auth_service import require_auth
@@ -272,15 +271,7 @@ def update_role_permissions(role_id):
         permission_ids = [perm['permission_id'] for perm in permissions_data]
         
         # Update role permissions
-        result = rbac_service.db.roles.update_one(
-            {'role_id': role_id},
-            {
-                '$set': {
-                    'permissions': permission_ids,
-                    'updated_at': datetime.now(timezone.utc).isoformat()
-                }
-            }
-        )
+        result = rbac_service.update_role_permissions(role_id, permission_ids)
         
         rbac_service.close_connection()
         
@@ -1,9 +1,19 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import base64
+import json
 import logging
+import os
+import re
+
+from bson import ObjectId
+from bson.errors import InvalidId
 
 from app import mongo
 from app.models.transaction import Transaction
+from app.services.commit_tracker import get_commit_tracker
+from app.services.stats_counters import get_dashboard_stats
+from app.services.response_cache import cached_response
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -12,15 +22,62 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 transactions_bp = Blueprint('transactions', __name__)
 
+# Fabric transaction IDs (sha256 hex), local handles such as tx_<uuid> have no commit status
+FABRIC_TX_ID = re.compile(r'[0-9a-f]{64}')
+
+def _settle_pending(transaction_doc):
+    """Ask the gateway for the outcome of a pending transaction nobody is waiting for"""
+    from app.routes.assets import blockchain_service, _update_transaction
+
+    tx_id = transaction_doc['tx_id']
+    result = blockchain_service.commit_status(tx_id, timeout=float(os.getenv('COMMIT_STATUS_POLL_TIMEOUT', 2)))
+    if result.get('status_unknown'):
+        return
+    if result['success']:
+        update = {'status': 'success', 'block_number': result['block_number'], 'error_message': None}
+    else:
+        update = {'status': 'failed', 'error_message': result['error']}
+    _update_transaction(tx_id, update)
+    transaction_doc.update(update)
+
+def _encode_cursor(tx_doc):
+    """Opaque cursor pointing after a transaction in (timestamp, _id) descending order"""
+    position = {'t': tx_doc['timestamp'].isoformat(), 'i': str(tx_doc['_id'])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    """Query condition for the transactions after a cursor, ValueError when malformed"""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        timestamp = datetime.fromisoformat(position['t'])
+        tx_oid = ObjectId(position['i'])
+    except (ValueError, TypeError, KeyError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    return {'$or': [
+        {'timestamp': {'$lt': timestamp}},
+        {'timestamp': timestamp, '_id': {'$lt': tx_oid}}
+    ]}
+
 @transactions_bp.route('/', methods=['GET'])
 def get_all_transactions():
-    """Get all transactions from MongoDB"""
+    """
+    Get transactions from MongoDB, newest first
+
+    Pages with the opaque `cursor` returned as `next` (keyset on timestamp,
+    _id, served by the compound indexes per filter). `offset` is still
+    accepted for old clients but gets slower with depth. The exact `total`
+    is only counted with include_total=true; unfiltered listings get a
+    metadata based `total_estimate`.
+    """
     try:
         # Get query parameters
-        limit = request.args.get('limit', 50, type=int)
+        max_limit = int(os.getenv('TRANSACTION_PAGE_SIZE_MAX', 500))
+        limit = max(1, min(request.args.get('limit', 50, type=int), max_limit))
         offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor')
         status = request.args.get('status')
         function_name = request.args.get('function')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         
         # Build query
         query = {}
@@ -29,27 +86,51 @@ def get_all_transactions():
         if function_name:
             query['function_name'] = function_name
         
-        # Get transactions from MongoDB
-        transactions_cursor = mongo.db.transactions.find(query).sort('timestamp', -1).skip(offset).limit(limit)
-        transactions = []
+        page_query = dict(query)
+        if cursor:
+            try:
+                page_query.update(_decode_cursor(cursor))
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+        
+        # Get one extra transaction to know whether there is a next page
+        transactions_cursor = mongo.db.transactions.find(page_query) \
+            .sort([('timestamp', -1), ('_id', -1)]).limit(limit + 1)
+        if offset and not cursor:
+            transactions_cursor = transactions_cursor.skip(offset)
+        tx_docs = list(transactions_cursor)
         
-        for tx_doc in transactions_cursor:
+        next_cursor = None
+        if len(tx_docs) > limit:
+            tx_docs.pop()
+            next_cursor = _encode_cursor(tx_docs[-1])
+        
+        transactions = []
+        for tx_doc in tx_docs:
             tx_doc['_id'] = str(tx_doc['_id'])
             if 'timestamp' in tx_doc and tx_doc['timestamp']:
                 tx_doc['timestamp'] = tx_doc['timestamp'].isoformat()
             transactions.append(tx_doc)
         
-        # Get total count
-        total_count = mongo.db.transactions.count_documents(query)
-        
-        return jsonify({
+        response = {
             'success': True,
             'data': transactions,
             'count': len(transactions),
-            'total': total_count,
-            'offset': offset,
-            'limit': limit
-        })
+            'limit': limit,
+            'next': next_cursor,
+            'has_more': next_cursor is not None
+        }
+        if offset and not cursor:
+            response['offset'] = offset
+        if include_total:
+            response['total'] = mongo.db.transactions.count_documents(query)
+        elif not query:
+            response['total_estimate'] = mongo.db.transactions.estimated_document_count()
+        
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"Error getting transactions: {e}")
@@ -86,48 +167,60 @@ def get_transaction(tx_id):
             'error': str(e)
         }), 500
 
+@transactions_bp.route('/<tx_id>/status', methods=['GET'])
+def get_transaction_status(tx_id):
+    """Get commit status of a transaction (polling endpoint for async submits)"""
+    try:
+        transaction_doc = mongo.db.transactions.find_one(
+            {'tx_id': tx_id},
+            {'_id': 0, 'tx_id': 1, 'function_name': 1, 'status': 1,
+             'block_number': 1, 'error_message': 1, 'timestamp': 1}
+        )
+
+        if not transaction_doc:
+            return jsonify({
+                'success': False,
+                'error': 'Transaction not found'
+            }), 404
+
+        if transaction_doc.get('status') == 'pending' and FABRIC_TX_ID.fullmatch(tx_id) \
+                and not get_commit_tracker().is_pending(tx_id):
+            _settle_pending(transaction_doc)
+
+        if transaction_doc.get('timestamp'):
+            transaction_doc['timestamp'] = transaction_doc['timestamp'].isoformat()
+
+        return jsonify({
+            'success': True,
+            'data': transaction_doc
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting transaction status {tx_id}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @transactions_bp.route('/stats', methods=['GET'])
+@cached_response(float(os.getenv('STATS_CACHE_TTL', 5)))
 def get_transaction_stats():
     """Get transaction statistics"""
     try:
-        # Get stats from MongoDB
-        total_transactions = mongo.db.transactions.count_documents({})
-        success_transactions = mongo.db.transactions.count_documents({'status': 'success'})
-        failed_transactions = mongo.db.transactions.count_documents({'status': 'failed'})
-        pending_transactions = mongo.db.transactions.count_documents({'status': 'pending'})
-        
-        # Get function stats
-        function_stats = list(mongo.db.transactions.aggregate([
-            {
-                '$group': {
-                    '_id': '$function_name',
-                    'count': {'$sum': 1},
-                    'success_count': {
-                        '$sum': {
-                            '$cond': [{'$eq': ['$status', 'success']}, 1, 0]
-                        }
-                    }
-                }
-            },
-            {'$sort': {'count': -1}}
-        ]))
-        
-        # Get recent activity (last 24 hours)
+        # Read from the materialized counters
         yesterday = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        recent_transactions = mongo.db.transactions.count_documents({
-            'timestamp': {'$gte': yesterday}
-        })
+        _, stats = get_dashboard_stats(mongo.db, yesterday)
         
         return jsonify({
             'success': True,
             'data': {
-                'total_transactions': total_transactions,
-                'success_transactions': success_transactions,
-                'failed_transactions': failed_transactions,
-                'pending_transactions': pending_transactions,
-                'success_rate': round((success_transactions / total_transactions * 100) if total_transactions > 0 else 0, 2),
-                'recent_transactions_24h': recent_transactions,
-                'function_stats': function_stats
+                'total_transactions': stats['total'],
+                'success_transactions': stats['success'],
+                'failed_transactions': stats['failed'],
+                'pending_transactions': stats['pending'],
+                'success_rate': stats['success_rate'],
+                'recent_transactions_24h': stats['recent_24h'],
+                'function_stats': stats['function_stats']
             }
         })
         
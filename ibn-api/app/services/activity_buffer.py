@@ -0,0 +1,247 @@
+"""
+Activity Buffer cho user bookkeeping writes
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Write-behind buffer for bookkeeping fields (last_activity, last_login,
+ip_address, user_agent). Updates are coalesced per document in memory and
+flushed as one unordered bulk_write every ACTIVITY_FLUSH_INTERVAL_MS, and at
+shutdown, so auth responses never wait on them. Timestamps are written
+with $max, so a late flush from another worker cannot move them back.
+They are stored as UTC ISO strings like the models write them: BSON
+orders every date after every string, so mixing the two would stop
+$max from advancing a field.
+"""
+
+import atexit
+import os
+import signal
+import time
+import threading
+import logging
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Fields that may be written behind
+BOOKKEEPING_FIELDS = ('last_activity', 'last_login', 'ip_address', 'user_agent')
+# Monotonic timestamps, merged with $max
+TIMESTAMP_FIELDS = ('last_activity', 'last_login', 'updated_at')
+
+def _to_utc_iso(value):
+    # Same representation as the models; UTC ISO strings order like the times they hold
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        value = value.astimezone(timezone.utc).isoformat()
+    return value
+
+class ActivityBuffer:
+    """Coalescing write-behind buffer flushed by a background thread"""
+
+    def __init__(self, flush_interval_ms=None, max_pending=None):
+        """
+        Initialize ActivityBuffer
+
+        Args:
+            flush_interval_ms (int): Milliseconds between flushes
+            max_pending (int): Pending documents that trigger an early flush
+        """
+        self.flush_interval = (flush_interval_ms or int(os.getenv('ACTIVITY_FLUSH_INTERVAL_MS', 500))) / 1000.0
+        self.max_pending = max_pending or int(os.getenv('ACTIVITY_BUFFER_MAX_PENDING', 10000))
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._collections = {}
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self._stopped = False
+        self.stats = {'recorded': 0, 'coalesced': 0, 'flushes': 0, 'written': 0, 'errors': 0, 'dropped': 0,
+                      'last_flush_ms': None}
+
+    def _ensure_thread(self):
+        # Started lazily, and again in a forked worker where the thread does not exist
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._thread = threading.Thread(target=self._run, name='activity-buffer-flush', daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def record(self, collection, key_filter, fields):
+        """
+        Queue bookkeeping fields for a document
+
+        Later values for the same document replace earlier ones, timestamp
+        fields keep the newest value.
+        """
+        key = (collection.database.name, collection.name, tuple(sorted(key_filter.items())))
+        fields = {name: _to_utc_iso(value) if name in TIMESTAMP_FIELDS else value
+                  for name, value in fields.items()}
+        with self._lock:
+            self.stats['recorded'] += 1
+            self._collections[key[:2]] = collection
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = dict(fields)
+            else:
+                self.stats['coalesced'] += 1
+                self._merge(pending, fields)
+            full = len(self._pending) >= self.max_pending
+
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    @staticmethod
+    def _merge(pending, fields):
+        for name, value in fields.items():
+            if name in TIMESTAMP_FIELDS and pending.get(name) is not None and value is not None:
+                pending[name] = max(pending[name], value)
+            else:
+                pending[name] = value
+
+    def defer(self, collection, key_filter, update):
+        """
+        Move the bookkeeping part of an update document into the buffer
+
+        Returns the update still to be written synchronously, None when
+        everything was deferred. updated_at is deferred only when nothing
+        else changed.
+        """
+        if not update:
+            return None
+        set_fields = dict(update.get('$set', {}))
+        deferred = {name: set_fields.pop(name) for name in BOOKKEEPING_FIELDS if name in set_fields}
+        if not deferred:
+            return update
+
+        remaining = {op: value for op, value in update.items() if op != '$set'}
+        if set_fields.keys() - {'updated_at'}:
+            remaining['$set'] = set_fields
+        elif 'updated_at' in set_fields:
+            deferred['updated_at'] = set_fields['updated_at']
+
+        self.record(collection, key_filter, deferred)
+        return remaining or None
+
+    def flush(self):
+        """Write every pending update, one unordered bulk_write per collection"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                collections = dict(self._collections)
+            if not pending:
+                return 0
+
+            by_collection = {}
+            for key, fields in pending.items():
+                by_collection.setdefault(key[:2], []).append((key, fields))
+
+            written = 0
+            started = time.monotonic()
+            for collection_key, entries in by_collection.items():
+                operations = [UpdateOne(dict(key[2]), self._to_update(fields)) for key, fields in entries]
+                try:
+                    collections[collection_key].bulk_write(operations, ordered=False)
+                    written += len(operations)
+                except Exception as e:
+                    logger.warning(f"Activity flush to {collection_key[1]} failed: {e}")
+                    self._requeue(entries)
+
+            with self._lock:
+                self.stats['flushes'] += 1
+                self.stats['written'] += written
+                self.stats['last_flush_ms'] = round((time.monotonic() - started) * 1000, 2)
+            return written
+
+    @staticmethod
+    def _to_update(fields):
+        update = {}
+        for name, value in fields.items():
+            op = '$max' if name in TIMESTAMP_FIELDS and value is not None else '$set'
+            update.setdefault(op, {})[name] = value
+        return update
+
+    def _requeue(self, entries):
+        # Newer values recorded since the swap take precedence over the failed ones
+        with self._lock:
+            self.stats['errors'] += 1
+            for key, fields in entries:
+                if len(self._pending) >= self.max_pending and key not in self._pending:
+                    self.stats['dropped'] += 1
+                    continue
+                newer = self._pending.get(key)
+                if newer is not None:
+                    self._merge(fields, newer)
+                self._pending[key] = fields
+
+    def stop(self):
+        """Stop the flush thread and write what is pending"""
+        self._stopped = True
+        self._wakeup.set()
+        self.flush()
+
+    def get_stats(self):
+        """Get buffer statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'pending': len(self._pending),
+                'flush_interval_ms': int(self.flush_interval * 1000)
+            }
+
+    def _reset_after_fork(self):
+        # Pending writes belong to the parent, which flushes them itself
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._collections = {}
+        self._thread = None
+
+
+_activity_buffer = ActivityBuffer()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_activity_buffer._reset_after_fork)
+
+def get_activity_buffer():
+    """Get the process-wide activity buffer"""
+    return _activity_buffer
+
+def _flush_at_exit():
+    try:
+        _activity_buffer.stop()
+    except Exception as e:
+        logger.warning(f"Activity flush at shutdown failed: {e}")
+
+atexit.register(_flush_at_exit)
+
+def install_shutdown_flush():
+    """
+    Flush on SIGTERM as well (docker stop), when nothing else handles it
+
+    atexit handlers do not run when the process is killed by the default
+    SIGTERM action, so exit cleanly instead.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) not in (signal.SIG_DFL, None):
+        return
+
+    def handle_sigterm(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
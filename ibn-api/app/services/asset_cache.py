@@ -0,0 +1,189 @@
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from app.models.asset import Asset
+from app.services.asset_sync import get_asset_sync
+from app.services.stats_counters import ASSET_STATS_FIELDS, record_asset_changes
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CONSISTENCY_LEVELS = ('cached', 'bounded-staleness', 'strong')
+
+class AssetCache:
+    """
+    Tiered read-through cache for ReadAsset: in-process LRU, then MongoDB, then the ledger
+
+    Consistency levels:
+        cached             - any cached copy is acceptable
+        bounded-staleness  - cached copies known to match the ledger no more than
+                             max_staleness seconds ago: when they were read or written,
+                             or when the block listener last saw the chain height while
+                             caught up with it
+        strong             - always read from the ledger
+    """
+
+    def __init__(self, blockchain_service, mongo, max_entries=None, max_staleness=None):
+        self.blockchain_service = blockchain_service
+        self.mongo = mongo
+        self.max_entries = max_entries or int(os.getenv('ASSET_CACHE_SIZE', 10000))
+        self.max_staleness = max_staleness or float(os.getenv('ASSET_CACHE_MAX_STALENESS', 5))
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'mongo_hits': 0, 'ledger_reads': 0, 'invalidations': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _current_height(self):
+        """Block height the MongoDB tier is synced to, None without block listener"""
+        asset_sync = get_asset_sync()
+        if asset_sync and asset_sync.is_running():
+            return asset_sync.synced_height
+        return None
+
+    @staticmethod
+    def _caught_up_at():
+        """Time up to which the MongoDB tier matches the ledger (block listener caught up), else None"""
+        asset_sync = get_asset_sync()
+        return asset_sync.caught_up_at() if asset_sync else None
+
+    def _is_fresh(self, cached_at, height, max_staleness):
+        as_of = cached_at
+        caught_up_at = self._caught_up_at()
+        current_height = self._current_height()
+        # No height reported yet (listener starting or stopped): only cached_at counts
+        if caught_up_at is not None and height is not None and current_height is not None \
+                and height >= current_height:
+            # Nothing has been committed since the entry was produced, as of the listener's last check
+            as_of = max(as_of, caught_up_at)
+        return time.time() - as_of <= max_staleness
+
+    def _remember(self, asset_id, data, source, height, tx_id, cached_at=None):
+        entry = {
+            'data': data,
+            'source': source,
+            'height': height,
+            'tx_id': tx_id,
+            # When the data was last known to match the ledger
+            'cached_at': cached_at if cached_at is not None else time.time()
+        }
+        with self._lock:
+            self._entries[asset_id] = entry
+            self._entries.move_to_end(asset_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _result(self, entry, source):
+        return {
+            'success': True,
+            'data': entry['data'],
+            'source': source,
+            'height': entry['height'],
+            'tx_id': entry['tx_id']
+        }
+
+    def get(self, asset_id, consistency='bounded-staleness', max_staleness=None):
+        """
+        Read asset through the cache tiers
+
+        Returns {'success', 'data', 'source' (memory|cache|blockchain), 'height', 'tx_id'},
+        or {'success': False, 'error', 'not_found'}.
+        """
+        if consistency not in CONSISTENCY_LEVELS:
+            return {'success': False, 'error': f'Invalid consistency level: {consistency}', 'not_found': False}
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+
+        if consistency != 'strong':
+            # Tier 1: in-process LRU
+            with self._lock:
+                entry = self._entries.get(asset_id)
+                if entry:
+                    self._entries.move_to_end(asset_id)
+            if entry and (consistency == 'cached' or
+                          self._is_fresh(entry['cached_at'], entry['height'], max_staleness)):
+                self._count('memory_hits')
+                return self._result(entry, 'memory')
+
+            # Tier 2: MongoDB assets collection
+            height = self._current_height()
+            asset_doc = self.mongo.db.assets.find_one({'asset_id': asset_id, 'status': {'$ne': 'deleted'}})
+            if asset_doc:
+                updated_at = asset_doc.get('updated_at')
+                as_of = updated_at.replace(tzinfo=timezone.utc).timestamp() if isinstance(updated_at, datetime) else 0
+                caught_up_at = self._caught_up_at()
+                if caught_up_at is not None:
+                    as_of = max(as_of, caught_up_at)
+                if consistency == 'cached' or time.time() - as_of <= max_staleness:
+                    asset_doc['_id'] = str(asset_doc['_id'])
+                    entry = self._remember(asset_id, asset_doc, 'cache', height, asset_doc.get('blockchain_tx_id'),
+                                           cached_at=as_of)
+                    self._count('mongo_hits')
+                    return self._result(entry, 'cache')
+
+        # Tier 3: ledger
+        if not self.blockchain_service.is_available():
+            return {'success': False, 'error': 'Blockchain circuit breaker is open', 'not_found': False}
+
+        height = self._current_height()
+        blockchain_result = self.blockchain_service.read_asset(asset_id)
+        self._count('ledger_reads')
+        if not blockchain_result['success']:
+            return {
+                'success': False,
+                'error': blockchain_result['error'],
+                'not_found': 'does not exist' in str(blockchain_result['error'])
+            }
+
+        asset = Asset.from_blockchain(blockchain_result['data'])
+        if height is None:
+            # Write through to MongoDB, the block listener owns it when running
+            asset_doc = asset.to_dict()
+            before = self.mongo.db.assets.find_one_and_update(
+                {'asset_id': asset_id},
+                {'$set': asset_doc},
+                projection=ASSET_STATS_FIELDS,
+                upsert=True
+            )
+            record_asset_changes(self.mongo.db, [(before, asset_doc)])
+        entry = self._remember(asset_id, asset.to_json(), 'blockchain', height, None)
+        return self._result(entry, 'blockchain')
+
+    def invalidate(self, asset_id):
+        """Drop cached copy after a local write or an observed commit touching the key"""
+        with self._lock:
+            if self._entries.pop(asset_id, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def invalidate_many(self, asset_ids):
+        """Drop cached copies of several keys"""
+        for asset_id in asset_ids:
+            self.invalidate(asset_id)
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            return {**self.stats, 'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+# Process-wide cache shared by the asset routes and the block listener
+_asset_cache = None
+_cache_lock = threading.Lock()
+
+def get_asset_cache():
+    """Get the shared asset cache"""
+    global _asset_cache
+    with _cache_lock:
+        if _asset_cache is None:
+            from app import mongo
+            from app.services.blockchain_service import BlockchainService
+            _asset_cache = AssetCache(BlockchainService(), mongo)
+        return _asset_cache
@@ -0,0 +1,308 @@
+import json
+import os
+import socket
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.models.asset import Asset
+from app.services.blockchain_service import BlockchainService
+from app.services.stats_counters import (
+    ASSET_STATS_FIELDS, TRANSACTION_STATS_FIELDS, apply_update, find_before,
+    record_asset_changes, record_transaction_changes
+)
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Asset status the API routes set after each chaincode function; writes by other
+# functions keep the current status
+FUNCTION_STATUS = {
+    'InitLedger': 'active',
+    'CreateAsset': 'active',
+    'CreateAssets': 'active',
+    'TransferAsset': 'transferred'
+}
+
+class AssetSyncListener:
+    """
+    Follows committed blocks of the channel and applies the asset writes to MongoDB
+
+    Progress is checkpointed in the `sync_state` collection, so a restarted
+    listener resumes from the last applied block. Only one process holds the
+    lease and applies blocks; the others just report the checkpoint.
+    """
+
+    CHECKPOINT_ID = 'assets'
+
+    def __init__(self, db, blockchain_service=None, poll_interval=None, lease_seconds=None):
+        self.db = db
+        self.blockchain_service = blockchain_service or BlockchainService()
+        self.poll_interval = poll_interval or float(os.getenv('ASSET_SYNC_INTERVAL', 2))
+        self.lease_seconds = lease_seconds or int(os.getenv('ASSET_SYNC_LEASE_SECONDS', 30))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.synced_height = None
+        self.chain_height = None
+        # time.time() of the last chain height read by this process
+        self.checked_at = None
+        self.last_synced_at = None
+        self.last_error = None
+        self.is_leader = False
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start following the channel in a background thread"""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='asset-sync', daemon=True)
+        self._thread.start()
+        logger.info(f"Asset sync listener started ({self.owner})")
+
+    def stop(self, timeout=None):
+        """Stop the listener"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_running(self):
+        """Check if the listener thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sync_once()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Asset sync failed: {e}")
+            self._stop_event.wait(self.poll_interval)
+
+    def _acquire_lease(self):
+        """Take or renew the lease on the checkpoint document"""
+        now = datetime.utcnow()
+        try:
+            self.db.sync_state.update_one(
+                {
+                    '_id': self.CHECKPOINT_ID,
+                    '$or': [
+                        {'lease_owner': self.owner},
+                        {'lease_expires': {'$lt': now}},
+                        {'lease_owner': None}
+                    ]
+                },
+                {
+                    '$set': {
+                        'lease_owner': self.owner,
+                        'lease_expires': now + timedelta(seconds=self.lease_seconds)
+                    },
+                    '$setOnInsert': {'block_number': 0}
+                },
+                upsert=True
+            )
+            self.is_leader = True
+        except DuplicateKeyError:
+            # Lease is held by another process
+            self.is_leader = False
+        return self.is_leader
+
+    def _load_checkpoint(self):
+        state = self.db.sync_state.find_one({'_id': self.CHECKPOINT_ID}) or {}
+        self.synced_height = state.get('block_number', 0)
+        self.last_synced_at = state.get('synced_at')
+        return self.synced_height
+
+    def sync_once(self):
+        """Apply all blocks committed since the checkpoint, returns number of applied blocks"""
+        if not self._acquire_lease():
+            self._load_checkpoint()
+            return 0
+
+        next_block = self._load_checkpoint()
+        height_result = self.blockchain_service.get_chain_height()
+        if not height_result['success']:
+            self.last_error = height_result['error']
+            return 0
+        self.chain_height = height_result['height']
+        self.checked_at = time.time()
+
+        applied = 0
+        while next_block < self.chain_height and not self._stop_event.is_set():
+            block_result = self.blockchain_service.get_block(next_block)
+            if not block_result['success']:
+                self.last_error = block_result['error']
+                break
+
+            self._apply_block(block_result['data'])
+            next_block += 1
+            applied += 1
+
+            self.last_synced_at = datetime.utcnow()
+            self.db.sync_state.update_one(
+                {'_id': self.CHECKPOINT_ID},
+                {'$set': {'block_number': next_block, 'synced_at': self.last_synced_at}}
+            )
+            self.synced_height = next_block
+
+        if applied:
+            self.last_error = None
+            logger.info(f"Asset sync applied {applied} block(s), synced height {self.synced_height}")
+        return applied
+
+    def _apply_block(self, block):
+        """Write the keys changed by the valid transactions of a block"""
+        now = datetime.utcnow()
+        asset_updates = []
+        transaction_updates = []
+
+        for tx in block['transactions']:
+            transaction_updates.append((
+                tx['tx_id'],
+                {
+                    '$set': {
+                        'status': 'success' if tx['valid'] else 'failed',
+                        'block_number': block['number']
+                    },
+                    '$setOnInsert': {
+                        'function_name': tx.get('function'),
+                        'args': {},
+                        'result': None,
+                        'timestamp': now,
+                        'gas_used': None,
+                        'error_message': None if tx['valid'] else 'Transaction invalidated at commit',
+                        # Submitted outside this API (or before it logged the transaction)
+                        'source': 'block'
+                    }
+                }
+            ))
+            if not tx['valid']:
+                continue
+
+            for write in tx['writes']:
+                if write['is_delete']:
+                    asset_updates.append((
+                        write['key'],
+                        {'$set': {'status': 'deleted', 'blockchain_tx_id': tx['tx_id'], 'updated_at': now}},
+                        False
+                    ))
+                    continue
+
+                try:
+                    asset = Asset.from_blockchain(json.loads(write['value']))
+                except (ValueError, TypeError):
+                    # Not an asset record
+                    continue
+                asset.blockchain_tx_id = tx['tx_id']
+                asset_doc = asset.to_dict()
+                set_on_insert = {'created_at': asset_doc.pop('created_at'), 'status': asset_doc.pop('status')}
+                if tx.get('function') in FUNCTION_STATUS:
+                    asset_doc['status'] = FUNCTION_STATUS[tx['function']]
+                    del set_on_insert['status']
+                asset_updates.append((
+                    asset.asset_id,
+                    {'$set': asset_doc, '$setOnInsert': set_on_insert},
+                    True
+                ))
+
+        if asset_updates:
+            self._write_assets(asset_updates)
+        if transaction_updates:
+            self._write_transactions(transaction_updates)
+
+        # Drop in-process cached copies of the committed keys
+        from app.services.asset_cache import get_asset_cache
+        get_asset_cache().invalidate_many(
+            write['key'] for tx in block['transactions'] if tx['valid'] for write in tx['writes']
+        )
+
+    def _write_assets(self, updates):
+        """Apply (asset_id, update, upsert) writes in order and move the dashboard stats"""
+        current = find_before(self.db.assets, 'asset_id', {asset_id for asset_id, _, _ in updates},
+                              ASSET_STATS_FIELDS)
+        changes = []
+        for asset_id, update, upsert in updates:
+            before = current.get(asset_id)
+            if before is None and not upsert:
+                continue
+            current[asset_id] = apply_update(before, update)
+            changes.append((before, current[asset_id]))
+
+        self.db.assets.bulk_write([
+            UpdateOne({'asset_id': asset_id}, update, upsert=upsert) for asset_id, update, upsert in updates
+        ], ordered=False)
+        record_asset_changes(self.db, changes)
+
+    def _logged_tx_ids(self, fabric_tx_ids):
+        """tx_id of the records the API logged for Fabric transaction IDs, by Fabric ID"""
+        logged = {}
+        for doc in self.db.transactions.find(
+            {'$or': [{'tx_id': {'$in': fabric_tx_ids}}, {'fabric_tx_id': {'$in': fabric_tx_ids}}]},
+            {'_id': 0, 'tx_id': 1, 'fabric_tx_id': 1}
+        ):
+            logged[doc.get('fabric_tx_id') or doc['tx_id']] = doc['tx_id']
+        return logged
+
+    def _write_transactions(self, updates):
+        """Upsert (tx_id, update) commit outcomes into the API's records of them and move the dashboard stats"""
+        # Transactions the API logged under a local handle are updated in place
+        logged = self._logged_tx_ids([tx_id for tx_id, _ in updates])
+        updates = [(logged.get(tx_id, tx_id), update) for tx_id, update in updates]
+
+        current = find_before(self.db.transactions, 'tx_id', {tx_id for tx_id, _ in updates},
+                              TRANSACTION_STATS_FIELDS)
+        changes = []
+        for tx_id, update in updates:
+            before = current.get(tx_id)
+            current[tx_id] = apply_update(before, update)
+            changes.append((before, current[tx_id]))
+
+        self.db.transactions.bulk_write([
+            UpdateOne({'tx_id': tx_id}, update, upsert=True) for tx_id, update in updates
+        ], ordered=False)
+        record_transaction_changes(self.db, changes)
+
+    def caught_up_at(self):
+        """time.time() up to which MongoDB is known to match the ledger, None while blocks are pending"""
+        if (self.is_running() and self.checked_at is not None and self.synced_height is not None
+                and self.chain_height is not None and self.synced_height >= self.chain_height):
+            return self.checked_at
+        return None
+
+    def get_freshness(self):
+        """Freshness metadata returned with cached reads"""
+        return {
+            'synced_height': self.synced_height,
+            'synced_at': self.last_synced_at.isoformat() if self.last_synced_at else None
+        }
+
+    def get_status(self):
+        """Get listener status"""
+        return {
+            'running': self.is_running(),
+            'leader': self.is_leader,
+            'chain_height': self.chain_height,
+            'last_error': self.last_error,
+            **self.get_freshness()
+        }
+
+
+# Process-wide listener, created by create_app when ASSET_SYNC_ENABLED=true
+_asset_sync = None
+
+def start_asset_sync(db):
+    """Create and start the shared asset sync listener"""
+    global _asset_sync
+    if _asset_sync is None:
+        _asset_sync = AssetSyncListener(db)
+    _asset_sync.start()
+    return _asset_sync
+
+def get_asset_sync():
+    """Get the shared listener, None when block sync is disabled"""
+    return _asset_sync
@@ -5,6 +5,7 @@ Theo kiến trúc Giai đoạn 2 - Application Layer
 
 import jwt
 import secrets
+import uuid
 from datetime import datetime, timezone, timedelta
 from functools import wraps
 from flask import request, jsonify, current_app
@@ -12,6 +13,14 @@ from pymongo import MongoClient
 import os
 import logging
 
+from .mongo_pool import get_client
+from .permission_cache import get_permission_cache
+from .permission_claims import claims_enabled, build_permission_claims, check_token_permissions
+from .token_cache import get_token_cache
+from .password_hasher import PasswordHasherBusy
+from .activity_buffer import get_activity_buffer
+from .token_revocation import get_revocation_list
+from .jwt_keys import get_jwt_key_ring
 from ..models.user import User
 from ..models.role import Role
 from ..models.permission import Permission
@@ -19,6 +28,9 @@ from ..models.user_session import UserSession
 
 logger = logging.getLogger(__name__)
 
+# Development fallback for JWT_SECRET, public in this repository
+DEFAULT_JWT_SECRET = 'ibn-blockchain-secret-key-2025'
+
 class AuthService:
     """Authentication service với JWT và session management"""
     
@@ -30,18 +42,26 @@ class AuthService:
             mongo_uri (str): MongoDB connection URI
             database_name (str): Database name
         """
-        self.mongo_uri = mongo_uri or os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+        self.mongo_uri = mongo_uri
         self.database_name = database_name or os.getenv('MONGO_DB', 'ibn_blockchain')
         
         # JWT configuration
-        self.jwt_secret = os.getenv('JWT_SECRET', 'ibn-blockchain-secret-key-2025')
-        self.jwt_algorithm = 'HS256'
+        self.jwt_secret = os.getenv('JWT_SECRET', DEFAULT_JWT_SECRET)
+        # EdDSA / RS256 sign with the key ring and are verifiable through the JWKS
+        self.key_ring = get_jwt_key_ring()
+        self.jwt_algorithm = self.key_ring.algorithm if self.key_ring else 'HS256'
+        # HS256 tokens issued before switching to asymmetric keys (cut-over in jwt_keys), never
+        # with the built-in secret (anyone could forge those)
+        self.accept_legacy_hs256 = self.key_ring is not None and \
+            os.getenv('JWT_ACCEPT_LEGACY_HS256', 'true').lower() == 'true' and \
+            self.jwt_secret != DEFAULT_JWT_SECRET
         self.access_token_expires = timedelta(hours=8)
         self.refresh_token_expires = timedelta(days=30)
         
-        # Connect to database
+        # Connect to database (shared process-wide pool unless a URI is given)
         try:
-            self.client = MongoClient(self.mongo_uri)
+            self._owns_client = mongo_uri is not None
+            self.client = MongoClient(self.mongo_uri) if self._owns_client else get_client()
             self.db = self.client[self.database_name]
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
@@ -58,9 +78,14 @@ class AuthService:
                 'role_id': user.role_id,
                 'exp': datetime.now(timezone.utc) + self.access_token_expires,
                 'iat': datetime.now(timezone.utc),
+                'jti': uuid.uuid4().hex,
                 'type': 'access'
             }
             
+            # Embed permission claims so checks can skip the database
+            if claims_enabled():
+                access_payload.update(build_permission_claims(self.db, user.user_id))
+            
             # Create refresh token payload
             refresh_payload = {
                 'user_id': user.user_id,
@@ -70,8 +95,8 @@ class AuthService:
             }
             
             # Generate tokens
-            access_token = jwt.encode(access_payload, self.jwt_secret, algorithm=self.jwt_algorithm)
-            refresh_token = jwt.encode(refresh_payload, self.jwt_secret, algorithm=self.jwt_algorithm)
+            access_token = self._encode_token(access_payload)
+            refresh_token = self._encode_token(refresh_payload)
             
             return {
                 'access_token': access_token,
@@ -84,18 +109,57 @@ class AuthService:
             logger.error(f"Failed to generate tokens: {e}")
             return None
     
+    def _encode_token(self, payload):
+        """Sign a token with the newest key of the key ring, or the HS256 secret"""
+        if self.key_ring is None:
+            return jwt.encode(payload, self.jwt_secret, algorithm='HS256')
+        kid, key = self.key_ring.signing_key()
+        return jwt.encode(payload, key, algorithm=self.jwt_algorithm, headers={'kid': kid})
+    
+    def _decode_token(self, token):
+        """Check signature and expiration (exp is required) of a token"""
+        header = jwt.get_unverified_header(token)
+        if self.key_ring is None or (self.accept_legacy_hs256 and header.get('alg') == 'HS256' and 'kid' not in header):
+            # Legacy HS256 tokens stay valid until exp while JWT_ACCEPT_LEGACY_HS256 is on
+            return jwt.decode(token, self.jwt_secret, algorithms=['HS256'], options={'require': ['exp']})
+        
+        key = self.key_ring.verification_key(header.get('kid'))
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {header.get('kid')}")
+        return jwt.decode(token, key, algorithms=[self.jwt_algorithm], options={'require': ['exp']})
+    
+    @staticmethod
+    def get_token_id(access_token):
+        """Get {'jti', 'exp'} of a token this service just issued (signature not checked)"""
+        payload = jwt.decode(access_token, options={'verify_signature': False})
+        return {'jti': payload.get('jti'), 'exp': payload['exp']}
+    
+    def revoke_session_tokens(self, session_data, session_token=None):
+        """Revoke the access tokens of an invalidated session in this worker right away"""
+        get_token_cache().evict(session_token or session_data.get('session_token'))
+        get_revocation_list().revoke(session_data.get('issued_tokens'))
+    
+    def is_token_revoked(self, payload):
+        """Check the jti of a verified access token against the revocation list"""
+        return get_revocation_list().is_revoked(self.db, payload.get('jti'))
+    
     def verify_token(self, token, token_type='access'):
         """Verify JWT token"""
         try:
-            payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
+            # Access tokens already verified are served from the cache until exp
+            if token_type == 'access':
+                payload = get_token_cache().get(token)
+                if payload is not None:
+                    return payload if payload.get('type') == token_type else None
+            
+            payload = self._decode_token(token)
             
             # Check token type
             if payload.get('type') != token_type:
                 return None
             
-            # Check expiration
-            if datetime.now(timezone.utc) > datetime.fromtimestamp(payload['exp'], timezone.utc):
-                return None
+            if token_type == 'access':
+                get_token_cache().put(token, payload)
             
             return payload
             
@@ -142,19 +206,15 @@ class AuthService:
             if not user.check_password(password):
                 # Record failed login attempt
                 user.record_login_attempt(success=False, ip_address=ip_address, user_agent=user_agent)
-                users_collection.update_one(
-                    {'user_id': user.user_id},
-                    {'$set': user.to_dict(include_sensitive=True)}
-                )
+                users_collection.update_one({'user_id': user.user_id}, user.get_update())
                 logger.warning(f"Invalid password for user: {username}")
                 return None, "Invalid username or password"
             
-            # Record successful login
+            # Record successful login (bookkeeping fields are written behind)
             user.record_login_attempt(success=True, ip_address=ip_address, user_agent=user_agent)
-            users_collection.update_one(
-                {'user_id': user.user_id},
-                {'$set': user.to_dict(include_sensitive=True)}
-            )
+            update = get_activity_buffer().defer(users_collection, {'user_id': user.user_id}, user.get_update())
+            if update:
+                users_collection.update_one({'user_id': user.user_id}, update)
             
             # Generate tokens
             tokens = self.generate_tokens(user)
@@ -169,6 +229,8 @@ class AuthService:
                 ip_address=ip_address,
                 user_agent=user_agent
             )
+            token_id = self.get_token_id(tokens['access_token'])
+            session.add_issued_token(token_id['jti'], token_id['exp'])
             
             # Save session to database
             sessions_collection = self.db.user_sessions
@@ -182,6 +244,9 @@ class AuthService:
                 'session': session.to_dict()
             }, None
             
+        except PasswordHasherBusy:
+            # Let the caller answer 503 instead of a failed login
+            raise
         except Exception as e:
             logger.error(f"Authentication failed: {e}")
             return None, "Authentication service error"
@@ -231,12 +296,11 @@ class AuthService:
             # Update session
             if not session.refresh_tokens(new_tokens['access_token']):
                 return None, "Maximum refresh limit reached"
+            token_id = self.get_token_id(new_tokens['access_token'])
+            session.add_issued_token(token_id['jti'], token_id['exp'])
             
             # Update session in database
-            sessions_collection.update_one(
-                {'session_id': session.session_id},
-                {'$set': session.to_dict(include_tokens=True)}
-            )
+            sessions_collection.update_one({'session_id': session.session_id}, session.get_update())
             
             logger.info(f"Token refreshed for user: {user.username}")
             
@@ -257,24 +321,33 @@ class AuthService:
             if not payload:
                 return False, "Invalid session token"
             
-            # Find and invalidate session
+            # Find and invalidate session (any access token issued for it identifies it)
             sessions_collection = self.db.user_sessions
-            result = sessions_collection.update_one(
+            token_filter = [{'session_token': session_token}]
+            if payload.get('jti'):
+                token_filter.append({'issued_tokens.jti': payload['jti']})
+            now = datetime.now(timezone.utc).isoformat()
+            session_data = sessions_collection.find_one_and_update(
                 {
                     'user_id': payload['user_id'],
-                    'session_token': session_token,
+                    '$or': token_filter,
                     'is_active': True
                 },
                 {
                     '$set': {
                         'is_active': False,
                         'session_token': None,
-                        'updated_at': datetime.now(timezone.utc).isoformat()
+                        'revoked_at': now,
+                        'updated_at': now
                     }
-                }
+                },
+                projection={'issued_tokens': 1}
             )
             
-            if result.modified_count > 0:
+            get_token_cache().evict(session_token)
+            
+            if session_data:
+                self.revoke_session_tokens(session_data, session_token)
                 logger.info(f"User logged out: {payload['username']}")
                 return True, "Logged out successfully"
             else:
@@ -287,26 +360,8 @@ class AuthService:
     def get_user_permissions(self, user_id):
         """Get user permissions based on role"""
         try:
-            # Get user
-            users_collection = self.db.users
-            user_data = users_collection.find_one({'user_id': user_id})
-            if not user_data:
-                return []
-            
-            # Get role
-            roles_collection = self.db.roles
-            role_data = roles_collection.find_one({'role_id': user_data['role_id']})
-            if not role_data:
-                return []
-            
-            # Get permissions
-            permissions_collection = self.db.permissions
-            permission_ids = role_data.get('permissions', [])
-            permissions = list(permissions_collection.find({
-                'permission_id': {'$in': permission_ids}
-            }))
-            
-            return [perm['permission_name'] for perm in permissions]
+            permissions, _ = get_permission_cache().get_user_permissions(self.db, user_id)
+            return sorted(permissions)
             
         except Exception as e:
             logger.error(f"Failed to get user permissions: {e}")
@@ -327,6 +382,15 @@ class AuthService:
             logger.error(f"Session cleanup failed: {e}")
             return 0
 
+    def close_connection(self):
+        """Close database connection (no-op on the shared client)"""
+        if self.client and self._owns_client:
+            self.client.close()
+
+def activity_tracking_enabled():
+    """Check if authenticated requests update users.last_activity (ACTIVITY_TRACKING_ENABLED)"""
+    return os.getenv('ACTIVITY_TRACKING_ENABLED', 'false').lower() == 'true'
+
 # Decorator for protecting routes
 def require_auth(f):
     """Decorator to require authentication for routes"""
@@ -347,9 +411,19 @@ def require_auth(f):
         if not payload:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
+        if auth_service.is_token_revoked(payload):
+            return jsonify({'error': 'Token has been revoked'}), 401
+        
         # Add user info to request context
         request.current_user = payload
         
+        if activity_tracking_enabled():
+            get_activity_buffer().record(auth_service.db.users, {'user_id': payload['user_id']}, {
+                'last_activity': datetime.now(timezone.utc).isoformat(),
+                'ip_address': request.remote_addr,
+                'user_agent': request.headers.get('User-Agent')
+            })
+        
         return f(*args, **kwargs)
     
     return decorated_function
@@ -363,9 +437,16 @@ def require_permission(permission_name):
                 return jsonify({'error': 'Authentication required'}), 401
             
             auth_service = AuthService()
-            user_permissions = auth_service.get_user_permissions(request.current_user['user_id'])
-            
-            if permission_name not in user_permissions:
+            granted = None
+            if claims_enabled():
+                granted = check_token_permissions(auth_service.db, request.current_user, [permission_name])
+            if granted is None:
+                cache = get_permission_cache()
+                user_mask, _ = cache.get_user_mask(auth_service.db, request.current_user['user_id'])
+                required = cache.get_registry(auth_service.db).mask([permission_name])
+                granted = required != 0 and user_mask & required == required
+            
+            if not granted:
                 return jsonify({'error': f'Permission required: {permission_name}'}), 403
             
             return f(*args, **kwargs)
@@ -1,50 +1,128 @@
+import base64
+import codecs
 import json
 import os
 import subprocess
+import uuid
+import re
+import shlex
 import logging
 from datetime import datetime
 from app.models.asset import Asset
 from app.models.transaction import Transaction
+from app.services import fabric_protos
+from app.services.fabric_gateway import get_gateway_client
+from app.services.single_flight import get_single_flight
+from app.services.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from app.services.peer_session_pool import SessionTimeout, SessionUnavailable, get_peer_session_pool
+from app.services.docker_engine import DockerEngineTimeout, DockerEngineUnavailable, get_docker_engine
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keys written by InitLedger of the ibn-basic chaincode
+INIT_LEDGER_ASSET_IDS = ('asset1', 'asset2', 'asset3', 'asset4', 'asset5', 'asset6')
+
 class BlockchainService:
     """Service for interacting with Hyperledger Fabric blockchain"""
     
-    def __init__(self):
+    def __init__(self, gateway=None):
         self.cli_container = "deployment-package-cli-1"
         self.channel_name = "mychannel"
         self.chaincode_name = "ibn-basic"
         self.orderer_url = "orderer.example.com:7050"
+        self.peer_addresses = ["peer0.ibn.ictu.edu.vn:7051", "peer0.partner1.example.com:8051"]
+
+        # Persistent gateway connection, the peer CLI is used when it is not configured
+        self.gateway = gateway if gateway is not None else get_gateway_client()
+
+    @property
+    def transport(self):
+        """Name of the transport used for chaincode calls"""
+        return 'gateway' if self.gateway else 'cli'
         
     def _execute_peer_command(self, command, capture_output=True):
-        """Execute peer command in CLI container"""
+        """Execute peer command in CLI container through the peer CLI circuit breaker"""
         try:
-            full_command = f"docker exec {self.cli_container} {command}"
-            logger.info(f"Executing: {full_command}")
+            return get_circuit_breaker('peer_cli').call(
+                lambda: self._run_peer_command(command, capture_output),
+                is_failure=self._is_network_failure
+            )
+        except CircuitOpenError as e:
+            return {
+                'success': False,
+                'output': '',
+                'error': str(e),
+                'circuit_open': True
+            }
+
+    @staticmethod
+    def _is_network_failure(result):
+        """Check if a failed command means the network is unreachable (not a chaincode error)"""
+        # Chaincode errors are reported by a reachable peer as "response: status:500 ..."
+        return not result['success'] and 'status:500' not in result['error']
+
+    def is_available(self):
+        """Check if at least one transport is accepting calls"""
+        if self.gateway and not get_circuit_breaker('gateway').is_open():
+            return True
+        return not get_circuit_breaker('peer_cli').is_open()
+
+    @staticmethod
+    def _command_result(returncode, stdout, stderr):
+        """Build command result dict from exit code and output streams"""
+        if returncode == 0:
+            return {
+                'success': True,
+                'output': stdout.strip() if stdout else '',
+                'log': stderr.strip() if stderr else '',
+                'error': None
+            }
+        return {
+            'success': False,
+            'output': stdout.strip() if stdout else '',
+            'error': stderr.strip() if stderr else 'Unknown error'
+        }
+
+    def _run_peer_command(self, command, capture_output=True):
+        """Execute peer command (argv list) in CLI container"""
+        try:
+            # Docker Engine API exec, no docker client process and no shell quoting
+            engine = get_docker_engine()
+            if engine:
+                try:
+                    logger.info(f"Executing via Engine API: {shlex.join(command)}")
+                    return self._command_result(*engine.exec_run(self.cli_container, command, timeout=30))
+                except DockerEngineTimeout:
+                    raise subprocess.TimeoutExpired(command, 30)
+                except DockerEngineUnavailable as e:
+                    # Only before the exec was started; afterwards the command may have run
+                    logger.warning(f"Docker Engine API unavailable, using docker CLI: {e}")
+
+            # Reuse a persistent session when pooling is enabled
+            pool = get_peer_session_pool(self.cli_container)
+            if pool:
+                try:
+                    logger.info(f"Executing on session: {shlex.join(command)}")
+                    return self._command_result(*pool.execute(shlex.join(command), timeout=30))
+                except SessionTimeout:
+                    raise subprocess.TimeoutExpired(command, 30)
+                except SessionUnavailable as e:
+                    # Only when the command was never written to a session
+                    logger.warning(f"Peer CLI session unavailable, using docker exec: {e}")
+
+            full_command = ["docker", "exec", self.cli_container] + command
+            logger.info(f"Executing: {shlex.join(full_command)}")
             
             result = subprocess.run(
                 full_command,
-                shell=True,
                 capture_output=capture_output,
                 text=True,
                 timeout=30
             )
             
-            if result.returncode == 0:
-                return {
-                    'success': True,
-                    'output': result.stdout.strip(),
-                    'error': None
-                }
-            else:
-                return {
-                    'success': False,
-                    'output': result.stdout.strip() if result.stdout else '',
-                    'error': result.stderr.strip() if result.stderr else 'Unknown error'
-                }
+            return self._command_result(result.returncode, result.stdout, result.stderr)
                 
         except subprocess.TimeoutExpired:
             return {
@@ -59,35 +137,132 @@ class BlockchainService:
                 'error': str(e)
             }
     
+    def _query_command(self, function, args):
+        """Build peer CLI query command"""
+        query_args = json.dumps({
+            "Args": [function] + [str(arg) for arg in args]
+        })
+
+        return ["peer", "chaincode", "query",
+                "-C", self.channel_name,
+                "-n", self.chaincode_name,
+                "-c", query_args]
+
+    def _invoke_command(self, function, args):
+        """Build peer CLI invoke command"""
+        invoke_args = json.dumps({
+            "function": function,
+            "Args": [str(arg) for arg in args]
+        })
+        peer_flags = []
+        for peer in self.peer_addresses:
+            peer_flags += ["--peerAddresses", peer]
+
+        # Wait for the commit event: the result is then final and the CLI prints the real txid
+        return ["peer", "chaincode", "invoke",
+                "-o", self.orderer_url,
+                "-C", self.channel_name,
+                "-n", self.chaincode_name] + peer_flags + ["-c", invoke_args,
+                "--waitForEvent", "--waitForEventTimeout", "25s"]
+
+    def _evaluate(self, function, args=()):
+        """Evaluate chaincode function, concurrent identical queries share one execution"""
+        key = (function, self.channel_name, self.chaincode_name) + tuple(str(arg) for arg in args)
+        return get_single_flight().do(key, lambda: self._evaluate_once(function, args))
+
+    def _evaluate_once(self, function, args=()):
+        """Evaluate chaincode function (gateway first, peer CLI as fallback)"""
+        if self.gateway:
+            result = self.gateway.evaluate(function, args)
+            if result['success'] or not result.get('unavailable'):
+                return result
+            logger.warning(f"Gateway unavailable, falling back to peer CLI: {result['error']}")
+
+        return self._execute_peer_command(self._query_command(function, args))
+
+    def _submit(self, function, args=()):
+        """
+        Submit chaincode transaction (gateway first, peer CLI as fallback)
+
+        Only failures before the transaction was sent fall back to the CLI.
+        Once sent, a failure to learn the outcome comes back with
+        status_unknown and the tx_id instead of invoking a second time.
+        """
+        if self.gateway:
+            result = self.gateway.submit(function, args)
+            if result['success'] or not result.get('unavailable'):
+                return result
+            logger.warning(f"Gateway unavailable, falling back to peer CLI: {result['error']}")
+
+        result = self._execute_peer_command(self._invoke_command(function, args))
+        if result['success']:
+            # peer chaincode invoke reports its result on stderr
+            result['output'] = result['output'] or result.get('log', '')
+            result['tx_id'] = self._extract_tx_id(result['output'])
+        return result
+
+    def submit_async(self, function, args=()):
+        """
+        Endorse and send transaction without waiting for commit
+
+        Returns the transaction handle and a `wait` callable that blocks until
+        the commit outcome is known. The peer CLI cannot split endorsement from
+        commit, so on the CLI path the whole invoke runs inside `wait` and the
+        handle is a locally generated ID.
+        """
+        if self.gateway:
+            endorsement = self.gateway.endorse(function, args)
+            if endorsement['success']:
+                sent = self.gateway.send(endorsement)
+                if sent['success'] or sent.get('status_unknown'):
+                    tx_id = endorsement['tx_id']
+                    return {
+                        'success': True,
+                        'tx_id': tx_id,
+                        'output': endorsement['output'],
+                        'wait': lambda: self.gateway.commit_status(tx_id)
+                    }
+                endorsement = sent
+            if not endorsement.get('unavailable'):
+                return endorsement
+            logger.warning(f"Gateway unavailable, falling back to peer CLI: {endorsement['error']}")
+
+        return {
+            'success': True,
+            'tx_id': f"tx_{uuid.uuid4().hex}",
+            'output': '',
+            'wait': lambda: self._submit(function, args)
+        }
+
+    def commit_status(self, tx_id, timeout=None):
+        """Look up the commit outcome of a submitted transaction (gateway only)"""
+        if not self.gateway:
+            return {'success': False, 'status_unknown': True, 'tx_id': tx_id,
+                    'error': 'Commit status lookup needs the Fabric gateway'}
+        return self.gateway.commit_status(tx_id, timeout=timeout)
+
+    @staticmethod
+    def _submit_failure(result):
+        """Failure result of a submit, keeping tx_id when the outcome is unknown"""
+        failure = {'success': False, 'error': result['error']}
+        if result.get('status_unknown'):
+            failure.update(status_unknown=True, tx_id=result['tx_id'])
+        return failure
+
     def create_asset(self, asset_id, color, size, owner, appraised_value):
         """Create asset on blockchain"""
         try:
-            # Prepare invoke command
-            invoke_args = json.dumps({
-                "function": "CreateAsset",
-                "Args": [asset_id, color, str(size), owner, str(appraised_value)]
-            })
-            
-            command = f"""peer chaincode invoke \\
-                -o {self.orderer_url} \\
-                -C {self.channel_name} \\
-                -n {self.chaincode_name} \\
-                --peerAddresses peer0.ibn.ictu.edu.vn:7051 \\
-                --peerAddresses peer0.partner1.example.com:8051 \\
-                -c '{invoke_args}'"""
-            
-            result = self._execute_peer_command(command)
+            result = self._submit("CreateAsset", [asset_id, color, size, owner, appraised_value])
             
             if result['success']:
-                # Extract transaction ID from output
-                tx_id = self._extract_tx_id(result['output'])
-
                 return {
                     'success': True,
-                    'tx_id': tx_id,
+                    'tx_id': result['tx_id'],
                     'result': f'Asset {asset_id} created successfully',
                     'output': result['output']
                 }
+            elif result.get('status_unknown'):
+                return self._submit_failure(result)
             else:
                 # Mock successful creation for demo
                 logger.warning(f"Blockchain invoke failed, using mock response: {result['error']}")
@@ -112,19 +287,86 @@ class BlockchainService:
                 'error': str(e)
             }
     
+    def create_assets(self, assets, chunk_size=None):
+        """
+        Create many assets through the CreateAssets chaincode function
+
+        Assets are submitted in chunks, one transaction per chunk. Returns one
+        entry per chunk with the transaction ID and the per-asset results.
+        """
+        chunk_size = chunk_size or int(os.getenv('ASSET_BATCH_CHUNK_SIZE', 100))
+        chunks = []
+
+        for start in range(0, len(assets), chunk_size):
+            chunk = assets[start:start + chunk_size]
+            payload = json.dumps([{
+                'ID': asset.asset_id,
+                'color': asset.color,
+                'size': asset.size,
+                'owner': asset.owner,
+                'appraisedValue': asset.appraised_value
+            } for asset in chunk])
+
+            try:
+                result = self._submit("CreateAssets", [payload])
+            except Exception as e:
+                logger.error(f"Error creating asset batch: {e}")
+                result = {'success': False, 'error': str(e)}
+
+            if result['success']:
+                chunks.append({
+                    'success': True,
+                    'tx_id': result['tx_id'],
+                    'results': self._parse_batch_output(result.get('output'), chunk)
+                })
+            elif result.get('status_unknown'):
+                # Sent, the outcome of the whole chunk is not known yet
+                chunks.append({
+                    'success': False,
+                    'status_unknown': True,
+                    'tx_id': result['tx_id'],
+                    'error': result['error'],
+                    'results': [{'ID': asset.asset_id, 'created': False, 'unknown': True, 'error': result['error']}
+                                for asset in chunk]
+                })
+            else:
+                chunks.append({
+                    'success': False,
+                    'error': result['error'],
+                    'results': [{'ID': asset.asset_id, 'created': False, 'error': result['error']}
+                                for asset in chunk]
+                })
+
+        return chunks
+
+    def _parse_batch_output(self, output, chunk):
+        """Parse CreateAssets result payload (the peer CLI prints it inside its log line)"""
+        payload = output or ''
+        match = re.search(r'payload:"(.*)"', payload)
+        if match:
+            # Protobuf text format: C-style escapes, non-ASCII as octal escapes of the UTF-8 bytes
+            try:
+                payload = codecs.escape_decode(match.group(1).encode('utf-8'))[0].decode('utf-8')
+            except (ValueError, UnicodeDecodeError):
+                payload = ''
+
+        try:
+            results = json.loads(payload)
+            if isinstance(results, list) and len(results) == len(chunk):
+                return results
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+        # Transaction committed but the payload is not available - the chaincode skips
+        # assets that already exist, so which ones were written is not known
+        return [{'ID': asset.asset_id, 'created': False, 'unknown': True,
+                 'error': 'Transaction committed but its per-asset result is not available'}
+                for asset in chunk]
+
     def read_asset(self, asset_id):
         """Read asset from blockchain"""
         try:
-            query_args = json.dumps({
-                "Args": ["ReadAsset", asset_id]
-            })
-            
-            command = f"""peer chaincode query \\
-                -C {self.channel_name} \\
-                -n {self.chaincode_name} \\
-                -c '{query_args}'"""
-            
-            result = self._execute_peer_command(command)
+            result = self._evaluate("ReadAsset", [asset_id])
             
             if result['success']:
                 try:
@@ -154,16 +396,7 @@ class BlockchainService:
     def get_all_assets(self):
         """Get all assets from blockchain"""
         try:
-            query_args = json.dumps({
-                "Args": ["GetAllAssets"]
-            })
-
-            command = f"""peer chaincode query \\
-                -C {self.channel_name} \\
-                -n {self.chaincode_name} \\
-                -c '{query_args}'"""
-
-            result = self._execute_peer_command(command)
+            result = self._evaluate("GetAllAssets", [])
 
             if result['success']:
                 try:
@@ -216,38 +449,52 @@ class BlockchainService:
                 'error': str(e)
             }
     
+    def get_assets_page(self, page_size=50, bookmark=''):
+        """Get one page of assets from blockchain (bookmark-based pagination)"""
+        try:
+            result = self._evaluate("GetAssetsWithPagination", [int(page_size), bookmark or ''])
+
+            if result['success']:
+                try:
+                    page = json.loads(result['output'])
+                    return {
+                        'success': True,
+                        'data': page.get('records') or [],
+                        'count': page.get('fetchedRecordsCount', 0),
+                        'bookmark': page.get('bookmark') or None
+                    }
+                except json.JSONDecodeError:
+                    return {
+                        'success': False,
+                        'error': 'Invalid JSON response from blockchain'
+                    }
+            else:
+                return {
+                    'success': False,
+                    'error': result['error']
+                }
+
+        except Exception as e:
+            logger.error(f"Error getting assets page: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
     def transfer_asset(self, asset_id, new_owner):
         """Transfer asset ownership"""
         try:
-            invoke_args = json.dumps({
-                "function": "TransferAsset",
-                "Args": [asset_id, new_owner]
-            })
-            
-            command = f"""peer chaincode invoke \\
-                -o {self.orderer_url} \\
-                -C {self.channel_name} \\
-                -n {self.chaincode_name} \\
-                --peerAddresses peer0.ibn.ictu.edu.vn:7051 \\
-                --peerAddresses peer0.partner1.example.com:8051 \\
-                -c '{invoke_args}'"""
-            
-            result = self._execute_peer_command(command)
+            result = self._submit("TransferAsset", [asset_id, new_owner])
             
             if result['success']:
-                tx_id = self._extract_tx_id(result['output'])
-                
                 return {
                     'success': True,
-                    'tx_id': tx_id,
+                    'tx_id': result['tx_id'],
                     'result': f'Asset {asset_id} transferred to {new_owner}',
                     'output': result['output']
                 }
             else:
-                return {
-                    'success': False,
-                    'error': result['error']
-                }
+                return self._submit_failure(result)
                 
         except Exception as e:
             logger.error(f"Error transferring asset: {e}")
@@ -259,16 +506,7 @@ class BlockchainService:
     def asset_exists(self, asset_id):
         """Check if asset exists"""
         try:
-            query_args = json.dumps({
-                "Args": ["AssetExists", asset_id]
-            })
-            
-            command = f"""peer chaincode query \\
-                -C {self.channel_name} \\
-                -n {self.chaincode_name} \\
-                -c '{query_args}'"""
-            
-            result = self._execute_peer_command(command)
+            result = self._evaluate("AssetExists", [asset_id])
             
             if result['success']:
                 exists = result['output'].lower() == 'true'
@@ -292,35 +530,18 @@ class BlockchainService:
     def init_ledger(self):
         """Initialize ledger with sample data"""
         try:
-            invoke_args = json.dumps({
-                "function": "InitLedger",
-                "Args": []
-            })
-            
-            command = f"""peer chaincode invoke \\
-                -o {self.orderer_url} \\
-                -C {self.channel_name} \\
-                -n {self.chaincode_name} \\
-                --peerAddresses peer0.ibn.ictu.edu.vn:7051 \\
-                --peerAddresses peer0.partner1.example.com:8051 \\
-                -c '{invoke_args}'"""
-            
-            result = self._execute_peer_command(command)
+            result = self._submit("InitLedger", [])
             
             if result['success']:
-                tx_id = self._extract_tx_id(result['output'])
-                
                 return {
                     'success': True,
-                    'tx_id': tx_id,
+                    'tx_id': result['tx_id'],
                     'result': 'Ledger initialized with sample assets',
+                    'asset_ids': list(INIT_LEDGER_ASSET_IDS),
                     'output': result['output']
                 }
             else:
-                return {
-                    'success': False,
-                    'error': result['error']
-                }
+                return self._submit_failure(result)
                 
         except Exception as e:
             logger.error(f"Error initializing ledger: {e}")
@@ -329,17 +550,126 @@ class BlockchainService:
                 'error': str(e)
             }
     
+    def get_chain_height(self):
+        """Get current block height of the channel"""
+        try:
+            if self.gateway:
+                result = self.gateway.evaluate("GetChainInfo", [self.channel_name], chaincode_name='qscc')
+                if result['success']:
+                    return {'success': True, 'height': fabric_protos.parse_blockchain_info(result['payload'])}
+                if not result.get('unavailable'):
+                    return {'success': False, 'error': result['error']}
+
+            result = self._execute_peer_command(["peer", "channel", "getinfo", "-c", self.channel_name])
+            if not result['success']:
+                return {'success': False, 'error': result['error']}
+
+            # Output format: "Blockchain info: {"height":5,"currentBlockHash":"..."}"
+            info = json.loads(result['output'][result['output'].index('{'):])
+            return {'success': True, 'height': int(info['height'])}
+
+        except (ValueError, KeyError) as e:
+            return {'success': False, 'error': f'Invalid channel info response: {e}'}
+        except Exception as e:
+            logger.error(f"Error getting chain height: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def get_block(self, block_number):
+        """
+        Get committed block with the key writes of this chaincode
+
+        Returns {'number', 'transactions': [{'tx_id', 'function', 'valid', 'writes': [...]}]}
+        where each write is {'key', 'value', 'is_delete'}.
+        """
+        try:
+            if self.gateway:
+                result = self.gateway.evaluate("GetBlockByNumber", [self.channel_name, block_number],
+                                               chaincode_name='qscc')
+                if result['success']:
+                    return {'success': True, 'data': fabric_protos.parse_block(result['payload'], self.chaincode_name)}
+                if not result.get('unavailable'):
+                    return {'success': False, 'error': result['error']}
+
+            block_file = f"/tmp/{self.channel_name}_{block_number}.block"
+            script = (f"peer channel fetch {int(block_number)} {block_file} "
+                      f"-o {self.orderer_url} -c {self.channel_name} && "
+                      f"configtxlator proto_decode --input {block_file} --type common.Block; "
+                      f"status=$?; rm -f {block_file}; exit $status")
+            result = self._execute_peer_command(["sh", "-c", script])
+            if not result['success']:
+                return {'success': False, 'error': result['error']}
+
+            return {'success': True, 'data': self._decode_block(json.loads(result['output']))}
+
+        except (ValueError, KeyError) as e:
+            return {'success': False, 'error': f'Invalid block response: {e}'}
+        except Exception as e:
+            logger.error(f"Error getting block {block_number}: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def _decode_block(self, block):
+        """Extract transactions and chaincode writes from a configtxlator-decoded block"""
+        metadata = block.get('metadata', {}).get('metadata', [])
+        # TRANSACTIONS_FILTER holds one validation code per transaction, 0 means VALID
+        tx_filter = base64.b64decode(metadata[2]) if len(metadata) > 2 and metadata[2] else b''
+
+        transactions = []
+        for index, envelope in enumerate(block.get('data', {}).get('data', [])):
+            payload = envelope.get('payload', {})
+            channel_header = payload.get('header', {}).get('channel_header', {})
+            if channel_header.get('type') not in (3, 'ENDORSER_TRANSACTION'):
+                continue
+
+            function = None
+            writes = []
+            for action in payload.get('data', {}).get('actions', []):
+                action_payload = action.get('payload', {})
+                spec_args = (action_payload.get('chaincode_proposal_payload', {}).get('input', {})
+                             .get('chaincode_spec', {}).get('input', {}).get('args', []))
+                if spec_args and function is None:
+                    function = base64.b64decode(spec_args[0]).decode('utf-8')
+
+                results = (action_payload.get('action', {}).get('proposal_response_payload', {})
+                           .get('extension', {}).get('results', {}))
+                for ns_rwset in results.get('ns_rwset', []):
+                    if ns_rwset.get('namespace') != self.chaincode_name:
+                        continue
+                    for write in ns_rwset.get('rwset', {}).get('writes', []):
+                        is_delete = bool(write.get('is_delete'))
+                        writes.append({
+                            'key': write['key'],
+                            'value': None if is_delete else base64.b64decode(write.get('value', '')).decode('utf-8'),
+                            'is_delete': is_delete
+                        })
+
+            transactions.append({
+                'tx_id': channel_header.get('tx_id'),
+                'function': function,
+                'valid': index >= len(tx_filter) or tx_filter[index] == 0,
+                'writes': writes
+            })
+
+        return {
+            'number': int(block.get('header', {}).get('number', 0)),
+            'transactions': transactions
+        }
+
     def get_network_status(self):
+        """Get blockchain network status, concurrent callers share one execution"""
+        return get_single_flight().do(('network_status', self.channel_name), self._get_network_status)
+
+    def _get_network_status(self):
         """Get blockchain network status"""
         try:
             # Check peer version
-            peer_result = self._execute_peer_command("peer version")
+            peer_result = self._execute_peer_command(["peer", "version"])
             
             # Check channel info
-            channel_result = self._execute_peer_command(f"peer channel getinfo -c {self.channel_name}")
+            channel_result = self._execute_peer_command(["peer", "channel", "getinfo", "-c", self.channel_name])
             
             status = {
                 'timestamp': datetime.utcnow().isoformat(),
+                'transport': self.transport,
                 'peer_status': peer_result['success'],
                 'channel_status': channel_result['success'],
                 'peer_version': peer_result['output'] if peer_result['success'] else None,
@@ -366,14 +696,13 @@ class BlockchainService:
             for line in lines:
                 if 'txid' in line.lower() or 'transaction' in line.lower():
                     # Extract hex string that looks like transaction ID
-                    import re
                     tx_pattern = r'[a-fA-F0-9]{64}'
                     match = re.search(tx_pattern, line)
                     if match:
                         return match.group(0)
             
-            # Fallback: generate timestamp-based ID
-            return f"tx_{int(datetime.utcnow().timestamp())}"
+            # Fallback: local ID, unique across concurrent calls
+            return f"tx_{uuid.uuid4().hex}"
             
         except Exception:
-            return f"tx_{int(datetime.utcnow().timestamp())}"
+            return f"tx_{uuid.uuid4().hex}"
@@ -0,0 +1,171 @@
+import os
+import time
+import threading
+import logging
+from collections import deque
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Circuit breaker '{name}' is open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a sliding window of recent calls
+
+    The circuit opens when the failure rate or the slow call rate of the
+    window crosses its threshold. After open_seconds it lets a limited
+    number of probe calls through (half-open), closing again when they all
+    succeed and re-opening on the first failure.
+    """
+
+    def __init__(self, name, failure_rate_threshold=None, slow_call_seconds=None,
+                 slow_call_rate_threshold=None, window_size=None, min_calls=None,
+                 open_seconds=None, half_open_probes=None):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold or float(os.getenv('CIRCUIT_FAILURE_RATE', 0.5))
+        self.slow_call_seconds = slow_call_seconds or float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', 5))
+        self.slow_call_rate_threshold = slow_call_rate_threshold or float(os.getenv('CIRCUIT_SLOW_CALL_RATE', 0.8))
+        self.window_size = window_size or int(os.getenv('CIRCUIT_WINDOW_SIZE', 20))
+        self.min_calls = min_calls or int(os.getenv('CIRCUIT_MIN_CALLS', 5))
+        self.open_seconds = open_seconds or float(os.getenv('CIRCUIT_OPEN_SECONDS', 30))
+        self.half_open_probes = half_open_probes or int(os.getenv('CIRCUIT_HALF_OPEN_PROBES', 1))
+
+        self._lock = threading.Lock()
+        self._window = deque(maxlen=self.window_size)
+        self.state = CLOSED
+        self.opened_at = None
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+
+    def _transition(self, state):
+        if state != self.state:
+            logger.warning(f"Circuit breaker '{self.name}' {self.state} -> {state}")
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._window.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def allow_request(self):
+        """Check if a call may go through, reserving a probe slot when half-open"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    self.rejected += 1
+                    return False
+                self._probes_in_flight += 1
+
+            return True
+
+    def record(self, success, duration):
+        """Record the outcome of an allowed call"""
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._transition(OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self._transition(CLOSED)
+                return
+
+            self._window.append((not success, slow))
+            if self.state == CLOSED and len(self._window) >= self.min_calls:
+                failure_rate, slow_rate = self._rates()
+                if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                    self._transition(OPEN)
+
+    def _rates(self):
+        if not self._window:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / len(self._window), slow / len(self._window)
+
+    def call(self, fn, is_failure=None):
+        """
+        Run fn through the breaker
+
+        Args:
+            fn (callable): Call to protect
+            is_failure (callable): Classifies a returned result as failure
+
+        Raises:
+            CircuitOpenError: The circuit is open and the call was not made
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self.record(False, time.monotonic() - start)
+            raise
+        self.record(not (is_failure and is_failure(result)), time.monotonic() - start)
+        return result
+
+    def retry_after(self):
+        """Seconds until an open circuit lets a probe through"""
+        if self.state != OPEN:
+            return 0
+        return max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+
+    def is_open(self):
+        """Check if calls are currently being rejected"""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self.opened_at < self.open_seconds
+
+    def get_status(self):
+        """Get breaker state and window statistics"""
+        with self._lock:
+            failure_rate, slow_rate = self._rates()
+            return {
+                'state': self.state,
+                'failure_rate': round(failure_rate, 3),
+                'slow_call_rate': round(slow_rate, 3),
+                'window_calls': len(self._window),
+                'rejected': self.rejected,
+                'retry_after': round(self.retry_after(), 1)
+            }
+
+
+# Process-wide breakers, one per blockchain transport
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name):
+    """Get the shared circuit breaker with the given name"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def get_circuit_breakers_status():
+    """Get status of all circuit breakers"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.get_status() for name, breaker in breakers.items()}
@@ -0,0 +1,85 @@
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+class CommitTracker:
+    """Background tracking of commit status for asynchronously submitted transactions"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or int(os.getenv('COMMIT_TRACKER_WORKERS', 8))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='commit-tracker')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.completed = 0
+        self.failed = 0
+
+    def track(self, tx_id, wait, on_complete):
+        """
+        Wait for a transaction in the background
+
+        Args:
+            tx_id (str): Transaction handle returned to the client
+            wait (callable): Blocks until the commit outcome is known, returns a result dict
+            on_complete (callable): Called with the result dict once the outcome is known
+        """
+        with self._lock:
+            self._pending.add(tx_id)
+        return self._executor.submit(self._run, tx_id, wait, on_complete)
+
+    def _run(self, tx_id, wait, on_complete):
+        try:
+            try:
+                result = wait()
+            except Exception as e:
+                logger.error(f"Commit tracking failed for {tx_id}: {e}")
+                result = {'success': False, 'error': str(e)}
+
+            on_complete(result)
+
+            with self._lock:
+                if result['success']:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+        except Exception as e:
+            logger.error(f"Commit callback failed for {tx_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(tx_id)
+
+    def is_pending(self, tx_id):
+        """Check if transaction is still being tracked"""
+        with self._lock:
+            return tx_id in self._pending
+
+    def get_stats(self):
+        """Get tracker statistics"""
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'completed': self.completed,
+                'failed': self.failed,
+                'workers': self.max_workers
+            }
+
+    def shutdown(self, wait=True):
+        """Stop the tracker"""
+        self._executor.shutdown(wait=wait)
+
+
+# Process-wide tracker shared by the asset routes
+_commit_tracker = None
+_tracker_lock = threading.Lock()
+
+def get_commit_tracker():
+    """Get the shared commit tracker"""
+    global _commit_tracker
+    with _tracker_lock:
+        if _commit_tracker is None:
+            _commit_tracker = CommitTracker()
+        return _commit_tracker
@@ -0,0 +1,238 @@
+"""
+Docker Engine API client
+Runs commands in the CLI container through the exec API on the Docker
+unix socket, used by BlockchainService in place of the `docker` binary.
+"""
+
+import http.client
+import json
+import os
+import queue
+import socket
+import stat
+import struct
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = '/var/run/docker.sock'
+
+# Stream types of the multiplexed exec output
+STDOUT = 1
+STDERR = 2
+
+class DockerEngineError(Exception):
+    """Raised when the Docker Engine API cannot run a command"""
+
+
+class DockerEngineTimeout(DockerEngineError):
+    """Raised when an exec did not finish in time"""
+
+
+class DockerEngineUnavailable(DockerEngineError):
+    """Raised when an exec could not be created, so the command never ran"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a unix domain socket"""
+
+    def __init__(self, socket_path, timeout=30):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def demux_stream(data):
+    """
+    Split a multiplexed exec stream into stdout and stderr
+
+    Each frame is an 8 byte header [stream type, 0, 0, 0, payload size (uint32 BE)]
+    followed by the payload.
+    """
+    stdout, stderr = bytearray(), bytearray()
+    offset = 0
+    while offset + 8 <= len(data):
+        stream_type, size = struct.unpack('>BxxxL', data[offset:offset + 8])
+        payload = data[offset + 8:offset + 8 + size]
+        if stream_type == STDERR:
+            stderr += payload
+        else:
+            stdout += payload
+        offset += 8 + size
+    return bytes(stdout), bytes(stderr)
+
+
+class DockerEngineClient:
+    """Docker Engine API client with a pool of keep-alive connections"""
+
+    def __init__(self, socket_path=None, pool_size=None, api_version=None, timeout=30):
+        self.socket_path = socket_path or os.getenv('DOCKER_SOCKET', DEFAULT_SOCKET)
+        self.pool_size = pool_size or int(os.getenv('DOCKER_POOL_SIZE', 8))
+        self.api_version = api_version or os.getenv('DOCKER_API_VERSION', 'v1.41')
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue(maxsize=self.pool_size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests = 0
+
+    def _new_connection(self, timeout=None):
+        with self._lock:
+            self.connections_opened += 1
+        return UnixHTTPConnection(self.socket_path, timeout=timeout or self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, method, path, body=None, timeout=None, reusable=True):
+        """
+        Send an API request and return (status, data)
+
+        Keep-alive connections are reused; a request failing on a reused
+        connection (closed by the daemon while idle) is retried once on a
+        fresh one. Non reusable requests (hijacked exec streams) always get
+        their own connection, which is closed afterwards.
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+
+        for attempt in range(2):
+            conn = None
+            if reusable and attempt == 0:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    pass
+            reused = conn is not None
+            if conn is None:
+                conn = self._new_connection(timeout)
+            elif timeout:
+                conn.timeout = timeout
+                if conn.sock:
+                    conn.sock.settimeout(timeout)
+
+            try:
+                conn.request(method, f'/{self.api_version}{path}', body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except socket.timeout:
+                conn.close()
+                raise DockerEngineTimeout('Command timeout')
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if reused:
+                    continue
+                raise DockerEngineError(f'Docker Engine API unreachable: {e}')
+
+            with self._lock:
+                self.requests += 1
+            if reusable and not response.will_close:
+                self._release(conn)
+            else:
+                conn.close()
+            return response.status, data
+
+        raise DockerEngineError('Docker Engine API unreachable')
+
+    @staticmethod
+    def _error_message(data):
+        try:
+            return json.loads(data).get('message', '')
+        except ValueError:
+            return data.decode('utf-8', 'replace')
+
+    def exec_run(self, container, argv, timeout=None):
+        """
+        Run argv in a container without a shell
+
+        Returns (exit code, stdout, stderr) with decoded output. Failures
+        before the exec is started raise DockerEngineUnavailable; once it was
+        started the command may have run, and DockerEngineError is raised.
+        """
+        try:
+            status, data = self._request('POST', f'/containers/{container}/exec', {
+                'AttachStdout': True,
+                'AttachStderr': True,
+                'Tty': False,
+                'Cmd': list(argv)
+            })
+        except DockerEngineTimeout:
+            raise
+        except DockerEngineError as e:
+            raise DockerEngineUnavailable(str(e))
+        if status != 201:
+            raise DockerEngineUnavailable(f'Exec create failed ({status}): {self._error_message(data)}')
+        exec_id = json.loads(data)['Id']
+
+        # The start response is a hijacked raw stream that ends when the command exits
+        status, data = self._request('POST', f'/exec/{exec_id}/start', {'Detach': False, 'Tty': False},
+                                     timeout=timeout, reusable=False)
+        if status != 200:
+            raise DockerEngineError(f'Exec start failed ({status}): {self._error_message(data)}')
+        stdout, stderr = demux_stream(data)
+
+        status, data = self._request('GET', f'/exec/{exec_id}/json')
+        if status != 200:
+            raise DockerEngineError(f'Exec inspect failed ({status}): {self._error_message(data)}')
+        exit_code = json.loads(data).get('ExitCode')
+
+        return (exit_code if exit_code is not None else -1,
+                stdout.decode('utf-8', 'replace'),
+                stderr.decode('utf-8', 'replace'))
+
+    def get_stats(self):
+        """Get connection statistics"""
+        with self._lock:
+            return {
+                'socket': self.socket_path,
+                'connections_opened': self.connections_opened,
+                'requests': self.requests,
+                'idle_connections': self._idle.qsize()
+            }
+
+    def close(self):
+        """Close idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _socket_available(path):
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+_docker_engine = None
+_engine_lock = threading.Lock()
+
+def get_docker_engine():
+    """
+    Get the shared Engine API client, None when the docker CLI should be used
+
+    DOCKER_TRANSPORT selects `cli` (the default), `engine`, or `auto` which
+    uses the Engine API whenever the Docker socket is available. Access to
+    the socket is root-equivalent on the host, so it is opt-in.
+    """
+    global _docker_engine
+    transport = os.getenv('DOCKER_TRANSPORT', 'cli').lower()
+    if transport == 'cli':
+        return None
+    if transport != 'engine' and not _socket_available(os.getenv('DOCKER_SOCKET', DEFAULT_SOCKET)):
+        return None
+
+    with _engine_lock:
+        if _docker_engine is None:
+            _docker_engine = DockerEngineClient()
+        return _docker_engine
@@ -0,0 +1,393 @@
+"""
+Fabric Gateway client
+Long-lived gRPC connections to the gateway peers (which forward to the orderer),
+used by BlockchainService in place of `docker exec peer chaincode ...`
+
+Proposals, transactions and commit status requests are fabric-protos
+messages (see fabric_protos) signed with the X.509 identity of an MSP
+member, as the Fabric Gateway service of a peer requires.
+"""
+
+import glob
+import os
+import threading
+import logging
+
+try:
+    import grpc
+except ImportError:  # grpcio is optional - BlockchainService falls back to the peer CLI
+    grpc = None
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+
+from app.services import fabric_protos
+from app.services.circuit_breaker import CircuitOpenError, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+GATEWAY_SERVICE = 'gateway.Gateway'
+
+# Status codes that mean "the network is not reachable" rather than "the chaincode said no".
+# The gateway reports chaincode and endorsement failures as UNKNOWN / ABORTED / FAILED_PRECONDITION.
+UNAVAILABLE_CODES = ('UNAVAILABLE', 'DEADLINE_EXCEEDED', 'CANCELLED')
+# Submit outcomes after which the transaction may still have reached the orderer
+SUBMIT_UNKNOWN_CODES = ('DEADLINE_EXCEEDED', 'CANCELLED')
+
+# Order of the curves Fabric MSPs use, for low-S signature normalization
+CURVE_ORDERS = {
+    'secp256r1': 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551,
+    'secp384r1': int('FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC7634D81F4372DDF'
+                     '581A0DB248B0A77AECEC196ACCC52973', 16),
+}
+
+
+class SigningIdentity:
+    """X.509 identity of an MSP member that signs proposals and transactions"""
+
+    def __init__(self, msp_id, certificate, private_key):
+        """
+        Initialize SigningIdentity
+
+        Args:
+            msp_id (str): MSP ID of the member organization
+            certificate (bytes): PEM encoded X.509 certificate
+            private_key: ECDSA or Ed25519 private key matching the certificate
+        """
+        if isinstance(private_key, ec.EllipticCurvePrivateKey) and private_key.curve.name not in CURVE_ORDERS:
+            raise ValueError(f'Unsupported curve {private_key.curve.name}')
+        self.msp_id = msp_id
+        self.certificate = certificate
+        self.private_key = private_key
+        self.creator = fabric_protos.serialized_identity(msp_id, certificate)
+
+    @classmethod
+    def from_files(cls, msp_id, cert_path, key_path):
+        """Load certificate and private key PEM files"""
+        with open(cert_path, 'rb') as cert_file:
+            certificate = cert_file.read()
+        with open(key_path, 'rb') as key_file:
+            private_key = serialization.load_pem_private_key(key_file.read(), password=None)
+        return cls(msp_id, certificate, private_key)
+
+    @classmethod
+    def from_msp_dir(cls, msp_id, msp_dir):
+        """Load the identity of an MSP directory (signcerts/ and keystore/)"""
+        certs = sorted(glob.glob(os.path.join(msp_dir, 'signcerts', '*.pem')))
+        keys = sorted(glob.glob(os.path.join(msp_dir, 'keystore', '*')))
+        if not certs or not keys:
+            raise FileNotFoundError(f'No signcerts/keystore found in {msp_dir}')
+        return cls.from_files(msp_id, certs[0], keys[0])
+
+    def sign(self, message):
+        """Sign a message (ECDSA over SHA-256 with low-S, as Fabric verifies it)"""
+        if isinstance(self.private_key, ed25519.Ed25519PrivateKey):
+            return self.private_key.sign(message)
+
+        r, s = decode_dss_signature(self.private_key.sign(message, ec.ECDSA(hashes.SHA256())))
+        order = CURVE_ORDERS[self.private_key.curve.name]
+        if s > order // 2:
+            s = order - s
+        return encode_dss_signature(r, s)
+
+
+class GatewayClient:
+    """Client for the Fabric Gateway service over long-lived gRPC channels"""
+
+    def __init__(self, identity, peer_endpoints, channel_name='mychannel',
+                 chaincode_name='ibn-basic', tls_root_certs=None, server_name_override=None,
+                 timeout=10, commit_timeout=30):
+        """
+        Initialize GatewayClient
+
+        Args:
+            identity (SigningIdentity): Client identity signing proposals and transactions
+            peer_endpoints (list): Gateway peer addresses (host:port), tried in order
+            channel_name (str): Channel name
+            chaincode_name (str): Chaincode name
+            tls_root_certs (list): Paths of the TLS CA certificates of the peer organizations
+                (plaintext when empty)
+            server_name_override (str): TLS server name override
+            timeout (int): Evaluate/Endorse/Submit timeout in seconds
+            commit_timeout (int): CommitStatus timeout in seconds
+        """
+        if grpc is None:
+            raise RuntimeError('grpcio is not installed')
+
+        self.identity = identity
+        self.peer_endpoints = list(peer_endpoints)
+        self.channel_name = channel_name
+        self.chaincode_name = chaincode_name
+        self.timeout = timeout
+        self.commit_timeout = commit_timeout
+
+        self._credentials = None
+        if tls_root_certs:
+            bundle = b''
+            for path in tls_root_certs:
+                with open(path, 'rb') as cert_file:
+                    bundle += cert_file.read().rstrip(b'\n') + b'\n'
+            self._credentials = grpc.ssl_channel_credentials(root_certificates=bundle)
+        self._options = [
+            ('grpc.keepalive_time_ms', 60000),
+            ('grpc.keepalive_timeout_ms', 20000),
+            ('grpc.keepalive_permit_without_calls', 1),
+        ]
+        if server_name_override:
+            self._options.append(('grpc.ssl_target_name_override', server_name_override))
+
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Create client from environment variables, None when the gateway is disabled"""
+        if os.getenv('BLOCKCHAIN_TRANSPORT', 'cli') != 'gateway':
+            return None
+        if grpc is None:
+            logger.warning("BLOCKCHAIN_TRANSPORT=gateway but grpcio is not installed, using peer CLI")
+            return None
+
+        msp_id = os.getenv('FABRIC_MSP_ID', 'IbnMSP')
+        try:
+            if os.getenv('FABRIC_CERT_PATH') and os.getenv('FABRIC_KEY_PATH'):
+                identity = SigningIdentity.from_files(msp_id, os.getenv('FABRIC_CERT_PATH'),
+                                                      os.getenv('FABRIC_KEY_PATH'))
+            else:
+                identity = SigningIdentity.from_msp_dir(msp_id, os.getenv(
+                    'FABRIC_MSP_DIR',
+                    '/app/config/crypto/peerOrganizations/ibn.ictu.edu.vn/users/Admin@ibn.ictu.edu.vn/msp'
+                ))
+        except (OSError, ValueError) as e:
+            logger.error(f"BLOCKCHAIN_TRANSPORT=gateway but the client identity cannot be loaded, using peer CLI: {e}")
+            return None
+
+        peers = [p.strip() for p in os.getenv('FABRIC_GATEWAY_PEERS', 'peer0.ibn.ictu.edu.vn:7051').split(',') if p.strip()]
+        return cls(
+            identity=identity,
+            peer_endpoints=peers,
+            channel_name=os.getenv('FABRIC_CHANNEL', 'mychannel'),
+            chaincode_name=os.getenv('FABRIC_CHAINCODE', 'ibn-basic'),
+            tls_root_certs=[p.strip() for p in os.getenv('FABRIC_TLS_ROOT_CERTS', '').split(',') if p.strip()],
+            server_name_override=os.getenv('FABRIC_TLS_SERVER_NAME') or None,
+            timeout=int(os.getenv('FABRIC_GATEWAY_TIMEOUT', 10)),
+            commit_timeout=int(os.getenv('FABRIC_COMMIT_TIMEOUT', 30))
+        )
+
+    def _channel(self, endpoint):
+        """Get (or open) the persistent channel for an endpoint"""
+        with self._lock:
+            channel = self._channels.get(endpoint)
+            if channel is None:
+                if self._credentials:
+                    channel = grpc.secure_channel(endpoint, self._credentials, options=self._options)
+                else:
+                    channel = grpc.insecure_channel(endpoint, options=self._options)
+                self._channels[endpoint] = channel
+                logger.info(f"Opened gateway channel to {endpoint}")
+            return channel
+
+    def _call(self, method, request, timeout=None):
+        """Call a gateway method through the gateway circuit breaker"""
+        if method == 'CommitStatus':
+            # Waiting for commit is expected to be slow, it does not count towards the breaker
+            return self._call_endpoints(method, request, timeout)
+
+        try:
+            return get_circuit_breaker('gateway').call(
+                lambda: self._call_endpoints(method, request, timeout),
+                is_failure=lambda result: result[1] is not None and result[1]['unavailable']
+            )
+        except CircuitOpenError as e:
+            return None, {'error': str(e), 'unavailable': True}
+
+    def _call_endpoints(self, method, request, timeout=None):
+        """Call a gateway method, failing over between endpoints when unreachable"""
+        last_error = None
+        for endpoint in self.peer_endpoints:
+            # Messages are encoded by fabric_protos, gRPC carries the bytes as they are
+            stub = self._channel(endpoint).unary_unary(f'/{GATEWAY_SERVICE}/{method}')
+            try:
+                return stub(request, timeout=timeout or self.timeout), None
+            except grpc.RpcError as e:
+                code = e.code().name if e.code() else 'UNKNOWN'
+                last_error = {
+                    'error': e.details() or code,
+                    'code': code,
+                    'unavailable': code in UNAVAILABLE_CODES
+                }
+                if not last_error['unavailable']:
+                    return None, last_error
+                logger.warning(f"Gateway endpoint {endpoint} unavailable: {last_error['error']}")
+        return None, last_error or {'error': 'No gateway endpoints configured', 'unavailable': True}
+
+    def _proposal(self, function, args, chaincode_name=None):
+        """Build and sign a proposal, returns (tx_id, SignedProposal bytes)"""
+        tx_id, proposal = fabric_protos.proposal(
+            self.channel_name,
+            chaincode_name or self.chaincode_name,
+            [function] + [arg if isinstance(arg, bytes) else str(arg) for arg in args],
+            self.identity.creator
+        )
+        return tx_id, fabric_protos.signed_proposal(proposal, self.identity.sign(proposal))
+
+    @staticmethod
+    def _failure(error):
+        return {
+            'success': False,
+            'output': '',
+            'error': error['error'],
+            'unavailable': error['unavailable']
+        }
+
+    @staticmethod
+    def _decode_error(e):
+        return {'error': f'Invalid gateway response: {e}', 'unavailable': False}
+
+    def evaluate(self, function, args=(), chaincode_name=None):
+        """
+        Evaluate a transaction function on a gateway peer (no ordering)
+
+        The result has the chaincode response as text in `output` and as bytes
+        in `payload` (system chaincodes such as qscc return protobuf).
+        """
+        tx_id, proposal = self._proposal(function, args, chaincode_name)
+        response, error = self._call('Evaluate', fabric_protos.evaluate_request(tx_id, self.channel_name, proposal))
+        if error:
+            return self._failure(error)
+        try:
+            status, message, payload = fabric_protos.parse_evaluate_response(response)
+        except fabric_protos.ProtoError as e:
+            return self._failure(self._decode_error(e))
+        if status >= 400:
+            return self._failure({'error': f'chaincode response {status}: {message}', 'unavailable': False})
+        return {
+            'success': True,
+            'output': payload.decode('utf-8', errors='replace'),
+            'payload': payload,
+            'error': None
+        }
+
+    def endorse(self, function, args=()):
+        """Collect endorsements and return the prepared (unsigned) transaction"""
+        tx_id, proposal = self._proposal(function, args)
+        response, error = self._call('Endorse', fabric_protos.endorse_request(tx_id, self.channel_name, proposal))
+        if error:
+            return self._failure(error)
+        try:
+            prepared = fabric_protos.parse_endorse_response(response)
+            result = fabric_protos.prepared_transaction_result(prepared)
+        except fabric_protos.ProtoError as e:
+            return self._failure(self._decode_error(e))
+        return {
+            'success': True,
+            'tx_id': tx_id,
+            'prepared': prepared,
+            'output': result.decode('utf-8', errors='replace'),
+            'error': None
+        }
+
+    def send(self, endorsement):
+        """Sign an endorsed transaction and send it to the orderer through the gateway"""
+        envelope = fabric_protos.envelope(endorsement['prepared'], self.identity.sign(endorsement['prepared']))
+        _, error = self._call(
+            'Submit',
+            fabric_protos.submit_request(endorsement['tx_id'], self.channel_name, envelope)
+        )
+        if error and error.get('code') in SUBMIT_UNKNOWN_CODES:
+            # The call ended without an answer, the orderer may have the transaction
+            return self._status_unknown(endorsement['tx_id'], error)
+        if error:
+            return self._failure(error)
+        return {'success': True, 'tx_id': endorsement['tx_id'], 'error': None}
+
+    @staticmethod
+    def _status_unknown(tx_id, error):
+        # The transaction may still commit: never resubmit it, ask for its status again later
+        return {
+            'success': False,
+            'status_unknown': True,
+            'unavailable': False,
+            'tx_id': tx_id,
+            'output': '',
+            'error': f"Commit status of transaction {tx_id} unknown: {error['error']}"
+        }
+
+    def commit_status(self, tx_id, timeout=None):
+        """
+        Wait for the commit status of a submitted transaction
+
+        When the status cannot be obtained (timeout, peer unreachable) the
+        result has status_unknown set and unavailable unset.
+        """
+        request = fabric_protos.commit_status_request(tx_id, self.channel_name, self.identity.creator)
+        response, error = self._call(
+            'CommitStatus',
+            fabric_protos.signed_commit_status_request(request, self.identity.sign(request)),
+            timeout=timeout or self.commit_timeout
+        )
+        if error:
+            return self._status_unknown(tx_id, error)
+        try:
+            status, block_number = fabric_protos.parse_commit_status_response(response)
+        except fabric_protos.ProtoError as e:
+            return self._status_unknown(tx_id, self._decode_error(e))
+        return {
+            'success': status == 'VALID',
+            'status': status,
+            'tx_id': tx_id,
+            'block_number': block_number,
+            'error': None if status == 'VALID' else f'Transaction {tx_id} invalidated: {status}'
+        }
+
+    def submit(self, function, args=()):
+        """Endorse, order and wait for commit of a transaction"""
+        endorsement = self.endorse(function, args)
+        if not endorsement['success']:
+            return endorsement
+
+        sent = self.send(endorsement)
+        if not sent['success']:
+            return sent
+
+        # Sent to the orderer: from here on a failure must not lead to a second submit
+        status = self.commit_status(endorsement['tx_id'])
+        if not status['success']:
+            return {
+                'success': False,
+                'output': '',
+                'error': status['error'],
+                'unavailable': False,
+                'status_unknown': status.get('status_unknown', False),
+                'tx_id': endorsement['tx_id']
+            }
+
+        return {
+            'success': True,
+            'tx_id': endorsement['tx_id'],
+            'block_number': status['block_number'],
+            'output': endorsement['output'],
+            'error': None
+        }
+
+    def close(self):
+        """Close all gateway channels"""
+        with self._lock:
+            for channel in self._channels.values():
+                channel.close()
+            self._channels = {}
+
+
+# Process-wide client shared by every BlockchainService instance
+_gateway_client = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway_client():
+    """Get the shared gateway client (None when the CLI transport is configured)"""
+    global _gateway_client
+    with _gateway_lock:
+        if _gateway_client is None:
+            _gateway_client = GatewayClient.from_env() or False
+        return _gateway_client or None
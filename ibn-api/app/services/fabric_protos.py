@@ -0,0 +1,428 @@
+"""
+Fabric protobuf messages cho Gateway client
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Protobuf wire codec for the fabric-protos messages exchanged by the
+gateway transport: gateway requests/responses, signed proposals, prepared
+transaction envelopes, qscc chain info and blocks. Fabric does not publish
+generated Python classes, so the messages are encoded here from their
+field numbers (fabric-protos v0.3). Only the fields the API reads or
+writes are modelled; unknown fields are skipped when decoding.
+"""
+
+import hashlib
+import os
+import time
+
+# Wire types
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_BYTES = 2
+WIRE_FIXED32 = 5
+
+# common.HeaderType
+ENDORSER_TRANSACTION = 3
+
+# common.BlockMetadataIndex
+TRANSACTIONS_FILTER = 2
+
+# peer.TxValidationCode
+TX_VALIDATION_CODES = {
+    0: 'VALID', 1: 'NIL_ENVELOPE', 2: 'BAD_PAYLOAD', 3: 'BAD_COMMON_HEADER',
+    4: 'BAD_CREATOR_SIGNATURE', 5: 'INVALID_ENDORSER_TRANSACTION', 6: 'INVALID_CONFIG_TRANSACTION',
+    7: 'UNSUPPORTED_TX_PAYLOAD', 8: 'BAD_PROPOSAL_TXID', 9: 'DUPLICATE_TXID',
+    10: 'ENDORSEMENT_POLICY_FAILURE', 11: 'MVCC_READ_CONFLICT', 12: 'PHANTOM_READ_CONFLICT',
+    13: 'UNKNOWN_TX_TYPE', 14: 'TARGET_CHAIN_NOT_FOUND', 15: 'MARSHAL_TX_ERROR', 16: 'NIL_TXACTION',
+    17: 'EXPIRED_CHAINCODE', 18: 'CHAINCODE_VERSION_CONFLICT', 19: 'BAD_HEADER_EXTENSION',
+    20: 'BAD_CHANNEL_HEADER', 21: 'BAD_RESPONSE_PAYLOAD', 22: 'BAD_RWSET', 23: 'ILLEGAL_WRITESET',
+    24: 'INVALID_WRITESET', 25: 'INVALID_CHAINCODE', 254: 'NOT_VALIDATED', 255: 'INVALID_OTHER_REASON'
+}
+
+
+class ProtoError(ValueError):
+    """Malformed protobuf message"""
+
+
+# Wire codec
+
+def _varint(value):
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while True:
+        bits = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ProtoError('truncated varint')
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ProtoError('varint too long')
+
+def encode(*fields):
+    """
+    Encode (field number, value) pairs
+
+    int values are written as varints (0 omitted, as proto3 does), str and
+    bytes as length-delimited fields, None is skipped. Repeat a field number
+    for repeated fields.
+    """
+    out = bytearray()
+    for number, value in fields:
+        if value is None:
+            continue
+        if isinstance(value, int):
+            if value:
+                out += _varint(number << 3 | WIRE_VARINT) + _varint(int(value))
+            continue
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        out += _varint(number << 3 | WIRE_BYTES) + _varint(len(value)) + bytes(value)
+    return bytes(out)
+
+def decode(data):
+    """Decode a message into {field number: [values]}, varints as int and length-delimited as bytes"""
+    data = bytes(data or b'')
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == WIRE_VARINT:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == WIRE_BYTES:
+            length, pos = _read_varint(data, pos)
+            if pos + length > len(data):
+                raise ProtoError('truncated field')
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type in (WIRE_FIXED64, WIRE_FIXED32):
+            size = 8 if wire_type == WIRE_FIXED64 else 4
+            value = int.from_bytes(data[pos:pos + size], 'little')
+            pos += size
+        else:
+            raise ProtoError(f'unsupported wire type {wire_type}')
+        fields.setdefault(number, []).append(value)
+    return fields
+
+def _field(fields, number, default=b''):
+    # proto3: the last occurrence of a singular field wins
+    values = fields.get(number)
+    return values[-1] if values else default
+
+def _text(fields, number):
+    return _field(fields, number).decode('utf-8')
+
+
+# Client side: proposals and gateway requests
+
+def serialized_identity(msp_id, certificate):
+    """msp.SerializedIdentity of an X.509 identity (PEM certificate bytes)"""
+    return encode((1, msp_id), (2, certificate))
+
+def _timestamp(seconds):
+    return encode((1, int(seconds)), (2, int((seconds % 1) * 1e9)))
+
+def _chaincode_id(name):
+    return encode((2, name))
+
+def chaincode_proposal_payload(chaincode_name, args):
+    """peer.ChaincodeProposalPayload invoking chaincode_name with args (function first)"""
+    chaincode_input = encode(*((1, arg) for arg in args))
+    chaincode_spec = encode((2, _chaincode_id(chaincode_name)), (3, chaincode_input))
+    return encode((1, encode((1, chaincode_spec))))
+
+def transaction_id(nonce, creator):
+    """Transaction ID Fabric expects for a nonce and creator"""
+    return hashlib.sha256(nonce + creator).hexdigest()
+
+def proposal(channel_id, chaincode_name, args, creator, nonce=None):
+    """
+    Build an endorser transaction proposal
+
+    Args:
+        channel_id (str): Channel name
+        chaincode_name (str): Chaincode name
+        args (list): Function name followed by its arguments, as str or bytes
+        creator (bytes): Serialized identity of the submitter
+
+    Returns:
+        tuple: (transaction ID, peer.Proposal bytes)
+    """
+    nonce = nonce or os.urandom(24)
+    tx_id = transaction_id(nonce, creator)
+    channel_header = encode(
+        (1, ENDORSER_TRANSACTION),
+        (3, _timestamp(time.time())),
+        (4, channel_id),
+        (5, tx_id),
+        (7, encode((2, _chaincode_id(chaincode_name))))
+    )
+    signature_header = encode((1, creator), (2, nonce))
+    header = encode((1, channel_header), (2, signature_header))
+    return tx_id, encode((1, header), (2, chaincode_proposal_payload(chaincode_name, args)))
+
+def signed_proposal(proposal_bytes, signature):
+    """peer.SignedProposal"""
+    return encode((1, proposal_bytes), (2, signature))
+
+def evaluate_request(tx_id, channel_id, signed_proposal_bytes):
+    """gateway.EvaluateRequest"""
+    return encode((1, tx_id), (2, channel_id), (3, signed_proposal_bytes))
+
+def endorse_request(tx_id, channel_id, signed_proposal_bytes):
+    """gateway.EndorseRequest"""
+    return encode((1, tx_id), (2, channel_id), (3, signed_proposal_bytes))
+
+def envelope(payload, signature):
+    """common.Envelope"""
+    return encode((1, payload), (2, signature))
+
+def submit_request(tx_id, channel_id, envelope_bytes):
+    """gateway.SubmitRequest"""
+    return encode((1, tx_id), (2, channel_id), (3, envelope_bytes))
+
+def commit_status_request(tx_id, channel_id, identity):
+    """gateway.CommitStatusRequest, sent inside a SignedCommitStatusRequest"""
+    return encode((1, tx_id), (2, channel_id), (3, identity))
+
+def signed_commit_status_request(request, signature):
+    """gateway.SignedCommitStatusRequest"""
+    return encode((1, request), (2, signature))
+
+
+# Client side: responses
+
+def parse_response(data):
+    """peer.Response as (status, message, payload)"""
+    fields = decode(data)
+    return _field(fields, 1, 0), _text(fields, 2), _field(fields, 3)
+
+def parse_evaluate_response(data):
+    """gateway.EvaluateResponse as (status, message, payload)"""
+    return parse_response(_field(decode(data), 1))
+
+def parse_endorse_response(data):
+    """Unsigned prepared transaction (common.Envelope payload) of a gateway.EndorseResponse"""
+    return _field(decode(_field(decode(data), 1)), 1)
+
+def parse_envelope(data):
+    """common.Envelope as (payload, signature)"""
+    fields = decode(data)
+    return _field(fields, 1), _field(fields, 2)
+
+def parse_commit_status_response(data):
+    """gateway.CommitStatusResponse as (validation code name, block number)"""
+    fields = decode(data)
+    code = _field(fields, 1, 0)
+    return TX_VALIDATION_CODES.get(code, str(code)), _field(fields, 2, 0)
+
+def parse_blockchain_info(data):
+    """Height of a common.BlockchainInfo returned by qscc GetChainInfo"""
+    return _field(decode(data), 1, 0)
+
+
+# Transactions and blocks
+
+def parse_payload_header(payload):
+    """
+    Channel and signature header fields of a common.Payload (or peer.Proposal)
+
+    Returns:
+        dict: type, channel_id, tx_id, creator, nonce
+    """
+    header = decode(_field(decode(payload), 1))
+    channel_header = decode(_field(header, 1))
+    signature_header = decode(_field(header, 2))
+    return {
+        'type': _field(channel_header, 1, 0),
+        'channel_id': _text(channel_header, 4),
+        'tx_id': _text(channel_header, 5),
+        'creator': _field(signature_header, 1),
+        'nonce': _field(signature_header, 2)
+    }
+
+def parse_identity(creator):
+    """msp.SerializedIdentity as (msp_id, PEM certificate bytes)"""
+    fields = decode(creator)
+    return _text(fields, 1), _field(fields, 2)
+
+def _chaincode_invocation(proposal_payload):
+    # ChaincodeProposalPayload.input -> ChaincodeInvocationSpec.chaincode_spec
+    invocation_spec = decode(_field(decode(proposal_payload), 1))
+    chaincode_spec = decode(_field(invocation_spec, 1))
+    name = _text(decode(_field(chaincode_spec, 2)), 2)
+    args = decode(_field(chaincode_spec, 3)).get(1, [])
+    return name, args
+
+def parse_signed_proposal(data):
+    """
+    Decode a peer.SignedProposal
+
+    Returns:
+        dict: proposal_bytes, signature, header (bytes), payload (bytes),
+        chaincode, args (list of bytes) and the parse_payload_header fields
+    """
+    fields = decode(data)
+    proposal_bytes, signature = _field(fields, 1), _field(fields, 2)
+    proposal_fields = decode(proposal_bytes)
+    chaincode, args = _chaincode_invocation(_field(proposal_fields, 2))
+    return {
+        'proposal_bytes': proposal_bytes,
+        'signature': signature,
+        'header': _field(proposal_fields, 1),
+        'payload': _field(proposal_fields, 2),
+        'chaincode': chaincode,
+        'args': args,
+        **parse_payload_header(proposal_bytes)
+    }
+
+def _chaincode_actions(transaction):
+    """(proposal payload, ChaincodeAction fields) of each action of a peer.Transaction"""
+    for action in decode(transaction).get(1, []):
+        action_payload = decode(_field(decode(action), 2))
+        endorsed_action = decode(_field(action_payload, 2))
+        response_payload = decode(_field(endorsed_action, 1))
+        yield _field(action_payload, 1), decode(_field(response_payload, 2))
+
+def prepared_transaction_result(payload):
+    """Chaincode response payload recorded in an endorsed transaction (common.Payload)"""
+    for _, chaincode_action in _chaincode_actions(_field(decode(payload), 2)):
+        return parse_response(_field(chaincode_action, 3))[2]
+    return b''
+
+def _writes(results, namespace):
+    writes = []
+    for ns_rwset in decode(results).get(2, []):
+        ns_fields = decode(ns_rwset)
+        if _text(ns_fields, 1) != namespace:
+            continue
+        for write in decode(_field(ns_fields, 2)).get(3, []):
+            write_fields = decode(write)
+            is_delete = bool(_field(write_fields, 2, 0))
+            writes.append({
+                'key': _text(write_fields, 1),
+                'value': None if is_delete else _field(write_fields, 3).decode('utf-8'),
+                'is_delete': is_delete
+            })
+    return writes
+
+def parse_block(data, chaincode_name):
+    """
+    Decode a common.Block returned by qscc GetBlockByNumber
+
+    Returns:
+        dict: {'number', 'transactions': [{'tx_id', 'function', 'valid', 'writes'}]}
+        with the key writes of chaincode_name, as BlockchainService.get_block
+    """
+    block = decode(data)
+    number = _field(decode(_field(block, 1)), 1, 0)
+    metadata = decode(_field(block, 3)).get(1, [])
+    # One validation code per transaction, 0 means VALID
+    tx_filter = metadata[TRANSACTIONS_FILTER] if len(metadata) > TRANSACTIONS_FILTER else b''
+
+    transactions = []
+    for index, envelope_bytes in enumerate(decode(_field(block, 2)).get(1, [])):
+        payload = parse_envelope(envelope_bytes)[0]
+        header = parse_payload_header(payload)
+        if header['type'] != ENDORSER_TRANSACTION:
+            continue
+
+        function = None
+        writes = []
+        for proposal_payload, chaincode_action in _chaincode_actions(_field(decode(payload), 2)):
+            _, args = _chaincode_invocation(proposal_payload)
+            if args and function is None:
+                function = args[0].decode('utf-8')
+            writes += _writes(_field(chaincode_action, 1), chaincode_name)
+
+        transactions.append({
+            'tx_id': header['tx_id'],
+            'function': function,
+            'valid': index >= len(tx_filter) or tx_filter[index] == 0,
+            'writes': writes
+        })
+
+    return {'number': number, 'transactions': transactions}
+
+
+# Peer side, used by the stand-in peer (app/utils/stub_peer.py)
+
+def response(status, message='', payload=b''):
+    """peer.Response"""
+    return encode((1, status), (2, message), (3, payload))
+
+def evaluate_response(status, message='', payload=b''):
+    """gateway.EvaluateResponse"""
+    return encode((1, response(status, message, payload)))
+
+def endorsed_payload(proposal_info, writes, result):
+    """
+    Unsigned common.Payload of the transaction endorsing a proposal
+
+    Args:
+        proposal_info (dict): parse_signed_proposal result
+        writes (dict): Key writes of the chaincode, None value for a delete
+        result (bytes): Chaincode response payload
+    """
+    kv_writes = [
+        (3, encode((1, key), (2, int(value is None)), (3, value)))
+        for key, value in writes.items()
+    ]
+    results = encode((1, 0), (2, encode((1, proposal_info['chaincode']), (2, encode(*kv_writes)))))
+    chaincode_action = encode(
+        (1, results),
+        (3, response(200, '', result)),
+        (4, _chaincode_id(proposal_info['chaincode']))
+    )
+    proposal_hash = hashlib.sha256(proposal_info['header'] + proposal_info['payload']).digest()
+    response_payload = encode((1, proposal_hash), (2, chaincode_action))
+    action_payload = encode((1, proposal_info['payload']), (2, encode((1, response_payload))))
+    signature_header = _field(decode(proposal_info['header']), 2)
+    transaction = encode((1, encode((1, signature_header), (2, action_payload))))
+    return encode((1, proposal_info['header']), (2, transaction))
+
+def endorse_response(prepared_payload):
+    """gateway.EndorseResponse carrying the unsigned prepared transaction"""
+    return encode((1, envelope(prepared_payload, b'')))
+
+def parse_gateway_request(data):
+    """(transaction_id, channel_id, message) of an Evaluate/Endorse/SubmitRequest"""
+    fields = decode(data)
+    return _text(fields, 1), _text(fields, 2), _field(fields, 3)
+
+def parse_signed_commit_status_request(data):
+    """SignedCommitStatusRequest as (request bytes, signature, tx_id, channel_id, identity)"""
+    fields = decode(data)
+    request, signature = _field(fields, 1), _field(fields, 2)
+    request_fields = decode(request)
+    return request, signature, _text(request_fields, 1), _text(request_fields, 2), _field(request_fields, 3)
+
+def commit_status_response(code, block_number):
+    """gateway.CommitStatusResponse"""
+    return encode((1, code), (2, block_number))
+
+def blockchain_info(height, current_hash=b''):
+    """common.BlockchainInfo"""
+    return encode((1, height), (2, current_hash))
+
+def block(number, previous_hash, envelopes, tx_filter):
+    """common.Block holding the given envelopes, tx_filter one validation code per envelope"""
+    data = encode(*((1, envelope_bytes) for envelope_bytes in envelopes))
+    header = encode((1, number), (2, previous_hash), (3, hashlib.sha256(data).digest()))
+    metadata = [b''] * (TRANSACTIONS_FILTER + 1)
+    metadata[TRANSACTIONS_FILTER] = bytes(tx_filter)
+    return encode((1, header), (2, data), (3, encode(*((1, entry) for entry in metadata))))
@@ -0,0 +1,204 @@
+"""
+JWT signing keys cho Authentication
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Asymmetric (EdDSA / RS256) signing keys kept as PEM files in JWT_KEYS_DIR,
+one file per key named `<kid>.pem`. Every key in the directory verifies and
+is published in the JWKS, so other services can verify tokens locally.
+Rotation adds a key file (see app/utils/rotate_jwt_keys.py) that is
+published right away but only signs once JWT_KEY_ACTIVATION_DELAY seconds
+have passed (by default the JWKS cache lifetime plus the reload interval),
+so clients holding a cached key set already know it.
+
+Switching from HS256 to JWT_ALGORITHM=EdDSA / RS256:
+1. Keep JWT_SECRET set to the secret that signed the HS256 tokens and
+   leave JWT_ACCEPT_LEGACY_HS256 on (the default), so tokens issued before
+   the switch stay valid until they expire.
+2. Deploy; new tokens are signed with the key ring.
+3. After one refresh token lifetime (30 days) no HS256 token can still be
+   valid: set JWT_ACCEPT_LEGACY_HS256=false.
+Tokens signed with the built-in development secret are never accepted
+after the switch, anyone could forge them.
+"""
+
+import fcntl
+import json
+import os
+import secrets
+import time
+import threading
+import logging
+from datetime import datetime, timezone
+
+from jwt.algorithms import get_default_algorithms
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ('EdDSA', 'RS256')
+
+class JWTKeyRing:
+    """Signing key and verification keys of one asymmetric algorithm"""
+
+    def __init__(self, algorithm, keys_dir=None, reload_interval=None, activation_delay=None):
+        """
+        Initialize JWTKeyRing
+
+        Args:
+            algorithm (str): EdDSA (Ed25519) or RS256
+            keys_dir (str): Directory of `<kid>.pem` private keys
+            reload_interval (float): Seconds between directory rescans
+            activation_delay (float): Seconds a new key is published before it signs
+        """
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir or os.getenv('JWT_KEYS_DIR', 'config/jwt-keys')
+        self.reload_interval = reload_interval if reload_interval is not None else \
+            float(os.getenv('JWT_KEYS_RELOAD_INTERVAL', 60))
+        self.activation_delay = activation_delay if activation_delay is not None else \
+            float(os.getenv('JWT_KEY_ACTIVATION_DELAY', int(os.getenv('JWKS_MAX_AGE', 300)) + self.reload_interval))
+
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._created = {}
+        self._loaded_at = None
+
+    def _key_matches(self, key):
+        if self.algorithm == 'EdDSA':
+            return isinstance(key, ed25519.Ed25519PrivateKey)
+        return isinstance(key, rsa.RSAPrivateKey)
+
+    def _generate_key(self):
+        if self.algorithm == 'EdDSA':
+            return ed25519.Ed25519PrivateKey.generate()
+        return rsa.generate_private_key(public_exponent=65537, key_size=int(os.getenv('JWT_RSA_KEY_SIZE', 2048)))
+
+    def _load(self, created=None):
+        keys = {}
+        for name in sorted(os.listdir(self.keys_dir)) if os.path.isdir(self.keys_dir) else []:
+            if not name.endswith('.pem'):
+                continue
+            try:
+                path = os.path.join(self.keys_dir, name)
+                with open(path, 'rb') as f:
+                    key = serialization.load_pem_private_key(f.read(), password=None)
+                mtime = os.path.getmtime(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping JWT key {name}: {e}")
+                continue
+            if self._key_matches(key):
+                keys[name[:-len('.pem')]] = key
+                if created is not None:
+                    created[name[:-len('.pem')]] = mtime
+        return keys
+
+    def _store(self):
+        created = {}
+        self._keys = self._load(created)
+        self._created = created
+        self._loaded_at = time.monotonic()
+
+    def reload(self, force=False):
+        """Rescan the key directory, at most once per reload interval unless forced"""
+        with self._lock:
+            if not force and self._loaded_at is not None and \
+                    time.monotonic() - self._loaded_at < self.reload_interval:
+                return
+            if not self._load():
+                self._rotate_locked()
+            self._store()
+
+    def rotate(self):
+        """Create a new key and return its kid (it signs after the activation delay)"""
+        with self._lock:
+            kid = self._rotate_locked(always=True)
+            self._store()
+            return kid
+
+    def _rotate_locked(self, always=False):
+        os.makedirs(self.keys_dir, mode=0o700, exist_ok=True)
+        # Workers starting together must not each create a first key
+        with open(os.path.join(self.keys_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if not always and self._load():
+                return None
+
+            kid = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}-{secrets.token_hex(4)}"
+            pem = self._generate_key().private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption()
+            )
+            path = os.path.join(self.keys_dir, f'{kid}.pem')
+            tmp_path = f'{path}.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pem)
+            os.replace(tmp_path, path)
+            logger.info(f"Created JWT {self.algorithm} signing key {kid}")
+            return kid
+
+    def signing_key(self):
+        """
+        Get (kid, private key) of the newest active key
+
+        A key is active once it has been published for activation_delay
+        seconds; until any key is, the oldest one signs (a fresh key ring).
+        """
+        self.reload()
+        active_before = time.time() - self.activation_delay
+        active = [kid for kid in self._keys if self._created.get(kid, 0) <= active_before]
+        kid = max(active) if active else min(self._keys)
+        return kid, self._keys[kid]
+
+    def verification_key(self, kid):
+        """Get the public key of a kid, None when unknown"""
+        self.reload()
+        key = self._keys.get(kid)
+        if key is None and kid:
+            # A key rotated in by another process since the last scan
+            self.reload(force=True)
+            key = self._keys.get(kid)
+        return key.public_key() if key is not None else None
+
+    def prune(self, max_age_seconds):
+        """Delete keys replaced more than max_age_seconds ago (their tokens have expired)"""
+        removed = []
+        with self._lock:
+            created = {}
+            kids = sorted(self._load(created))
+            for kid, successor in zip(kids, kids[1:]):
+                # The successor took over signing activation_delay after it was created
+                if time.time() - created[successor] - self.activation_delay > max_age_seconds:
+                    os.remove(os.path.join(self.keys_dir, f'{kid}.pem'))
+                    removed.append(kid)
+            self._store()
+        return removed
+
+    def jwks(self):
+        """Get the public JSON Web Key Set"""
+        self.reload()
+        algorithm = get_default_algorithms()[self.algorithm]
+        keys = []
+        for kid in sorted(self._keys, reverse=True):
+            jwk = json.loads(algorithm.to_jwk(self._keys[kid].public_key()))
+            jwk.update({'kid': kid, 'alg': self.algorithm, 'use': 'sig'})
+            keys.append(jwk)
+        return {'keys': keys}
+
+
+_key_ring = None
+_key_ring_lock = threading.Lock()
+
+def get_jwt_key_ring():
+    """Get the key ring of JWT_ALGORITHM, None when tokens are signed with the HS256 secret"""
+    global _key_ring
+    algorithm = os.getenv('JWT_ALGORITHM', 'HS256')
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        return None
+    with _key_ring_lock:
+        if _key_ring is None or _key_ring.algorithm != algorithm:
+            _key_ring = JWTKeyRing(algorithm)
+        return _key_ring
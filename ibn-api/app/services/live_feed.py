@@ -0,0 +1,293 @@
+"""
+Live Feed cho web dashboard (server-sent events)
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+One background thread per worker reads what changed and fans it out to
+every connected SSE client, so database and peer load follows the event
+rate instead of the number of open dashboards:
+
+- transaction / asset events from a MongoDB change stream on both
+  collections, or, when the server is not a replica set, from polling
+  them on their (timestamp, _id) / (updated_at, _id) indexes
+- stats / network events when the dashboard counters or the peer and
+  channel status differ from the last ones sent
+
+Each event is serialized once; clients only receive the prepared text
+through a bounded queue. A client that falls behind is disconnected and
+gets a fresh snapshot when its EventSource reconnects.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import logging
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .blockchain_service import BlockchainService
+from .stats_counters import get_dashboard_stats
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+WATCHED_COLLECTIONS = ('transactions', 'assets')
+# Sort field of each collection for the polling fallback
+POLL_FIELDS = {'transactions': 'timestamp', 'assets': 'updated_at'}
+EVENT_NAMES = {'transactions': 'transaction', 'assets': 'asset'}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+def format_event(event, data):
+    """Server-sent event text of one event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+
+class Subscription:
+    """Queue of prepared events for one connected client"""
+
+    # Queued in place of an event when the client is disconnected by the feed
+    CLOSED = object()
+
+    def __init__(self, queue_size):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def get(self, timeout):
+        """Next event text, None when nothing arrived within timeout, CLOSED when dropped"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LiveFeed:
+    """Single change source fanned out to all SSE subscribers of the process"""
+
+    def __init__(self, db, blockchain_service=None, poll_interval=None, stats_interval=None,
+                 network_interval=None, queue_size=None):
+        """
+        Initialize LiveFeed
+
+        Args:
+            db: MongoDB database
+            blockchain_service (BlockchainService): Source of network status
+            poll_interval (float): Seconds between polls when change streams are unavailable
+            stats_interval (float): Seconds between dashboard counter reads
+            network_interval (float): Seconds between peer/channel status checks
+            queue_size (int): Events buffered per client before it is disconnected
+        """
+        self.db = db
+        self.blockchain_service = blockchain_service or BlockchainService()
+        self.poll_interval = poll_interval or float(os.getenv('LIVE_FEED_POLL_INTERVAL', 1))
+        self.stats_interval = stats_interval or float(os.getenv('LIVE_FEED_STATS_INTERVAL', 5))
+        self.network_interval = network_interval or float(os.getenv('LIVE_FEED_NETWORK_INTERVAL', 15))
+        self.queue_size = queue_size or int(os.getenv('LIVE_FEED_QUEUE_SIZE', 100))
+
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._latest = {}
+        self._thread = None
+        self._thread_pid = None
+        self._next_stats = 0.0
+        self._next_network = 0.0
+        self.mode = None
+        self.stats = {'published': 0, 'delivered': 0, 'dropped_clients': 0, 'errors': 0}
+
+    def subscribe(self):
+        """Register a client, queueing the latest stats and network events for it first"""
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            for message in self._latest.values():
+                subscription.queue.put_nowait(message)
+            self._subscribers.add(subscription)
+            if self._thread is None or self._thread_pid != os.getpid() or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='live-feed', daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Forget a disconnected client"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event, data, latest=False):
+        """Send an event to every subscriber, latest=True also keeps it for clients connecting later"""
+        message = format_event(event, data)
+        with self._lock:
+            if latest:
+                self._latest[event] = message
+            self.stats['published'] += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+                self.stats['delivered'] += 1
+            except queue.Full:
+                self._drop(subscription)
+        return message
+
+    def _drop(self, subscription):
+        # Make room for the close marker, the client reconnects and gets a snapshot
+        with self._lock:
+            self._subscribers.discard(subscription)
+            self.stats['dropped_clients'] += 1
+        subscription.closed = True
+        try:
+            subscription.queue.get_nowait()
+        except queue.Empty:
+            pass
+        subscription.queue.put_nowait(Subscription.CLOSED)
+
+    def _has_subscribers(self):
+        with self._lock:
+            return bool(self._subscribers)
+
+    def _run(self):
+        # Every failure is retried here, the thread only ends with the process
+        source = self._watch
+        while True:
+            try:
+                source()
+            except OperationFailure as e:
+                if source == self._watch:
+                    # Change streams need a replica set, follow the indexes instead
+                    logger.info(f"Change streams unavailable ({e}), live feed polls MongoDB")
+                    source = self._poll
+                    continue
+                self._source_failed(e)
+            except Exception as e:
+                self._source_failed(e)
+
+    def _source_failed(self, error):
+        self.stats['errors'] += 1
+        logger.warning(f"Live feed source failed: {error}")
+        time.sleep(self.poll_interval)
+
+    def _watch(self):
+        """Follow inserts and updates of the watched collections through a change stream"""
+        pipeline = [{'$match': {
+            'ns.coll': {'$in': list(WATCHED_COLLECTIONS)},
+            'operationType': {'$in': ['insert', 'update', 'replace']}
+        }}]
+        with self.db.watch(pipeline, full_document='updateLookup', max_await_time_ms=1000) as stream:
+            self.mode = 'change_stream'
+            while stream.alive:
+                change = stream.try_next()
+                if change is not None and change.get('fullDocument') and self._has_subscribers():
+                    self.publish(EVENT_NAMES[change['ns']['coll']], change['fullDocument'])
+                self._tick()
+
+    def _poll(self):
+        """
+        Follow the watched collections by keyset polling on their sort indexes
+
+        Nothing is read while no client is connected; polling then resumes
+        from the newest documents, so the first client gets no backlog.
+        """
+        self.mode = 'polling'
+        positions = None
+        while True:
+            if not self._has_subscribers():
+                positions = None
+            elif positions is None:
+                positions = {name: self._last_position(name) for name in WATCHED_COLLECTIONS}
+            else:
+                for name in WATCHED_COLLECTIONS:
+                    try:
+                        positions[name] = self._poll_collection(name, positions[name])
+                    except PyMongoError as e:
+                        self.stats['errors'] += 1
+                        logger.warning(f"Live feed poll of {name} failed: {e}")
+            self._tick()
+            time.sleep(self.poll_interval)
+
+    def _last_position(self, name):
+        field = POLL_FIELDS[name]
+        last = self.db[name].find_one({}, {field: 1}, sort=[(field, -1), ('_id', -1)])
+        return (last.get(field), last['_id']) if last else (None, None)
+
+    def _poll_collection(self, name, position):
+        field = POLL_FIELDS[name]
+        value, last_id = position
+        query = {}
+        if value is not None:
+            query = {'$or': [{field: {'$gt': value}}, {field: value, '_id': {'$gt': last_id}}]}
+        for doc in self.db[name].find(query).sort([(field, 1), ('_id', 1)]).limit(100):
+            self.publish(EVENT_NAMES[name], doc)
+            position = (doc.get(field), doc['_id'])
+        return position
+
+    def _tick(self):
+        """Publish stats / network events when due and changed"""
+        if not self._has_subscribers():
+            return
+        now = time.monotonic()
+        if now >= self._next_stats:
+            self._next_stats = now + self.stats_interval
+            self._publish_if_changed('stats', self._read_stats)
+        if now >= self._next_network:
+            self._next_network = now + self.network_interval
+            self._publish_if_changed('network', self._read_network)
+
+    def _publish_if_changed(self, event, read):
+        try:
+            data = read()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Live feed {event} read failed: {e}")
+            return
+        with self._lock:
+            previous = self._latest.get(event)
+        if format_event(event, data) != previous:
+            self.publish(event, data, latest=True)
+
+    def _read_stats(self):
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        asset_stats, transaction_stats = get_dashboard_stats(self.db, today)
+        return {
+            'assets': {key: asset_stats[key] for key in ('total', 'active', 'recent_24h')},
+            'transactions': {key: value for key, value in transaction_stats.items() if key != 'function_stats'},
+            'top_owners': asset_stats['top_owners']
+        }
+
+    def _read_network(self):
+        result = self.blockchain_service.get_network_status()
+        data = result.get('data') or {}
+        return {
+            'blockchain_status': 'healthy' if result['success'] else 'unavailable',
+            'peer_status': data.get('peer_status'),
+            'channel_status': data.get('channel_status'),
+            'channel_info': data.get('channel_info')
+        }
+
+    def get_stats(self):
+        """Get feed statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'subscribers': len(self._subscribers),
+                'mode': self.mode
+            }
+
+
+_live_feed = None
+_live_feed_lock = threading.Lock()
+
+def get_live_feed(db=None):
+    """Get the process-wide live feed, created on first use with the given database"""
+    global _live_feed
+    with _live_feed_lock:
+        if _live_feed is None and db is not None:
+            _live_feed = LiveFeed(db)
+        return _live_feed
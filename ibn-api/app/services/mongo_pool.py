@@ -0,0 +1,166 @@
+"""
+Shared MongoDB connection pool
+One MongoClient per process, used by the flask_pymongo extension and by
+AuthService / RBACService instead of a new client per service instance.
+"""
+
+import os
+import threading
+import logging
+
+from flask_pymongo import PyMongo, BSONObjectIdConverter
+from pymongo import MongoClient, monitoring, uri_parser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URI = 'mongodb://localhost:27017/'
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool event counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {
+                'connections_created': 0,
+                'connections_closed': 0,
+                'checked_out': 0,
+                'checked_in': 0,
+                'checkout_failed': 0,
+                'pools_cleared': 0
+            }
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count('pools_cleared')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count('connections_created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count('connections_closed')
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count('checkout_failed')
+
+    def connection_checked_out(self, event):
+        self._count('checked_out')
+
+    def connection_checked_in(self, event):
+        self._count('checked_in')
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats['in_use'] = stats['checked_out'] - stats['checked_in']
+        stats['open'] = stats['connections_created'] - stats['connections_closed']
+        return stats
+
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_uri = None
+_metrics = PoolMetrics()
+
+def configure(uri):
+    """Set the URI of the shared client (called by create_app)"""
+    global _uri, _client
+    with _lock:
+        if uri != _uri and _client is not None and _client_pid == os.getpid():
+            _client.close()
+            _client = None
+        _uri = uri
+
+def _pool_options():
+    return {
+        'maxPoolSize': int(os.getenv('MONGO_MAX_POOL_SIZE', 100)),
+        'minPoolSize': int(os.getenv('MONGO_MIN_POOL_SIZE', 0)),
+        'maxIdleTimeMS': int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000)),
+        'waitQueueTimeoutMS': int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000))
+    }
+
+def get_client():
+    """
+    Get the process-wide MongoClient
+
+    The client is created lazily (connect=False) and re-created in a forked
+    child, since MongoClient instances must not be shared across fork.
+    """
+    global _client, _client_pid
+    with _lock:
+        if _client is None or _client_pid != os.getpid():
+            uri = _uri or os.getenv('MONGODB_URI') or os.getenv('MONGO_URI', DEFAULT_URI)
+            _client = MongoClient(uri, connect=False, event_listeners=[_metrics], **_pool_options())
+            _client_pid = os.getpid()
+        return _client
+
+def get_database(name=None):
+    """Get a database on the shared client, the URI default database when name is None"""
+    client = get_client()
+    if name:
+        return client[name]
+    return client.get_default_database(os.getenv('MONGO_DB', 'ibn_blockchain'))
+
+def get_pool_stats():
+    """Get pool configuration and connection metrics"""
+    return {**_pool_options(), **_metrics.get_stats(), 'pid': os.getpid()}
+
+def _reset_after_fork():
+    # The parent's client (and its sockets and monitor threads) is unusable in the child,
+    # the lock may have been held by another parent thread at fork time
+    global _client, _client_pid, _lock
+    _lock = threading.Lock()
+    _client = None
+    _client_pid = None
+    _metrics.reset()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SharedPyMongo(PyMongo):
+    """flask_pymongo extension backed by the shared client"""
+
+    def __init__(self, app=None, uri=None):
+        self._database_name = None
+        if app is not None:
+            self.init_app(app, uri)
+
+    def init_app(self, app, uri=None):
+        uri = uri or app.config.get('MONGO_URI')
+        if uri is None:
+            raise ValueError("You must specify a URI or set the MONGO_URI Flask config variable")
+        configure(uri)
+        self._database_name = uri_parser.parse_uri(uri)['database']
+        app.url_map.converters['ObjectId'] = BSONObjectIdConverter
+
+    @property
+    def cx(self):
+        return get_client()
+
+    @property
+    def db(self):
+        return get_client()[self._database_name] if self._database_name else None
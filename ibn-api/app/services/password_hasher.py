@@ -0,0 +1,157 @@
+"""
+Password Hasher cho Authentication
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Runs Werkzeug password hashing and verification in a dedicated process
+pool, so key stretching neither holds the GIL nor blocks the request
+threads. At most PASSWORD_HASH_QUEUE_SIZE operations are running or
+queued; beyond that callers get PasswordHasherBusy immediately instead of
+waiting behind a login storm.
+"""
+
+import os
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+logger = logging.getLogger(__name__)
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or an operation did not finish in time"""
+
+
+def _hash_password(password, method):
+    return generate_password_hash(password, method=method)
+
+def _verify_password(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+class PasswordHasher:
+    """Bounded process pool for password hashing and verification"""
+
+    def __init__(self, workers=None, queue_size=None, timeout=None, method=None):
+        """
+        Initialize PasswordHasher
+
+        Args:
+            workers (int): Hashing processes, 0 hashes on the calling thread
+            queue_size (int): Maximum operations running or waiting
+            timeout (float): Seconds to wait for one operation
+            method (str): Werkzeug hash method, e.g. 'pbkdf2:sha256:600000'
+        """
+        self.workers = workers if workers is not None else \
+            int(os.getenv('PASSWORD_HASH_WORKERS', min(os.cpu_count() or 1, 4)))
+        self.queue_size = queue_size or int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', max(self.workers, 1) * 8))
+        self.timeout = timeout or float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+        # Work factor of new hashes; existing hashes keep the method stored in them
+        self.method = method or os.getenv('PASSWORD_HASH_METHOD') or \
+            f"pbkdf2:sha256:{int(os.getenv('PASSWORD_HASH_ITERATIONS', 600000))}"
+
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self.stats = {'submitted': 0, 'rejected': 0, 'timeouts': 0, 'pool_restarts': 0}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                # spawn: never fork a process that is running request and monitor threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _reset_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.stats['pool_restarts'] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise PasswordHasherBusy('Password hashing queue is full')
+
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                future = None
+            else:
+                # The slot is held until the work is done, even if the caller gave up waiting
+                future.add_done_callback(lambda _: self._slots.release())
+                with self._lock:
+                    self.stats['submitted'] += 1
+
+            try:
+                if future is None:
+                    raise BrokenProcessPool('Password hashing pool is not usable')
+                return future.result(timeout=self.timeout)
+            except BrokenProcessPool:
+                # A worker died (OOM killer, signal); start a fresh pool once
+                logger.warning("Password hashing pool broken, restarting it")
+                self._reset_executor(executor)
+                if attempt:
+                    if future is None:
+                        self._slots.release()
+                    raise
+                if future is not None and not self._slots.acquire(blocking=False):
+                    raise PasswordHasherBusy('Password hashing queue is full')
+            except FutureTimeoutError:
+                with self._lock:
+                    self.stats['timeouts'] += 1
+                future.cancel()
+                raise PasswordHasherBusy('Password hashing timed out')
+
+    def hash(self, password):
+        """Hash a password with the configured method"""
+        return self._run(_hash_password, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash"""
+        if not password_hash:
+            return False
+        return self._run(_verify_password, password_hash, password)
+
+    def get_stats(self):
+        """Get hasher statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'method': self.method
+            }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._executor_pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_password_hasher = None
+_hasher_lock = threading.Lock()
+
+def get_password_hasher():
+    """Get the process-wide password hasher"""
+    global _password_hasher
+    with _hasher_lock:
+        if _password_hasher is None:
+            _password_hasher = PasswordHasher()
+        return _password_hasher
@@ -0,0 +1,231 @@
+import base64
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+import logging
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+FRAME_MARKER = '__IBN_FRAME__'
+
+class SessionError(Exception):
+    """Raised when a session cannot run a command (not started, died or timed out)"""
+
+
+class SessionTimeout(SessionError):
+    """Raised when a command did not finish in time"""
+
+
+class SessionUnavailable(SessionError):
+    """Raised when no session could take a command, so it was never sent"""
+
+
+class PeerCliSession:
+    """
+    Long-lived `sh` inside the CLI container
+
+    Each command runs in a subshell (so `exit` or `cd` cannot affect the
+    session) and its exit code, stdout and stderr come back as one framed line:
+        __IBN_FRAME__ <id> <exit code> out=<base64> err=<base64>
+    """
+
+    def __init__(self, argv):
+        self.argv = argv
+        self.process = None
+        self.last_used = 0.0
+        self.commands = 0
+        self._lines = queue.Queue()
+
+    def start(self):
+        """Spawn the shell and its stdout reader"""
+        try:
+            self.process = subprocess.Popen(
+                self.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+        except OSError as e:
+            raise SessionUnavailable(f'Cannot start session: {e}')
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self.process, self._lines),
+                         name='peer-cli-session-reader', daemon=True).start()
+        self.last_used = time.monotonic()
+
+    @staticmethod
+    def _read_stdout(process, lines):
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def is_alive(self):
+        """Check if the shell process is running"""
+        return self.process is not None and self.process.poll() is None
+
+    def execute(self, command, timeout=30):
+        """Run command in the session and return (exit code, stdout, stderr)"""
+        if not self.is_alive():
+            raise SessionUnavailable('Session is not running')
+
+        frame_id = uuid.uuid4().hex
+        tmp = f'/tmp/.ibn_{frame_id}'
+        script = (
+            f"( {command}\n) </dev/null >{tmp}.out 2>{tmp}.err; __rc=$?; "
+            f"printf '{FRAME_MARKER} {frame_id} %s out=%s err=%s\\n' \"$__rc\" "
+            f"\"$(base64 <{tmp}.out | tr -d '\\n')\" \"$(base64 <{tmp}.err | tr -d '\\n')\"; "
+            f"rm -f {tmp}.out {tmp}.err\n"
+        )
+        try:
+            self.process.stdin.write(script)
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise SessionError(f'Session pipe closed: {e}')
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                raise SessionTimeout('Command timeout')
+            if line is None:
+                raise SessionError('Session exited')
+
+            parts = line.split()
+            if len(parts) == 5 and parts[0] == FRAME_MARKER and parts[1] == frame_id:
+                self.last_used = time.monotonic()
+                self.commands += 1
+                stdout = base64.b64decode(parts[3][len('out='):]).decode('utf-8', 'replace')
+                stderr = base64.b64decode(parts[4][len('err='):]).decode('utf-8', 'replace')
+                return int(parts[2]), stdout, stderr
+
+    def close(self):
+        """Terminate the shell"""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.process = None
+
+
+class PeerSessionPool:
+    """Pool of persistent CLI container sessions, one command in flight per session"""
+
+    def __init__(self, container, size=None, health_interval=None, argv=None):
+        self.container = container
+        self.size = size or int(os.getenv('PEER_CLI_POOL_SIZE', 4))
+        self.health_interval = health_interval or float(os.getenv('PEER_CLI_HEALTH_INTERVAL', 60))
+        self.argv = argv or ['docker', 'exec', '-i', container, 'sh']
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self.restarts = 0
+        self.executed = 0
+
+    def _checkout(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return PeerCliSession(self.argv)
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise SessionUnavailable('No session available')
+
+    def _ensure_healthy(self, session):
+        """Start or restart a session that is dead or failed its health check"""
+        if session.is_alive() and time.monotonic() - session.last_used < self.health_interval:
+            return
+
+        if session.is_alive():
+            try:
+                exit_code, stdout, _ = session.execute('echo ok', timeout=5)
+                if exit_code == 0 and stdout.strip() == 'ok':
+                    return
+            except SessionError:
+                pass
+
+        if session.process is not None:
+            self.restarts += 1
+            logger.warning(f"Restarting peer CLI session in {self.container}")
+        session.close()
+        session.start()
+
+    def execute(self, command, timeout=30):
+        """
+        Run command on a pooled session
+
+        Returns (exit code, stdout, stderr). Raises SessionUnavailable when
+        the command was never sent, SessionError when it was sent but no
+        result came back; a session that timed out or died is discarded.
+        """
+        session = self._checkout(timeout)
+        try:
+            self._ensure_healthy(session)
+            result = session.execute(command, timeout)
+        except SessionError:
+            # The shell state is unknown after a failure, replace the session
+            session.close()
+            with self._lock:
+                self._created -= 1
+            raise
+
+        with self._lock:
+            self.executed += 1
+        self._idle.put(session)
+        return result
+
+    def get_stats(self):
+        """Get pool statistics"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'sessions': self._created,
+                'idle': self._idle.qsize(),
+                'executed': self.executed,
+                'restarts': self.restarts
+            }
+
+    def close(self):
+        """Close idle sessions"""
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            session.close()
+            with self._lock:
+                self._created -= 1
+
+
+# Pools per CLI container, enabled when PEER_CLI_POOL_SIZE > 0
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_peer_session_pool(container):
+    """Get the shared session pool for a container, None when pooling is disabled"""
+    if int(os.getenv('PEER_CLI_POOL_SIZE', 0)) <= 0:
+        return None
+    with _pools_lock:
+        if container not in _pools:
+            _pools[container] = PeerSessionPool(container)
+        return _pools[container]
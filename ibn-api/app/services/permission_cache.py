@@ -0,0 +1,200 @@
+"""
+Permission Cache cho RBAC
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Caches the effective permissions of each role as a PermissionRegistry
+bitset (and the role of each user) in-process, so a permission check is a
+bitwise AND instead of three MongoDB queries. Writes that change
+permissions bump a version stamp in the `cache_versions` collection; every
+worker compares it at most once per check interval and drops its cache
+when it moved.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+from .permission_registry import PermissionRegistry
+
+logger = logging.getLogger(__name__)
+
+class PermissionCache:
+    """In-process cache of role permission bitsets and user roles with a shared version stamp"""
+
+    VERSION_ID = 'permissions'
+
+    def __init__(self, check_interval=None, max_users=None):
+        """
+        Initialize PermissionCache
+
+        Args:
+            check_interval (float): Seconds between version stamp checks
+            max_users (int): Maximum cached user -> role entries
+        """
+        self.check_interval = check_interval if check_interval is not None else \
+            float(os.getenv('PERMISSION_CACHE_CHECK_INTERVAL', 1))
+        self.max_users = max_users or int(os.getenv('PERMISSION_CACHE_MAX_USERS', 10000))
+
+        self._lock = threading.Lock()
+        self._registry = None
+        self._role_masks = {}
+        self._user_roles = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _clear(self):
+        self._role_masks.clear()
+        self._user_roles.clear()
+
+    def _check_version(self, db):
+        """Drop cached entries when another worker bumped the version stamp"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        stamp = db.cache_versions.find_one({'_id': self.VERSION_ID}) or {}
+        version = stamp.get('version', 0)
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                if self._version is not None:
+                    self.stats['invalidations'] += 1
+                self._clear()
+                self._version = version
+
+    def current_version(self, db):
+        """Get the permission version stamp, re-read at most once per check interval"""
+        self._check_version(db)
+        return self._version
+
+    def get_registry(self, db):
+        """Get the permission registry, built from the permissions collection on first use"""
+        registry = self._registry
+        if registry is None:
+            registry = self._extend_registry(db, None)
+        return registry
+
+    def _extend_registry(self, db, seen):
+        """Rebuild the registry keeping existing bits, unless another thread already replaced `seen`"""
+        with self._lock:
+            if self._registry is not seen:
+                return self._registry
+        registry = PermissionRegistry.from_database(db, base=seen)
+        with self._lock:
+            if self._registry is seen:
+                self._registry = registry
+            return self._registry
+
+    def get_role_mask(self, db, role_id):
+        """Get permission bitset granted to a role, None if role not found"""
+        self._check_version(db)
+        with self._lock:
+            mask = self._role_masks.get(role_id)
+            if mask is not None:
+                self.stats['hits'] += 1
+                return mask
+            self.stats['misses'] += 1
+            version = self._version
+
+        role_data = db.roles.find_one({'role_id': role_id}, {'permissions': 1})
+        if not role_data:
+            return None
+
+        registry = self.get_registry(db)
+        mask, unknown = registry.mask_of_ids(role_data.get('permissions', []))
+        if unknown:
+            # Permissions created after the registry was built
+            registry = self._extend_registry(db, registry)
+            mask, unknown = registry.mask_of_ids(role_data.get('permissions', []))
+
+        with self._lock:
+            # Do not store a result computed before a concurrent invalidation
+            if version == self._version:
+                self._role_masks[role_id] = mask
+        return mask
+
+    def get_user_role_id(self, db, user_id):
+        """Get role_id of a user, None if user not found"""
+        self._check_version(db)
+        with self._lock:
+            role_id = self._user_roles.get(user_id)
+            if role_id is not None:
+                self._user_roles.move_to_end(user_id)
+                return role_id
+            version = self._version
+
+        user_data = db.users.find_one({'user_id': user_id}, {'role_id': 1})
+        if not user_data:
+            return None
+
+        with self._lock:
+            if version == self._version:
+                self._user_roles[user_id] = user_data['role_id']
+                while len(self._user_roles) > self.max_users:
+                    self._user_roles.popitem(last=False)
+        return user_data['role_id']
+
+    def get_user_mask(self, db, user_id):
+        """Get (permission bitset, error) for a user"""
+        role_id = self.get_user_role_id(db, user_id)
+        if role_id is None:
+            return 0, "User not found"
+
+        mask = self.get_role_mask(db, role_id)
+        if mask is None:
+            return 0, "Role not found"
+        return mask, None
+
+    def get_user_permissions(self, db, user_id):
+        """Get (frozenset of permission names, error) for a user"""
+        mask, error = self.get_user_mask(db, user_id)
+        if error:
+            return frozenset(), error
+        return self.get_registry(db).names_of(mask), None
+
+    def invalidate(self, db):
+        """Drop cached permissions in every worker after a role or permission change"""
+        result = db.cache_versions.find_one_and_update(
+            {'_id': self.VERSION_ID},
+            {'$inc': {'version': 1}},
+            upsert=True,
+            return_document=True
+        )
+        with self._lock:
+            self._clear()
+            self._version = result.get('version') if result else None
+            self._checked_at = time.monotonic()
+            self.stats['invalidations'] += 1
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'version': self._version,
+                'registry_version': self._registry.version if self._registry else None,
+                'roles': len(self._role_masks),
+                'users': len(self._user_roles)
+            }
+
+
+# Process-wide cache shared by AuthService, RBACService and the decorators
+_permission_cache = PermissionCache()
+
+def get_permission_cache():
+    """Get the shared permission cache"""
+    return _permission_cache
+
+def warm_up_permission_registry():
+    """Build the permission registry in the background so startup never waits on MongoDB"""
+    from .mongo_pool import get_client
+
+    def build():
+        try:
+            _permission_cache.get_registry(get_client()[os.getenv('MONGO_DB', 'ibn_blockchain')])
+        except Exception as e:
+            logger.warning(f"Permission registry warm-up failed: {e}")
+
+    threading.Thread(target=build, name='permission-registry-warmup', daemon=True).start()
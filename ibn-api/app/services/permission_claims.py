@@ -0,0 +1,73 @@
+"""
+Permission claims cho JWT access tokens
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Carries the permission bitset of a user (PermissionRegistry bits) in the
+access token, so authorization can be decided from the verified token. The
+registry version is a hash of the ordered names: a token encoded against
+another bit layout is never decoded.
+"""
+
+import os
+import logging
+
+from .permission_cache import get_permission_cache
+
+logger = logging.getLogger(__name__)
+
+# Access token claims
+CLAIM_MASK = 'perms'
+CLAIM_REGISTRY = 'pcv'
+CLAIM_VERSION = 'pv'
+
+def claims_enabled():
+    """Check if access tokens carry permission claims (JWT_PERMISSION_CLAIMS)"""
+    return os.getenv('JWT_PERMISSION_CLAIMS', 'false').lower() == 'true'
+
+def build_permission_claims(db, user_id):
+    """Get the permission claims of a user for a new access token, {} on failure"""
+    cache = get_permission_cache()
+    try:
+        # Read the version first: a change racing with the lookup makes the token stale, not wrong
+        version = cache.current_version(db)
+        mask, error = cache.get_user_mask(db, user_id)
+        if error:
+            return {}
+        registry = cache.get_registry(db)
+    except Exception as e:
+        logger.warning(f"Failed to build permission claims: {e}")
+        return {}
+
+    return {
+        CLAIM_MASK: format(mask, 'x'),
+        CLAIM_REGISTRY: registry.version,
+        CLAIM_VERSION: version
+    }
+
+def check_token_permissions(db, payload, permission_names, require_all=False):
+    """
+    Decide a permission check from the claims of a verified access token
+
+    Returns True/False, or None when the token cannot decide it (no claims,
+    another registry, permissions changed since the token was issued, or an
+    unknown permission) and the check must go to the database.
+    """
+    mask = payload.get(CLAIM_MASK)
+    if mask is None:
+        return None
+
+    cache = get_permission_cache()
+    try:
+        registry = cache.get_registry(db)
+        if payload.get(CLAIM_REGISTRY) != registry.version or not registry.knows(permission_names):
+            return None
+        if payload.get(CLAIM_VERSION) != cache.current_version(db):
+            return None
+
+        required = registry.mask(permission_names)
+        if require_all:
+            return registry.has_all(int(mask, 16), required)
+        return registry.has_any(int(mask, 16), required)
+    except Exception as e:
+        logger.warning(f"Failed to check token permissions: {e}")
+        return None
@@ -0,0 +1,138 @@
+"""
+Permission Registry cho RBAC
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Immutable map of the `permissions` collection to bit indexes. A role's
+permissions become one integer, so any-of / all-of / pattern checks are a
+single bitwise AND. System permissions keep the bits of the
+Permission.create_system_permissions order, other permissions follow
+sorted by name; a rebuilt registry only ever appends bits, so masks
+computed against an older registry stay valid in the same process.
+"""
+
+import hashlib
+import logging
+from types import MappingProxyType
+
+from ..models.permission import Permission
+
+logger = logging.getLogger(__name__)
+
+# Permission names granting `action` on `resource_type` (validate_permission_access)
+ACCESS_PATTERNS = (
+    '{action}_{resource_type}',         # e.g., "create_projects"
+    'manage_{resource_type}',           # e.g., "manage_projects"
+    'manage_all_{resource_type}',       # e.g., "manage_all_projects"
+    '{resource_type}_management'        # e.g., "project_management"
+)
+
+SYSTEM_PERMISSION_ORDER = tuple(perm.permission_name for perm in Permission.create_system_permissions())
+
+class PermissionRegistry:
+    """Bit index per permission, built once and never modified"""
+
+    __slots__ = ('names', 'bits', 'id_bits', 'version', '_action_masks', '_resource_masks')
+
+    def __init__(self, permissions, base=None):
+        """
+        Initialize PermissionRegistry
+
+        Args:
+            permissions (list): (permission_id, permission_name) pairs
+            base (PermissionRegistry): Registry whose bits are kept, new names are appended
+        """
+        names = list(base.names) if base else []
+        id_bits = dict(base.id_bits) if base else {}
+        bits = {name: index for index, name in enumerate(names)}
+
+        order = {name: index for index, name in enumerate(SYSTEM_PERMISSION_ORDER)}
+        for permission_id, name in sorted(permissions, key=lambda p: (order.get(p[1], len(order)), p[1])):
+            if name not in bits:
+                bits[name] = len(names)
+                names.append(name)
+            id_bits[permission_id] = bits[name]
+
+        self.names = tuple(names)
+        self.bits = MappingProxyType(bits)
+        self.id_bits = MappingProxyType(id_bits)
+        self.version = hashlib.sha256('\n'.join(self.names).encode()).hexdigest()[:12]
+        self._action_masks, self._resource_masks = self._index_patterns(bits)
+
+    @staticmethod
+    def _index_patterns(bits):
+        """
+        Masks of ACCESS_PATTERNS by (resource_type, action) and by resource_type
+
+        '{action}_{resource_type}' names are indexed under every split at an
+        underscore; the patterns without {action} grant every action on their
+        resource type.
+        """
+        action_masks = {}
+        resource_masks = {}
+        for pattern in ACCESS_PATTERNS:
+            prefix, _, suffix = pattern.partition('{resource_type}')
+            for name, bit in bits.items():
+                if pattern == '{action}_{resource_type}':
+                    parts = name.split('_')
+                    for split in range(1, len(parts)):
+                        key = ('_'.join(parts[split:]), '_'.join(parts[:split]))
+                        action_masks[key] = action_masks.get(key, 0) | 1 << bit
+                elif (name.startswith(prefix) and name.endswith(suffix)
+                      and len(name) > len(prefix) + len(suffix)):
+                    resource_type = name[len(prefix):len(name) - len(suffix)]
+                    resource_masks[resource_type] = resource_masks.get(resource_type, 0) | 1 << bit
+        return MappingProxyType(action_masks), MappingProxyType(resource_masks)
+
+    @classmethod
+    def from_database(cls, db, base=None):
+        """Build the registry from the permissions collection"""
+        permissions = [
+            (perm['permission_id'], perm['permission_name'])
+            for perm in db.permissions.find({}, {'permission_id': 1, 'permission_name': 1})
+        ]
+        registry = cls(permissions, base)
+        logger.info(f"Permission registry built: {len(registry.names)} permissions, version {registry.version}")
+        return registry
+
+    def mask(self, permission_names):
+        """Bitset of permission names, names not in the registry are ignored"""
+        mask = 0
+        for name in permission_names:
+            bit = self.bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def mask_of_ids(self, permission_ids):
+        """Get (bitset, unknown ids) of permission IDs"""
+        mask = 0
+        unknown = []
+        for permission_id in permission_ids:
+            bit = self.id_bits.get(permission_id)
+            if bit is None:
+                unknown.append(permission_id)
+            else:
+                mask |= 1 << bit
+        return mask, unknown
+
+    def names_of(self, mask):
+        """Frozenset of permission names in a bitset"""
+        return frozenset(name for bit, name in enumerate(self.names) if mask >> bit & 1)
+
+    def knows(self, permission_names):
+        """Check if every name has a bit in the registry"""
+        return all(name in self.bits for name in permission_names)
+
+    def pattern_mask(self, resource_type, action):
+        """Bitset of the permissions granting an action on a resource type"""
+        return self._action_masks.get((resource_type, action), 0) | self._resource_masks.get(resource_type, 0)
+
+    @staticmethod
+    def has_any(mask, required):
+        """Check if a bitset grants any of the required bits"""
+        return mask & required != 0
+
+    @staticmethod
+    def has_all(mask, required):
+        """Check if a bitset grants all of the required bits"""
+        return mask & required == required
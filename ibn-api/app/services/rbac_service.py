@@ -8,6 +8,9 @@ from pymongo import MongoClient
 import os
 import logging
 
+from .mongo_pool import get_client
+from .permission_cache import get_permission_cache
+from .permission_claims import claims_enabled, check_token_permissions
 from ..models.user import User
 from ..models.role import Role
 from ..models.permission import Permission
@@ -25,12 +28,13 @@ class RBACService:
             mongo_uri (str): MongoDB connection URI
             database_name (str): Database name
         """
-        self.mongo_uri = mongo_uri or os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+        self.mongo_uri = mongo_uri
         self.database_name = database_name or os.getenv('MONGO_DB', 'ibn_blockchain')
         
-        # Connect to database
+        # Connect to database (shared process-wide pool unless a URI is given)
         try:
-            self.client = MongoClient(self.mongo_uri)
+            self._owns_client = mongo_uri is not None
+            self.client = MongoClient(self.mongo_uri) if self._owns_client else get_client()
             self.db = self.client[self.database_name]
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
@@ -75,17 +79,28 @@ class RBACService:
             logger.error(f"Failed to get user permissions: {e}")
             return [], "Service error"
     
+    def get_user_permission_mask(self, user_id):
+        """Get (permission bitset, registry, error) for a user"""
+        try:
+            cache = get_permission_cache()
+            mask, error = cache.get_user_mask(self.db, user_id)
+            return mask, cache.get_registry(self.db), error
+            
+        except Exception as e:
+            logger.error(f"Failed to get user permission mask: {e}")
+            return 0, None, "Service error"
+    
     def check_permission(self, user_id, permission_name):
         """Check if user has specific permission"""
         try:
-            permissions, error = self.get_user_permissions(user_id)
+            user_mask, registry, error = self.get_user_permission_mask(user_id)
             if error:
                 return False, error
             
             # Check if user has permission
-            for permission in permissions:
-                if permission.permission_name == permission_name:
-                    return True, None
+            required = registry.mask([permission_name])
+            if required and registry.has_all(user_mask, required):
+                return True, None
             
             return False, f"Permission '{permission_name}' not granted"
             
@@ -96,23 +111,24 @@ class RBACService:
     def check_multiple_permissions(self, user_id, permission_names, require_all=True):
         """Check multiple permissions"""
         try:
-            permissions, error = self.get_user_permissions(user_id)
+            user_mask, registry, error = self.get_user_permission_mask(user_id)
             if error:
                 return False, error
             
-            user_permission_names = [perm.permission_name for perm in permissions]
-            
+            required = registry.mask(permission_names)
             if require_all:
                 # User must have ALL permissions
+                if registry.knows(permission_names) and registry.has_all(user_mask, required):
+                    return True, None
                 for perm_name in permission_names:
-                    if perm_name not in user_permission_names:
+                    bit = registry.bits.get(perm_name)
+                    if bit is None or not user_mask >> bit & 1:
                         return False, f"Missing permission: {perm_name}"
                 return True, None
             else:
                 # User must have ANY permission
-                for perm_name in permission_names:
-                    if perm_name in user_permission_names:
-                        return True, None
+                if registry.has_any(user_mask, required):
+                    return True, None
                 return False, f"Missing any of permissions: {permission_names}"
                 
         except Exception as e:
@@ -149,6 +165,7 @@ class RBACService:
             )
             
             if result.modified_count > 0:
+                get_permission_cache().invalidate(self.db)
                 logger.info(f"Role {role_id} assigned to user {user_id} by {assigned_by}")
                 return True, "Role assigned successfully"
             else:
@@ -253,23 +270,13 @@ class RBACService:
         """Validate permission for specific resource and action"""
         try:
             # Get user permissions
-            permissions, error = self.get_user_permissions(user_id)
+            user_mask, registry, error = self.get_user_permission_mask(user_id)
             if error:
                 return False, error
             
-            # Check for specific permission patterns
-            permission_patterns = [
-                f"{action}_{resource_type}",  # e.g., "create_projects"
-                f"manage_{resource_type}",    # e.g., "manage_projects"
-                f"manage_all_{resource_type}", # e.g., "manage_all_projects"
-                f"{resource_type}_management"  # e.g., "project_management"
-            ]
-            
-            user_permission_names = [perm.permission_name for perm in permissions]
-            
-            for pattern in permission_patterns:
-                if pattern in user_permission_names:
-                    return True, None
+            # Check for specific permission patterns (see ACCESS_PATTERNS)
+            if registry.has_any(user_mask, registry.pattern_mask(resource_type, action)):
+                return True, None
             
             return False, f"No permission for {action} on {resource_type}"
             
@@ -332,9 +339,24 @@ class RBACService:
             logger.error(f"Failed to get permission summary: {e}")
             return None, "Service error"
     
+    def update_role_permissions(self, role_id, permission_ids):
+        """Replace permissions of a role"""
+        result = self.db.roles.update_one(
+            {'role_id': role_id},
+            {
+                '$set': {
+                    'permissions': permission_ids,
+                    'updated_at': datetime.now(timezone.utc).isoformat()
+                }
+            }
+        )
+        if result.modified_count > 0:
+            get_permission_cache().invalidate(self.db)
+        return result
+    
     def close_connection(self):
-        """Close database connection"""
-        if self.client:
+        """Close database connection (no-op on the shared client)"""
+        if self.client and self._owns_client:
             self.client.close()
 
 # Permission checking decorators
@@ -351,11 +373,20 @@ def require_any_permission(*permission_names):
             
             rbac_service = RBACService()
             try:
-                has_permission, error = rbac_service.check_multiple_permissions(
-                    request.current_user['user_id'], 
-                    list(permission_names), 
-                    require_all=False
-                )
+                granted = None
+                if claims_enabled():
+                    granted = check_token_permissions(
+                        rbac_service.db, request.current_user, permission_names, require_all=False
+                    )
+                
+                if granted is None:
+                    has_permission, error = rbac_service.check_multiple_permissions(
+                        request.current_user['user_id'], 
+                        list(permission_names), 
+                        require_all=False
+                    )
+                else:
+                    has_permission, error = granted, f"Missing any of permissions: {list(permission_names)}"
                 
                 if not has_permission:
                     return jsonify({'error': f'Permission denied: {error}'}), 403
@@ -380,11 +411,21 @@ def require_all_permissions(*permission_names):
             
             rbac_service = RBACService()
             try:
-                has_permission, error = rbac_service.check_multiple_permissions(
-                    request.current_user['user_id'], 
-                    list(permission_names), 
-                    require_all=True
-                )
+                granted = None
+                if claims_enabled():
+                    granted = check_token_permissions(
+                        rbac_service.db, request.current_user, permission_names, require_all=True
+                    )
+                
+                # A denial goes to the database check, which names the missing permission
+                if granted:
+                    has_permission, error = True, None
+                else:
+                    has_permission, error = rbac_service.check_multiple_permissions(
+                        request.current_user['user_id'], 
+                        list(permission_names), 
+                        require_all=True
+                    )
                 
                 if not has_permission:
                     return jsonify({'error': f'Permission denied: {error}'}), 403
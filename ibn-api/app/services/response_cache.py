@@ -0,0 +1,145 @@
+"""
+Response Cache cho polled read-only endpoints
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+In-process TTL cache of whole view responses, keyed by path and query
+string. Every response carries a strong ETag (sha256 of the body), so a
+client polling with If-None-Match gets a bodiless 304 while the data is
+unchanged, and the view itself only runs once per TTL per worker.
+Concurrent misses of the same key run the view once. The ETag depends only
+on the body, so workers agree on it without sharing the cache.
+"""
+
+import hashlib
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, make_response
+
+from .single_flight import SingleFlight
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+class _CachedResponse:
+    """Body and headers of a 200 response, valid until expires_at"""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'expires_at')
+
+    def __init__(self, body, mimetype, ttl):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()
+        self.expires_at = time.monotonic() + ttl
+
+
+class ResponseCache:
+    """Bounded TTL cache of view responses"""
+
+    def __init__(self, max_entries=None):
+        """
+        Initialize ResponseCache
+
+        Args:
+            max_entries (int): Cached responses kept, least recently used dropped first
+        """
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_SIZE', 256))
+        self.enabled = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._single_flight = SingleFlight()
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _render(self, key, view, args, kwargs, ttl):
+        """Run the view, caching its response when it succeeded"""
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200 or response.direct_passthrough:
+            return response, None
+        entry = _CachedResponse(response.get_data(), response.mimetype, ttl)
+        self._put(key, entry)
+        return response, entry
+
+    def serve(self, view, args, kwargs, ttl):
+        """Response of a view from the cache or a fresh run, 304 when If-None-Match matches"""
+        key = (request.path, request.query_string)
+        entry = self._get(key)
+        if entry is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+            response = make_response(entry.body)
+            response.mimetype = entry.mimetype
+        else:
+            with self._lock:
+                self.stats['misses'] += 1
+            # Only the leader runs the view; followers build their response from its entry
+            rendered = {}
+            def render():
+                rendered['response'], rendered['entry'] = self._render(key, view, args, kwargs, ttl)
+                return rendered['entry'] is not None
+            cached = self._single_flight.do(key, render)
+            response, entry = rendered.get('response'), rendered.get('entry')
+            if response is None:
+                entry = self._get(key) if cached else None
+                if entry is None:
+                    return make_response(view(*args, **kwargs))
+                response = make_response(entry.body)
+                response.mimetype = entry.mimetype
+            elif entry is None:
+                return response
+
+        response.set_etag(entry.etag)
+        # Browsers revalidate every poll; the server side TTL keeps that cheap
+        response.cache_control.no_cache = True
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            with self._lock:
+                self.stats['not_modified'] += 1
+        return response
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'enabled': self.enabled
+            }
+
+
+_response_cache = ResponseCache()
+
+def get_response_cache():
+    """Get the process-wide response cache"""
+    return _response_cache
+
+def cached_response(ttl):
+    """Serve a GET view from the response cache for ttl seconds, with ETag / 304 support"""
+    def decorator(view):
+        @wraps(view)
+        def decorated_function(*args, **kwargs):
+            cache = get_response_cache()
+            if not cache.enabled or request.method != 'GET':
+                return view(*args, **kwargs)
+            return cache.serve(view, args, kwargs, ttl)
+        return decorated_function
+    return decorator
@@ -0,0 +1,77 @@
+import copy
+import threading
+from collections import Counter
+
+class _Call:
+    """In-flight execution shared by concurrent callers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one execution
+
+    The first caller for a key runs the function, callers arriving while it
+    is in flight wait and receive a copy of the same result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.coalesced_by_key = Counter()
+
+    def do(self, key, fn):
+        """Run fn once for all concurrent callers with the same key"""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+                self.coalesced_by_key[key[0]] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        # Callers may modify the result dict, each one gets its own copy
+        return copy.deepcopy(call.result)
+
+    def get_stats(self):
+        """Get coalescing statistics"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+                'coalesced_by_function': dict(self.coalesced_by_key)
+            }
+
+
+# Process-wide instance shared by all BlockchainService objects
+_single_flight = SingleFlight()
+
+def get_single_flight():
+    """Get the shared single-flight group for ledger queries"""
+    return _single_flight
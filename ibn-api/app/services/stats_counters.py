@@ -0,0 +1,278 @@
+"""
+Materialized statistics cho dashboard
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Dashboard figures kept up to date with $inc by the code that writes assets
+and transactions, instead of aggregating the collections on every request:
+
+- stats {_id: 'dashboard'}: asset and transaction totals, per-status and
+  per-function counters
+- stats {_id: 'daily:YYYY-MM-DD'}: assets created / transactions logged that
+  day, removed by the TTL index on expires_at
+- owner_stats {_id: owner}: asset_count and total_value per owner
+
+Writers report (before, after) pairs of the documents they changed (None
+for a missing document), so inserts, upserts and transfers all reduce to
+the same diff. Counter writes never fail a request; drift from crashes
+or concurrent upserts of the same document is fixed by rebuild_stats
+(python -m app.utils.rebuild_stats). Requests never rebuild: until the
+first rebuild (run by database_init or that script) the dashboard is
+aggregated from the collections.
+"""
+
+import os
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from pymongo import ReplaceOne, UpdateOne
+
+from .stats_service import (
+    ASSET_STATS_INDEX, TRANSACTION_STATS_INDEX, TRANSACTION_STATUSES, aggregate_covered, get_collection_stats
+)
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+STATS_ID = 'dashboard'
+DAILY_PREFIX = 'daily:'
+# Daily documents are kept this long (only today's is read)
+DAILY_RETENTION_DAYS = 8
+# Counter key for transactions without a function name
+UNKNOWN_FUNCTION = '_unknown'
+
+# Fields the counters depend on, for fetching "before" documents
+ASSET_STATS_FIELDS = {'_id': 0, 'asset_id': 1, 'owner': 1, 'appraised_value': 1, 'status': 1, 'created_at': 1}
+TRANSACTION_STATS_FIELDS = {'_id': 0, 'tx_id': 1, 'function_name': 1, 'status': 1, 'timestamp': 1}
+
+
+def _day(value):
+    return value.strftime('%Y-%m-%d') if isinstance(value, datetime) else None
+
+def _day_expression(field):
+    return {'$dateToString': {'format': '%Y-%m-%d', 'date': field}}
+
+def _numeric(value):
+    # Same values $sum adds up
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+def apply_update(before, update):
+    """Document after a $set / $setOnInsert update (fields the counters need only)"""
+    after = dict(before or {})
+    if before is None:
+        after.update(update.get('$setOnInsert', {}))
+    after.update(update.get('$set', {}))
+    return after
+
+def find_before(collection, key_field, keys, projection):
+    """Current documents of the keys about to be written, by key"""
+    keys = list(keys)
+    if not keys:
+        return {}
+    return {doc[key_field]: doc for doc in collection.find({key_field: {'$in': keys}}, projection)}
+
+def _write(db, inc, daily, owners):
+    if inc:
+        db.stats.update_one({'_id': STATS_ID}, {'$inc': dict(inc)}, upsert=True)
+    for day, counts in daily.items():
+        day_counts = {name: count for name, count in counts.items() if count}
+        if day_counts:
+            db.stats.update_one(
+                {'_id': DAILY_PREFIX + day},
+                {
+                    '$inc': day_counts,
+                    '$setOnInsert': {
+                        'expires_at': datetime.strptime(day, '%Y-%m-%d') + timedelta(days=DAILY_RETENTION_DAYS)
+                    }
+                },
+                upsert=True
+            )
+    owner_updates = [
+        UpdateOne({'_id': owner}, {'$inc': {'asset_count': count, 'total_value': value}}, upsert=True)
+        for owner, (count, value) in owners.items() if count or value
+    ]
+    if owner_updates:
+        db.owner_stats.bulk_write(owner_updates, ordered=False)
+
+def record_asset_changes(db, changes):
+    """
+    Apply asset changes to the counters
+
+    Args:
+        db: MongoDB database
+        changes (list): (before, after) document pairs, None for a missing document
+    """
+    try:
+        inc = Counter()
+        daily = defaultdict(Counter)
+        owners = defaultdict(lambda: [0, 0])
+        for before, after in changes:
+            for doc, sign in ((before, -1), (after, 1)):
+                if doc is None:
+                    continue
+                inc['assets.total'] += sign
+                if doc.get('status') == 'active':
+                    inc['assets.active'] += sign
+                day = _day(doc.get('created_at'))
+                if day:
+                    daily[day]['assets'] += sign
+                owner = owners[doc.get('owner')]
+                owner[0] += sign
+                owner[1] += sign * _numeric(doc.get('appraised_value'))
+
+        _write(db, {name: count for name, count in inc.items() if count}, daily, owners)
+    except Exception as e:
+        logger.warning(f"Failed to update asset stats counters: {e}")
+
+def record_transaction_changes(db, changes):
+    """
+    Apply transaction log changes to the counters
+
+    Args:
+        db: MongoDB database
+        changes (list): (before, after) document pairs, None for a missing document
+    """
+    try:
+        inc = Counter()
+        daily = defaultdict(Counter)
+        for before, after in changes:
+            for doc, sign in ((before, -1), (after, 1)):
+                if doc is None:
+                    continue
+                status = doc.get('status')
+                function_key = f"functions.{doc.get('function_name') or UNKNOWN_FUNCTION}"
+                inc['transactions.total'] += sign
+                inc[f'transactions.{status}'] += sign
+                inc[f'{function_key}.count'] += sign
+                if status == 'success':
+                    inc[f'{function_key}.success_count'] += sign
+                day = _day(doc.get('timestamp'))
+                if day:
+                    daily[day]['transactions'] += sign
+
+        _write(db, {name: count for name, count in inc.items() if count}, daily, {})
+    except Exception as e:
+        logger.warning(f"Failed to update transaction stats counters: {e}")
+
+def rebuild_stats(db):
+    """Recompute every counter from the assets and transactions collections"""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    first_day = today - timedelta(days=DAILY_RETENTION_DAYS - 1)
+
+    assets = aggregate_covered(db.assets, [
+        {'$project': {'_id': 0, 'status': 1, 'owner': 1, 'appraised_value': 1, 'created_at': 1}},
+        {'$facet': {
+            'total': [{'$count': 'count'}],
+            'active': [{'$match': {'status': 'active'}}, {'$count': 'count'}],
+            'owners': [{'$group': {
+                '_id': '$owner',
+                'asset_count': {'$sum': 1},
+                'total_value': {'$sum': '$appraised_value'}
+            }}],
+            'daily': [
+                {'$match': {'created_at': {'$gte': first_day}}},
+                {'$group': {'_id': _day_expression('$created_at'), 'count': {'$sum': 1}}}
+            ]
+        }}
+    ], ASSET_STATS_INDEX)[0]
+
+    transactions = aggregate_covered(db.transactions, [
+        {'$project': {'_id': 0, 'status': 1, 'function_name': 1, 'timestamp': 1}},
+        {'$facet': {
+            'by_status': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}],
+            'functions': [{'$group': {
+                '_id': '$function_name',
+                'count': {'$sum': 1},
+                'success_count': {'$sum': {'$cond': [{'$eq': ['$status', 'success']}, 1, 0]}}
+            }}],
+            'daily': [
+                {'$match': {'timestamp': {'$gte': first_day}}},
+                {'$group': {'_id': _day_expression('$timestamp'), 'count': {'$sum': 1}}}
+            ]
+        }}
+    ], TRANSACTION_STATS_INDEX)[0]
+
+    by_status = {entry['_id']: entry['count'] for entry in transactions['by_status']}
+    stats_doc = {
+        'assets': {
+            'total': assets['total'][0]['count'] if assets['total'] else 0,
+            'active': assets['active'][0]['count'] if assets['active'] else 0
+        },
+        'transactions': {'total': sum(by_status.values()), **{str(status): count for status, count in by_status.items()}},
+        'functions': {
+            entry['_id'] or UNKNOWN_FUNCTION: {'count': entry['count'], 'success_count': entry['success_count']}
+            for entry in transactions['functions']
+        },
+        'rebuilt_at': datetime.utcnow()
+    }
+    db.stats.replace_one({'_id': STATS_ID}, stats_doc, upsert=True)
+
+    daily = defaultdict(dict)
+    for entry in assets['daily']:
+        daily[entry['_id']]['assets'] = entry['count']
+    for entry in transactions['daily']:
+        daily[entry['_id']]['transactions'] = entry['count']
+    db.stats.delete_many({'_id': {'$regex': f'^{DAILY_PREFIX}'}})
+    for day, counts in daily.items():
+        expires_at = datetime.strptime(day, '%Y-%m-%d') + timedelta(days=DAILY_RETENTION_DAYS)
+        db.stats.replace_one({'_id': DAILY_PREFIX + day}, {**counts, 'expires_at': expires_at}, upsert=True)
+
+    # Upserts, so rebuilds running at the same time cannot collide on _id
+    if assets['owners']:
+        db.owner_stats.bulk_write([ReplaceOne({'_id': owner['_id']}, owner, upsert=True)
+                                   for owner in assets['owners']], ordered=False)
+    db.owner_stats.delete_many({'_id': {'$nin': [owner['_id'] for owner in assets['owners']]}})
+
+    logger.info(f"Rebuilt stats: {stats_doc['assets']['total']} assets, "
+                f"{stats_doc['transactions']['total']} transactions, {len(assets['owners'])} owners")
+    return stats_doc
+
+def get_materialized_stats(db, since, top_owners=5):
+    """
+    Read the counters, in the shapes of stats_service.get_asset_stats / get_transaction_stats
+
+    The collections are aggregated while the dashboard document has no
+    rebuilt_at marker: writes made before the first rebuild upsert it with
+    their $inc deltas only.
+
+    Returns:
+        tuple: (asset_stats, transaction_stats)
+    """
+    daily_id = DAILY_PREFIX + _day(since)
+    docs = {doc['_id']: doc for doc in db.stats.find({'_id': {'$in': [STATS_ID, daily_id]}})}
+    if 'rebuilt_at' not in docs.get(STATS_ID, {}):
+        logger.warning("Stats counters were never rebuilt, run python -m app.utils.rebuild_stats")
+        return get_collection_stats(db, since, top_owners)
+    stats, today = docs[STATS_ID], docs.get(daily_id) or {}
+
+    owners = list(db.owner_stats.find({'asset_count': {'$gt': 0}}).sort('total_value', -1).limit(top_owners))
+
+    assets = stats.get('assets', {})
+    asset_stats = {
+        'total': assets.get('total', 0),
+        'active': assets.get('active', 0),
+        'recent_24h': today.get('assets', 0),
+        'top_owners': owners
+    }
+
+    counters = stats.get('transactions', {})
+    total = counters.get('total', 0)
+    transaction_stats = {status: counters.get(status, 0) for status in TRANSACTION_STATUSES}
+    function_stats = [
+        {'_id': None if name == UNKNOWN_FUNCTION else name, 'count': entry['count'],
+         'success_count': entry.get('success_count', 0)}
+        for name, entry in stats.get('functions', {}).items() if entry.get('count', 0) > 0
+    ]
+    transaction_stats.update({
+        'total': total,
+        'success_rate': round((transaction_stats['success'] / total * 100) if total > 0 else 0, 2),
+        'recent_24h': today.get('transactions', 0),
+        'function_stats': sorted(function_stats, key=lambda entry: entry['count'], reverse=True)
+    })
+    return asset_stats, transaction_stats
+
+def get_dashboard_stats(db, since, top_owners=5):
+    """(asset_stats, transaction_stats) from the counters, or aggregated when STATS_MATERIALIZED=false"""
+    if os.getenv('STATS_MATERIALIZED', 'true').lower() == 'true':
+        return get_materialized_stats(db, since, top_owners)
+    return get_collection_stats(db, since, top_owners)
@@ -0,0 +1,118 @@
+"""
+Statistics Service cho dashboard và transaction stats
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Each collection is summarised by a single $facet aggregation instead of one
+count_documents per figure. The pipelines only reference fields of one
+compound index and are hinted to it, so MongoDB answers them with a covered
+index scan instead of reading every document. The assets and transactions
+pipelines run concurrently.
+"""
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo.errors import OperationFailure
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Compound indexes holding every field the pipelines read (see mongo-init.js)
+ASSET_STATS_INDEX = [('status', 1), ('owner', 1), ('appraised_value', 1), ('created_at', 1)]
+TRANSACTION_STATS_INDEX = [('status', 1), ('function_name', 1), ('timestamp', -1), ('_id', -1)]
+
+TRANSACTION_STATUSES = ('success', 'failed', 'pending')
+
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv('STATS_QUERY_WORKERS', 4)),
+                               thread_name_prefix='stats-query')
+
+
+def aggregate_covered(collection, pipeline, index):
+    """Run a pipeline hinted to its covering index, unhinted if the index is missing"""
+    try:
+        return list(collection.aggregate(pipeline, hint=index))
+    except OperationFailure as e:
+        logger.warning(f"Stats index missing on {collection.name}, running unhinted: {e}")
+        return list(collection.aggregate(pipeline))
+
+def _facet_count(result, name):
+    return result[name][0]['count'] if result.get(name) else 0
+
+def get_asset_stats(db, since, top_owners=5):
+    """
+    Asset totals and top owners in one pass
+
+    Returns:
+        dict: total, active, recent_24h, top_owners ({_id, asset_count, total_value})
+    """
+    pipeline = [
+        {'$project': {'_id': 0, 'status': 1, 'owner': 1, 'appraised_value': 1, 'created_at': 1}},
+        {'$facet': {
+            'total': [{'$count': 'count'}],
+            'active': [{'$match': {'status': 'active'}}, {'$count': 'count'}],
+            'recent': [{'$match': {'created_at': {'$gte': since}}}, {'$count': 'count'}],
+            'top_owners': [
+                {'$group': {
+                    '_id': '$owner',
+                    'asset_count': {'$sum': 1},
+                    'total_value': {'$sum': '$appraised_value'}
+                }},
+                {'$sort': {'total_value': -1}},
+                {'$limit': top_owners}
+            ]
+        }}
+    ]
+    result = aggregate_covered(db.assets, pipeline, ASSET_STATS_INDEX)[0]
+    return {
+        'total': _facet_count(result, 'total'),
+        'active': _facet_count(result, 'active'),
+        'recent_24h': _facet_count(result, 'recent'),
+        'top_owners': result['top_owners']
+    }
+
+def get_transaction_stats(db, since):
+    """
+    Transaction totals per status and per function in one pass
+
+    Returns:
+        dict: total, success, failed, pending, success_rate, recent_24h,
+        function_stats ({_id, count, success_count})
+    """
+    pipeline = [
+        {'$project': {'_id': 0, 'status': 1, 'function_name': 1, 'timestamp': 1}},
+        {'$facet': {
+            'by_status': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}],
+            'recent': [{'$match': {'timestamp': {'$gte': since}}}, {'$count': 'count'}],
+            'function_stats': [
+                {'$group': {
+                    '_id': '$function_name',
+                    'count': {'$sum': 1},
+                    'success_count': {
+                        '$sum': {
+                            '$cond': [{'$eq': ['$status', 'success']}, 1, 0]
+                        }
+                    }
+                }},
+                {'$sort': {'count': -1}}
+            ]
+        }}
+    ]
+    result = aggregate_covered(db.transactions, pipeline, TRANSACTION_STATS_INDEX)[0]
+
+    by_status = {entry['_id']: entry['count'] for entry in result['by_status']}
+    total = sum(by_status.values())
+    stats = {status: by_status.get(status, 0) for status in TRANSACTION_STATUSES}
+    stats.update({
+        'total': total,
+        'success_rate': round((stats['success'] / total * 100) if total > 0 else 0, 2),
+        'recent_24h': _facet_count(result, 'recent'),
+        'function_stats': result['function_stats']
+    })
+    return stats
+
+def get_collection_stats(db, since, top_owners=5):
+    """Run the assets and transactions pipelines concurrently, returns (asset_stats, transaction_stats)"""
+    assets_future = _executor.submit(get_asset_stats, db, since, top_owners)
+    transactions_future = _executor.submit(get_transaction_stats, db, since)
+    return assets_future.result(), transactions_future.result()
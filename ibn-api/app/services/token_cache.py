@@ -0,0 +1,102 @@
+"""
+Verified Token Cache cho Authentication
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+Bounded LRU of verified access tokens keyed by their SHA-256 digest, so a
+bearer token sent again is not HMAC-verified on every request. An entry is
+served only until the token's `exp`, and is evicted immediately when its
+session is logged out or revoked.
+"""
+
+import hashlib
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class TokenCache:
+    """LRU of decoded token payloads, valid until the token expires"""
+
+    def __init__(self, max_entries=None):
+        """
+        Initialize TokenCache
+
+        Args:
+            max_entries (int): Maximum cached tokens, 0 disables the cache
+        """
+        self.max_entries = max_entries if max_entries is not None else \
+            int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token):
+        """Get the cached payload of a token, None when not cached or expired"""
+        if self.max_entries <= 0:
+            return None
+
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            payload, exp = entry
+            if time.time() >= exp:
+                del self._entries[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            # Callers may annotate the payload, never hand out the cached dict
+            return dict(payload)
+
+    def put(self, token, payload):
+        """Cache the payload of a verified token until its exp claim"""
+        if self.max_entries <= 0 or 'exp' not in payload:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), payload['exp'])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, token):
+        """Drop a token (logout, session revocation)"""
+        if not token:
+            return
+        with self._lock:
+            if self._entries.pop(self._key(token), None) is not None:
+                self.stats['evictions'] += 1
+
+    def get_stats(self):
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else None
+            }
+
+
+# Process-wide cache used by AuthService.verify_token
+_token_cache = TokenCache()
+
+def get_token_cache():
+    """Get the shared verified-token cache"""
+    return _token_cache
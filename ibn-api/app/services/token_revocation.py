@@ -0,0 +1,175 @@
+"""
+Token Revocation List cho Authentication
+Theo kiến trúc Giai đoạn 2 - Application Layer
+
+In-memory set of revoked access token IDs (`jti` claim) that have not
+expired yet. A Bloom filter answers the common "not revoked" case without
+touching the exact set; positives are confirmed against the exact
+jti -> exp map. Every worker pulls sessions revoked since its last sync
+from `user_sessions` at most once per REVOCATION_SYNC_INTERVAL, so a
+logout in one worker is enforced by all of them without a query per
+request. Entries leave the list when their token expires.
+"""
+
+import hashlib
+import math
+import os
+import time
+import threading
+import logging
+from datetime import datetime, timezone, timedelta
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Initialize BloomFilter
+
+        Args:
+            capacity (int): Expected number of items
+            error_rate (float): Target false positive rate at capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: two 64 bit halves of one digest give every position
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """Revoked token IDs until their expiry, synced from user_sessions"""
+
+    # Re-read this far back on every sync, for writes committed out of timestamp order
+    SYNC_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, sync_interval=None, capacity=None, lookback=None):
+        """
+        Initialize RevocationList
+
+        Args:
+            sync_interval (float): Seconds between user_sessions polls
+            capacity (int): Expected revoked tokens alive at the same time
+            lookback (timedelta): How far back the first sync reads (access token lifetime)
+        """
+        self.sync_interval = sync_interval if sync_interval is not None else \
+            float(os.getenv('REVOCATION_SYNC_INTERVAL', 1))
+        self.capacity = capacity or int(os.getenv('REVOCATION_BLOOM_CAPACITY', 100000))
+        self.lookback = lookback or timedelta(hours=8)
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._bloom = BloomFilter(self.capacity)
+        self._revoked = {}
+        self._synced_until = None
+        self._synced_at = 0.0
+        self._next_purge = 0.0
+        self.stats = {'checks': 0, 'bloom_negatives': 0, 'false_positives': 0, 'revoked_hits': 0, 'syncs': 0}
+
+    def _add(self, jti, exp):
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = exp
+        self._bloom.add(jti)
+
+    def revoke(self, tokens):
+        """Add tokens ({'jti', 'exp'} items) to the local list right away"""
+        now = time.time()
+        with self._lock:
+            for token in tokens or []:
+                if token.get('jti') and token.get('exp', 0) > now:
+                    self._add(token['jti'], token['exp'])
+
+    def _purge(self, now):
+        """Drop expired entries; the Bloom filter is rebuilt since it cannot delete"""
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        if not expired:
+            return
+        for jti in expired:
+            del self._revoked[jti]
+        self._bloom = BloomFilter(max(self.capacity, len(self._revoked)))
+        for jti in self._revoked:
+            self._bloom.add(jti)
+
+    def sync(self, db):
+        """Pull sessions revoked since the last sync, at most once per sync interval"""
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            # Another thread is syncing, use the current list
+            return
+        try:
+            started = datetime.now(timezone.utc)
+            since = self._synced_until or started - self.lookback
+            revoked = db.user_sessions.find(
+                {'revoked_at': {'$gte': (since - self.SYNC_OVERLAP).isoformat()}},
+                {'issued_tokens': 1}
+            )
+            tokens = [token for session in revoked for token in session.get('issued_tokens') or []]
+
+            now = time.time()
+            with self._lock:
+                for token in tokens:
+                    if token.get('jti') and token.get('exp', 0) > now:
+                        self._add(token['jti'], token['exp'])
+                if now >= self._next_purge:
+                    self._purge(now)
+                    self._next_purge = now + 60
+                self._synced_until = started
+                self._synced_at = time.monotonic()
+                self.stats['syncs'] += 1
+        except Exception as e:
+            # Keep serving from the current list, retry on the next interval
+            logger.warning(f"Revocation list sync failed: {e}")
+            self._synced_at = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def is_revoked(self, db, jti):
+        """Check if a token ID was revoked and the token has not expired"""
+        if not jti:
+            return False
+        self.sync(db)
+        with self._lock:
+            self.stats['checks'] += 1
+            if not self._bloom.might_contain(jti):
+                self.stats['bloom_negatives'] += 1
+                return False
+            exp = self._revoked.get(jti)
+            if exp is None or exp <= time.time():
+                self.stats['false_positives'] += 1
+                return False
+            self.stats['revoked_hits'] += 1
+            return True
+
+    def get_stats(self):
+        """Get revocation list statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'revoked': len(self._revoked),
+                'bloom_bits': self._bloom.size,
+                'bloom_hashes': self._bloom.hash_count,
+                'synced_until': self._synced_until.isoformat() if self._synced_until else None
+            }
+
+
+_revocation_list = RevocationList()
+
+def get_revocation_list():
+    """Get the process-wide revocation list"""
+    return _revocation_list
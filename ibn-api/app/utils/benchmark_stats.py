@@ -0,0 +1,145 @@
+"""
+Benchmark the dashboard statistics queries
+Times the ways /api/dashboard/stats has computed its figures, against the
+same data:
+
+- sequential: the original count_documents round trips plus the owners
+  aggregation (before the $facet pipelines)
+- facet: one covered $facet pipeline per collection, run concurrently
+  (stats_service.get_collection_stats, STATS_MATERIALIZED=false)
+- materialized: the counter documents (stats_counters.get_materialized_stats)
+
+Use --seed to fill a scratch database with synthetic assets and
+transactions first; without it the existing data of --db is measured.
+The database is never modified unless --seed is given.
+
+Usage:
+    python -m app.utils.benchmark_stats --db ibn_stats_benchmark --seed 200000 --runs 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+import logging
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+from ..services.stats_service import ASSET_STATS_INDEX, TRANSACTION_STATS_INDEX, get_collection_stats
+from ..services.stats_counters import rebuild_stats, get_materialized_stats
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FUNCTIONS = ('CreateAsset', 'TransferAsset', 'UpdateAsset', 'DeleteAsset', 'CreateAssetsBatch')
+STATUSES = ('success', 'success', 'success', 'failed', 'pending')
+
+
+def sequential_stats(db, since, top_owners=5):
+    """The per-figure queries /api/dashboard/stats sent before the $facet pipelines"""
+    return {
+        'assets_total': db.assets.count_documents({}),
+        'assets_active': db.assets.count_documents({'status': 'active'}),
+        'transactions_total': db.transactions.count_documents({}),
+        'transactions_success': db.transactions.count_documents({'status': 'success'}),
+        'transactions_failed': db.transactions.count_documents({'status': 'failed'}),
+        'transactions_pending': db.transactions.count_documents({'status': 'pending'}),
+        'assets_recent': db.assets.count_documents({'created_at': {'$gte': since}}),
+        'transactions_recent': db.transactions.count_documents({'timestamp': {'$gte': since}}),
+        'top_owners': list(db.assets.aggregate([
+            {'$group': {'_id': '$owner', 'asset_count': {'$sum': 1}, 'total_value': {'$sum': '$appraised_value'}}},
+            {'$sort': {'total_value': -1}},
+            {'$limit': top_owners}
+        ]))
+    }
+
+def seed(db, count, owners=500, batch_size=10000):
+    """Replace the assets and transactions of db with count synthetic documents each"""
+    db.assets.drop()
+    db.transactions.drop()
+    db.assets.create_index(ASSET_STATS_INDEX)
+    db.transactions.create_index(TRANSACTION_STATS_INDEX)
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        db.assets.insert_many([{
+            'asset_id': f'bench{start + i}',
+            'color': rng.choice(('red', 'blue', 'green')),
+            'size': rng.randint(1, 20),
+            'owner': f'owner{rng.randrange(owners)}',
+            'appraised_value': rng.randint(100, 10000),
+            'status': 'active' if rng.random() < 0.9 else 'transferred',
+            'created_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+            'updated_at': now
+        } for i in range(size)], ordered=False)
+        db.transactions.insert_many([{
+            'tx_id': f'bench_tx{start + i}',
+            'function_name': rng.choice(FUNCTIONS),
+            'args': [f'bench{start + i}'],
+            'status': rng.choice(STATUSES),
+            'timestamp': now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+        } for i in range(size)], ordered=False)
+    rebuild_stats(db)
+    logger.info(f"Seeded {count} assets and {count} transactions")
+
+def measure(function, runs, warmup=2):
+    """Latencies in milliseconds of runs calls (after warmup calls)"""
+    for _ in range(warmup):
+        function()
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+def summarize(latencies):
+    """median / p95 / max of latencies in milliseconds"""
+    ordered = sorted(latencies)
+    return {
+        'median': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1]
+    }
+
+
+def main():
+    """Main function for standalone execution"""
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard statistics queries')
+    parser.add_argument('--db', default=os.getenv('MONGO_DB', 'ibn_blockchain'))
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Replace the assets and transactions of --db with this many synthetic documents each')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv('MONGODB_URI') or os.getenv('MONGO_URI', 'mongodb://localhost:27017/'))
+    try:
+        db = client[args.db]
+        if args.seed:
+            seed(db, args.seed)
+        elif db.stats.find_one({'_id': 'dashboard'}) is None:
+            logger.warning("No materialized stats in this database, run with --seed or python -m app.utils.rebuild_stats first")
+
+        since = datetime.utcnow() - timedelta(hours=24)
+        strategies = (
+            ('sequential', lambda: sequential_stats(db, since)),
+            ('facet', lambda: get_collection_stats(db, since)),
+            ('materialized', lambda: get_materialized_stats(db, since))
+        )
+        logger.info(f"{db.assets.estimated_document_count()} assets, "
+                    f"{db.transactions.estimated_document_count()} transactions, {args.runs} runs")
+        for name, function in strategies:
+            summary = summarize(measure(function, args.runs))
+            logger.info(f"{name:>12}: median {summary['median']:.2f} ms, "
+                        f"p95 {summary['p95']:.2f} ms, max {summary['max']:.2f} ms")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from ..models.user import User
 from ..models.role import Role
 from ..models.permission import Permission
 from ..models.user_session import UserSession
+from ..services.stats_counters import rebuild_stats
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -89,10 +90,36 @@ class DatabaseInitializer:
         self._create_index_safe(sessions_collection, "expires_at")
         self._create_index_safe(sessions_collection, "is_active")
         self._create_index_safe(sessions_collection, "created_at")
+        self._create_index_safe(sessions_collection, "revoked_at", sparse=True)
         # TTL index for automatic cleanup of expired sessions
         self._create_index_safe(sessions_collection, "expires_at", expireAfterSeconds=0)
         logger.info("✅ User Sessions collection created")
         
+        # Assets collection: statistics and live feed indexes
+        assets_collection = self.db.assets
+        self._create_index_safe(assets_collection, "asset_id", unique=True)
+        self._create_index_safe(assets_collection,
+                                [("status", 1), ("owner", 1), ("appraised_value", 1), ("created_at", 1)])
+        # Live feed polling fallback
+        self._create_index_safe(assets_collection, [("updated_at", 1), ("_id", 1)])
+        logger.info("✅ Assets collection created")
+        
+        # Transactions collection: keyset pagination (newest first) for each filter shape
+        transactions_collection = self.db.transactions
+        self._create_index_safe(transactions_collection, "tx_id", unique=True)
+        self._create_index_safe(transactions_collection, "fabric_tx_id", sparse=True)
+        self._create_index_safe(transactions_collection, [("timestamp", -1), ("_id", -1)])
+        self._create_index_safe(transactions_collection, [("status", 1), ("timestamp", -1), ("_id", -1)])
+        self._create_index_safe(transactions_collection, [("function_name", 1), ("timestamp", -1), ("_id", -1)])
+        self._create_index_safe(transactions_collection,
+                                [("status", 1), ("function_name", 1), ("timestamp", -1), ("_id", -1)])
+        logger.info("✅ Transactions collection created")
+        
+        # Materialized dashboard statistics: daily documents expire, owners read by value
+        self._create_index_safe(self.db.stats, "expires_at", expireAfterSeconds=0)
+        self._create_index_safe(self.db.owner_stats, [("total_value", -1)])
+        logger.info("✅ Stats collections created")
+        
         # Projects collection (for future use)
         projects_collection = self.db.projects
         self._create_index_safe(projects_collection, "project_id", unique=True)
@@ -253,6 +280,9 @@ class DatabaseInitializer:
             if create_admin:
                 self.create_default_admin()
             
+            # Step 5: Build the materialized dashboard stats
+            rebuild_stats(self.db)
+            
             logger.info("🎉 Database initialization completed successfully!")
             
             # Print summary
@@ -0,0 +1,155 @@
+"""
+Fake Docker Engine API server cho local development và testing
+Serves the exec endpoints used by DockerEngineClient on a unix socket and
+runs the requested argv as a local process, so the Engine API transport
+can be exercised without a Docker daemon.
+
+Usage:
+    python -m app.utils.fake_docker_engine --socket /tmp/docker.sock
+    DOCKER_TRANSPORT=engine DOCKER_SOCKET=/tmp/docker.sock python app.py
+"""
+
+import argparse
+import json
+import os
+import re
+import socketserver
+import struct
+import subprocess
+import threading
+import uuid
+import logging
+from http.server import BaseHTTPRequestHandler
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FakeDockerEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket HTTP server implementing exec create/start/inspect"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, containers=None):
+        """
+        Args:
+            socket_path (str): Path of the unix socket to listen on
+            containers (list): Container names accepted, any name when None
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.containers = containers
+        self.execs = {}
+        self.connections = 0
+        self._lock = threading.Lock()
+        super().__init__(socket_path, FakeDockerEngineHandler)
+
+    def serve_in_background(self):
+        """Start serving in a daemon thread and return it"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Fake Docker Engine listening on {self.socket_path}")
+        return thread
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class FakeDockerEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self._read_json()
+
+        match = re.fullmatch(r'/v[\d.]+/containers/([^/]+)/exec', self.path)
+        if match:
+            container = match.group(1)
+            if self.server.containers is not None and container not in self.server.containers:
+                return self._send_json(404, {'message': f'No such container: {container}'})
+            exec_id = uuid.uuid4().hex
+            with self.server._lock:
+                self.server.execs[exec_id] = {'argv': body.get('Cmd', []), 'exit_code': None, 'running': False}
+            return self._send_json(201, {'Id': exec_id})
+
+        match = re.fullmatch(r'/v[\d.]+/exec/([^/]+)/start', self.path)
+        if match:
+            exec_state = self.server.execs.get(match.group(1))
+            if exec_state is None:
+                return self._send_json(404, {'message': 'No such exec instance'})
+            return self._start_exec(exec_state)
+
+        self._send_json(404, {'message': 'page not found'})
+
+    def _start_exec(self, exec_state):
+        exec_state['running'] = True
+        try:
+            result = subprocess.run(exec_state['argv'], capture_output=True)
+            exit_code, stdout, stderr = result.returncode, result.stdout, result.stderr
+        except OSError as e:
+            exit_code, stdout, stderr = 126, b'', f'exec failed: {e}\n'.encode()
+        exec_state.update(exit_code=exit_code, running=False)
+
+        # Hijacked raw stream: no length, multiplexed frames, connection closed at the end
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.docker.raw-stream')
+        self.end_headers()
+        for stream_type, payload in ((1, stdout), (2, stderr)):
+            if payload:
+                self.wfile.write(struct.pack('>BxxxL', stream_type, len(payload)) + payload)
+        self.close_connection = True
+
+    def do_GET(self):
+        match = re.fullmatch(r'/v[\d.]+/exec/([^/]+)/json', self.path)
+        if match:
+            exec_state = self.server.execs.get(match.group(1))
+            if exec_state is None:
+                return self._send_json(404, {'message': 'No such exec instance'})
+            return self._send_json(200, {
+                'ID': match.group(1),
+                'Running': exec_state['running'],
+                'ExitCode': exec_state['exit_code']
+            })
+
+        self._send_json(404, {'message': 'page not found'})
+
+
+def main():
+    """Main function for standalone execution"""
+    parser = argparse.ArgumentParser(description='Fake Docker Engine API on a unix socket')
+    parser.add_argument('--socket', default='/tmp/docker.sock')
+    args = parser.parse_args()
+
+    server = FakeDockerEngine(args.socket)
+    logger.info(f"Fake Docker Engine listening on {args.socket}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Rebuild the materialized dashboard statistics
+Recomputes the counters in `stats` and `owner_stats` from the assets and
+transactions collections, e.g. after a restore, a manual data fix, or to
+correct drift. Writes made while it runs may be missed; run it again or
+during a quiet period if exact figures matter.
+
+Usage:
+    python -m app.utils.rebuild_stats
+"""
+
+import logging
+
+from ..services.mongo_pool import get_client, get_database
+from ..services.stats_counters import rebuild_stats
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function for standalone execution"""
+    # Same MONGODB_URI / MONGO_DB the API uses
+    try:
+        rebuild_stats(get_database())
+    finally:
+        get_client().close()
+
+
+if __name__ == "__main__":
+    main()
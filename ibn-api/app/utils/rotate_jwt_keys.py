@@ -0,0 +1,44 @@
+"""
+JWT key rotation cho Authentication
+Adds a new signing key to JWT_KEYS_DIR. Running workers publish it in the
+JWKS after their next key reload (JWT_KEYS_RELOAD_INTERVAL) and start
+signing with it once JWT_KEY_ACTIVATION_DELAY has passed. Keys
+replaced longer ago than the refresh token lifetime are deleted, since no
+token signed with them can still be valid.
+
+Usage:
+    python -m app.utils.rotate_jwt_keys --algorithm EdDSA
+"""
+
+import argparse
+import os
+import logging
+
+from ..services.jwt_keys import JWTKeyRing, ASYMMETRIC_ALGORITHMS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function for standalone execution"""
+    parser = argparse.ArgumentParser(description='Rotate the JWT signing key')
+    parser.add_argument('--algorithm', choices=ASYMMETRIC_ALGORITHMS,
+                        default=os.getenv('JWT_ALGORITHM', 'EdDSA'))
+    parser.add_argument('--keys-dir', default=None)
+    parser.add_argument('--prune-after-days', type=float, default=31,
+                        help='Delete keys replaced more than this many days ago (refresh tokens last 30)')
+    args = parser.parse_args()
+
+    key_ring = JWTKeyRing(args.algorithm, keys_dir=args.keys_dir)
+    kid = key_ring.rotate()
+    logger.info(f"New signing key: {kid} (signs in {key_ring.activation_delay:.0f}s)")
+
+    removed = key_ring.prune(args.prune_after_days * 86400)
+    for old_kid in removed:
+        logger.info(f"Removed expired key: {old_kid}")
+
+
+if __name__ == "__main__":
+    main()
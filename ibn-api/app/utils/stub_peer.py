@@ -0,0 +1,378 @@
+"""
+Stand-in gateway peer cho local development và testing
+Implements the Fabric Gateway calls used by GatewayClient on top of an
+in-memory copy of the ibn-basic chaincode, so the gateway transport can
+be exercised without a running Fabric network. Messages are the same
+fabric-protos encodings a peer exchanges and every proposal, transaction
+and commit status request must carry a valid signature of its creator;
+endorsement policies and MSP membership are not checked.
+
+Usage:
+    python -m app.utils.stub_peer --port 7051 --write-identity /tmp/stub-msp
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from concurrent import futures
+
+import grpc
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.x509.oid import NameOID
+
+from ..services import fabric_protos
+from ..services.fabric_gateway import GATEWAY_SERVICE
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ChaincodeError(Exception):
+    """Error returned by the simulated chaincode"""
+
+
+class IbnBasicChaincode:
+    """Python port of chaincode/ibn-basic/ibn-basic.go working on a read/write set"""
+
+    def __init__(self, state, writes):
+        self.state = state
+        self.writes = writes
+
+    def _get(self, key):
+        if key in self.writes:
+            return self.writes[key]
+        return self.state.get(key)
+
+    def _put(self, key, asset):
+        self.writes[key] = json.dumps(asset)
+
+    def InitLedger(self):
+        assets = [
+            ('asset1', 'blue', 5, 'Tomoko', 300),
+            ('asset2', 'red', 5, 'Brad', 400),
+            ('asset3', 'green', 10, 'Jin Soo', 500),
+            ('asset4', 'yellow', 10, 'Max', 600),
+            ('asset5', 'black', 15, 'Adriana', 700),
+            ('asset6', 'white', 15, 'Michel', 800),
+        ]
+        for asset_id, color, size, owner, value in assets:
+            self._put(asset_id, self._asset(asset_id, color, size, owner, value))
+        return ''
+
+    @staticmethod
+    def _asset(asset_id, color, size, owner, appraised_value):
+        return {
+            'ID': asset_id,
+            'color': color,
+            'size': int(size),
+            'owner': owner,
+            'appraisedValue': int(appraised_value)
+        }
+
+    def CreateAsset(self, asset_id, color, size, owner, appraised_value):
+        if self.AssetExists(asset_id) == 'true':
+            raise ChaincodeError(f'the asset {asset_id} already exists')
+        self._put(asset_id, self._asset(asset_id, color, size, owner, appraised_value))
+        return ''
+
+    def CreateAssets(self, assets_json):
+        results = []
+        seen = set()
+        for asset in json.loads(assets_json):
+            result = {'ID': asset.get('ID', ''), 'created': False}
+            results.append(result)
+            if not result['ID']:
+                result['error'] = 'asset ID is required'
+            elif result['ID'] in seen:
+                result['error'] = f"the asset {result['ID']} is duplicated in the batch"
+            elif self.state.get(result['ID']) is not None:
+                result['error'] = f"the asset {result['ID']} already exists"
+            else:
+                seen.add(result['ID'])
+                self._put(result['ID'], self._asset(result['ID'], asset.get('color'), asset.get('size', 0),
+                                                    asset.get('owner'), asset.get('appraisedValue', 0)))
+                result['created'] = True
+        return json.dumps(results)
+
+    def ReadAsset(self, asset_id):
+        asset_json = self._get(asset_id)
+        if asset_json is None:
+            raise ChaincodeError(f'the asset {asset_id} does not exist')
+        return asset_json
+
+    def UpdateAsset(self, asset_id, color, size, owner, appraised_value):
+        if self.AssetExists(asset_id) != 'true':
+            raise ChaincodeError(f'the asset {asset_id} does not exist')
+        self._put(asset_id, self._asset(asset_id, color, size, owner, appraised_value))
+        return ''
+
+    def DeleteAsset(self, asset_id):
+        if self.AssetExists(asset_id) != 'true':
+            raise ChaincodeError(f'the asset {asset_id} does not exist')
+        self.writes[asset_id] = None
+        return ''
+
+    def AssetExists(self, asset_id):
+        return 'true' if self._get(asset_id) is not None else 'false'
+
+    def TransferAsset(self, asset_id, new_owner):
+        asset = json.loads(self.ReadAsset(asset_id))
+        old_owner = asset['owner']
+        asset['owner'] = new_owner
+        self._put(asset_id, asset)
+        return old_owner
+
+    def GetAllAssets(self):
+        keys = sorted(k for k in self.state if self.state[k] is not None)
+        return json.dumps([json.loads(self.state[k]) for k in keys])
+
+    def GetAssetsWithPagination(self, page_size, bookmark):
+        keys = sorted(k for k in self.state if self.state[k] is not None and k >= bookmark)
+        page = keys[:int(page_size)]
+        return json.dumps({
+            'records': [json.loads(self.state[k]) for k in page],
+            'fetchedRecordsCount': len(page),
+            'bookmark': keys[int(page_size)] if len(keys) > int(page_size) else ''
+        })
+
+
+class StubPeer:
+    """In-memory peer + orderer implementing the gateway service"""
+
+    def __init__(self, block_time=0.0, chaincode_name='ibn-basic'):
+        """
+        Args:
+            block_time (float): Artificial delay before a submitted transaction commits
+            chaincode_name (str): Name the simulated chaincode is deployed under
+        """
+        self.block_time = block_time
+        self.chaincode_name = chaincode_name
+        self.state = {}
+        self.blocks = []
+        self.prepared = {}
+        self.statuses = {}
+        self._lock = threading.Condition()
+
+    @staticmethod
+    def _verify(creator, message, signature):
+        """Check a signature against the certificate of the serialized creator identity"""
+        try:
+            _, certificate = fabric_protos.parse_identity(creator)
+            public_key = x509.load_pem_x509_certificate(certificate).public_key()
+            if isinstance(public_key, ed25519.Ed25519PublicKey):
+                public_key.verify(signature, message)
+            else:
+                public_key.verify(signature, message, ec.ECDSA(hashes.SHA256()))
+            return True
+        except (ValueError, InvalidSignature):
+            return False
+
+    def _query_system_chaincode(self, function, args):
+        """Subset of qscc"""
+        with self._lock:
+            if function == 'GetChainInfo':
+                return fabric_protos.blockchain_info(len(self.blocks))
+            if function == 'GetBlockByNumber' and len(args) == 2:
+                number = int(args[1])
+                if 0 <= number < len(self.blocks):
+                    return self.blocks[number]
+                raise ChaincodeError(f'block {number} not found')
+        raise ChaincodeError(f'function {function} not found')
+
+    def _execute(self, chaincode, args):
+        """Run a chaincode function, returns (result bytes, writes)"""
+        function, args = args[0].decode('utf-8'), [arg.decode('utf-8') for arg in args[1:]]
+        if chaincode == 'qscc':
+            return self._query_system_chaincode(function, args), {}
+        if chaincode != self.chaincode_name:
+            raise ChaincodeError(f"chaincode {chaincode} not found")
+
+        writes = {}
+        with self._lock:
+            contract = IbnBasicChaincode(dict(self.state), writes)
+        method = getattr(contract, function, None)
+        if method is None or function.startswith('_'):
+            raise ChaincodeError(f"function {function} not found")
+        try:
+            result = method(*args)
+        except TypeError as e:
+            raise ChaincodeError(f'incorrect number of arguments: {e}')
+        return result.encode('utf-8'), writes
+
+    def _proposal(self, request, context):
+        """Decode and authenticate the signed proposal of an Evaluate/Endorse request"""
+        try:
+            _, _, signed_proposal = fabric_protos.parse_gateway_request(request)
+            proposal = fabric_protos.parse_signed_proposal(signed_proposal)
+        except (fabric_protos.ProtoError, UnicodeDecodeError) as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f'failed to unpack proposal: {e}')
+        if not self._verify(proposal['creator'], proposal['proposal_bytes'], proposal['signature']):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'access denied: proposal signature is not valid')
+        if proposal['tx_id'] != fabric_protos.transaction_id(proposal['nonce'], proposal['creator']):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"invalid txID {proposal['tx_id']}")
+        if not proposal['args']:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'no function name in proposal')
+        return proposal
+
+    def Evaluate(self, request, context):
+        proposal = self._proposal(request, context)
+        try:
+            result, _ = self._execute(proposal['chaincode'], proposal['args'])
+        except ChaincodeError as e:
+            # A real gateway reports chaincode errors of an evaluation as UNKNOWN
+            context.abort(grpc.StatusCode.UNKNOWN, f'evaluate call to endorser returned error: {e}')
+        return fabric_protos.evaluate_response(200, '', result)
+
+    def Endorse(self, request, context):
+        proposal = self._proposal(request, context)
+        try:
+            result, writes = self._execute(proposal['chaincode'], proposal['args'])
+        except ChaincodeError as e:
+            context.abort(grpc.StatusCode.ABORTED, f'failed to endorse transaction: {e}')
+
+        with self._lock:
+            self.prepared[proposal['tx_id']] = writes
+        return fabric_protos.endorse_response(fabric_protos.endorsed_payload(proposal, writes, result))
+
+    def Submit(self, request, context):
+        try:
+            tx_id, _, envelope = fabric_protos.parse_gateway_request(request)
+            payload, signature = fabric_protos.parse_envelope(envelope)
+            header = fabric_protos.parse_payload_header(payload)
+        except (fabric_protos.ProtoError, UnicodeDecodeError) as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f'failed to unpack transaction: {e}')
+        if header['tx_id'] != tx_id or not self._verify(header['creator'], payload, signature):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'transaction signature is not valid')
+        with self._lock:
+            writes = self.prepared.pop(tx_id, None)
+        if writes is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f'transaction {tx_id} was not endorsed')
+
+        threading.Thread(target=self._commit, args=(tx_id, envelope, writes), daemon=True).start()
+        return b''
+
+    def _commit(self, tx_id, envelope, writes):
+        if self.block_time:
+            time.sleep(self.block_time)
+        with self._lock:
+            for key, value in writes.items():
+                if value is None:
+                    self.state.pop(key, None)
+                else:
+                    self.state[key] = value
+            block_number = len(self.blocks)
+            previous_hash = hashlib.sha256(self.blocks[-1]).digest() if self.blocks else b''
+            self.blocks.append(fabric_protos.block(block_number, previous_hash, [envelope], [0]))
+            self.statuses[tx_id] = (0, block_number)
+            self._lock.notify_all()
+
+    def CommitStatus(self, request, context):
+        try:
+            status_request, signature, tx_id, _, identity = fabric_protos.parse_signed_commit_status_request(request)
+        except (fabric_protos.ProtoError, UnicodeDecodeError) as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f'failed to unpack request: {e}')
+        if not self._verify(identity, status_request, signature):
+            context.abort(grpc.StatusCode.PERMISSION_DENIED, 'commit status request signature is not valid')
+        with self._lock:
+            if not self._lock.wait_for(lambda: tx_id in self.statuses, timeout=context.time_remaining()):
+                context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, f'commit status of {tx_id} not available')
+            code, block_number = self.statuses[tx_id]
+        return fabric_protos.commit_status_response(code, block_number)
+
+    def seed(self, identity, function, *args):
+        """Endorse, sign and commit a transaction directly (e.g. InitLedger before serving)"""
+        tx_id, proposal_bytes = fabric_protos.proposal('mychannel', self.chaincode_name,
+                                                       [function, *args], identity.creator)
+        proposal = fabric_protos.parse_signed_proposal(
+            fabric_protos.signed_proposal(proposal_bytes, identity.sign(proposal_bytes))
+        )
+        result, writes = self._execute(self.chaincode_name, proposal['args'])
+        payload = fabric_protos.endorsed_payload(proposal, writes, result)
+        self._commit(tx_id, fabric_protos.envelope(payload, identity.sign(payload)), writes)
+        return tx_id
+
+    def handler(self):
+        """Build the generic gRPC handler for the gateway service"""
+        methods = {
+            name: grpc.unary_unary_rpc_method_handler(getattr(self, name))
+            for name in ('Evaluate', 'Endorse', 'Submit', 'CommitStatus')
+        }
+        return grpc.method_handlers_generic_handler(GATEWAY_SERVICE, methods)
+
+    def serve(self, port=7051, max_workers=16):
+        """Start the gRPC server on localhost and return it"""
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        server.add_generic_rpc_handlers((self.handler(),))
+        bound_port = server.add_insecure_port(f'127.0.0.1:{port}')
+        server.start()
+        self.port = bound_port
+        logger.info(f"Stub peer listening on 127.0.0.1:{bound_port}")
+        return server
+
+
+def create_test_identity(msp_dir, msp_id='IbnMSP', common_name='Admin@ibn.ictu.edu.vn'):
+    """
+    Write a self-signed P-256 client identity in MSP layout (signcerts/, keystore/)
+
+    Returns:
+        SigningIdentity: The identity, also loadable with FABRIC_MSP_DIR=msp_dir
+    """
+    from ..services.fabric_gateway import SigningIdentity
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=365))
+        .sign(private_key, hashes.SHA256())
+    )
+    for directory in ('signcerts', 'keystore'):
+        os.makedirs(os.path.join(msp_dir, directory), exist_ok=True)
+    with open(os.path.join(msp_dir, 'signcerts', 'cert.pem'), 'wb') as cert_file:
+        cert_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(os.path.join(msp_dir, 'keystore', 'priv_sk'), 'wb') as key_file:
+        key_file.write(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    return SigningIdentity.from_msp_dir(msp_id, msp_dir)
+
+
+def main():
+    """Main function for standalone execution"""
+    parser = argparse.ArgumentParser(description='Stand-in Fabric gateway peer')
+    parser.add_argument('--port', type=int, default=7051)
+    parser.add_argument('--block-time', type=float, default=0.0)
+    parser.add_argument('--init-ledger', action='store_true')
+    parser.add_argument('--write-identity', metavar='MSP_DIR',
+                        help='Write a client identity to use with FABRIC_MSP_DIR')
+    args = parser.parse_args()
+
+    peer = StubPeer(block_time=args.block_time)
+    if args.write_identity or args.init_ledger:
+        identity = create_test_identity(args.write_identity or os.path.join('/tmp', 'stub-peer-msp'))
+        if args.init_ledger:
+            peer.seed(identity, 'InitLedger')
+
+    server = peer.serve(port=args.port)
+    server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,14 +14,27 @@ db.assets.createIndex({ "asset_id": 1 }, { unique: true });
 db.assets.createIndex({ "owner": 1 });
 db.assets.createIndex({ "created_at": 1 });
 db.assets.createIndex({ "status": 1 });
+// Live feed polling fallback when change streams are unavailable (app/services/live_feed.py)
+db.assets.createIndex({ "updated_at": 1, "_id": 1 });
+// Covers the $facet statistics pipeline (app/services/stats_service.py)
+db.assets.createIndex({ "status": 1, "owner": 1, "appraised_value": 1, "created_at": 1 });
 
 db.transactions.createIndex({ "tx_id": 1 }, { unique: true });
-db.transactions.createIndex({ "timestamp": 1 });
-db.transactions.createIndex({ "function_name": 1 });
-db.transactions.createIndex({ "status": 1 });
+// Fabric ID of transactions logged under a local handle (block listener reconciliation)
+db.transactions.createIndex({ "fabric_tx_id": 1 }, { sparse: true });
+// Keyset pagination (newest first) for each filter shape of GET /api/transactions/
+db.transactions.createIndex({ "timestamp": -1, "_id": -1 });
+db.transactions.createIndex({ "status": 1, "timestamp": -1, "_id": -1 });
+db.transactions.createIndex({ "function_name": 1, "timestamp": -1, "_id": -1 });
+db.transactions.createIndex({ "status": 1, "function_name": 1, "timestamp": -1, "_id": -1 });
+// ...which also covers the $facet statistics pipeline (app/services/stats_service.py)
 
 db.network_status.createIndex({ "timestamp": 1 });
 
+// Materialized dashboard statistics (app/services/stats_counters.py)
+db.stats.createIndex({ "expires_at": 1 }, { expireAfterSeconds: 0 });
+db.owner_stats.createIndex({ "total_value": -1 });
+
 // Insert sample data
 db.assets.insertMany([
     {
@@ -0,0 +1,15 @@
+"""
+Shared fixtures cho ibn-api tests
+"""
+
+import pytest
+
+from app.services import circuit_breaker
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Process-wide breakers must not carry failures from one test into the next"""
+    with circuit_breaker._breakers_lock:
+        circuit_breaker._breakers.clear()
+    yield
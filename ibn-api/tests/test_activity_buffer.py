@@ -0,0 +1,38 @@
+"""
+Tests cho the activity write-behind buffer
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+
+from app.services.activity_buffer import ActivityBuffer
+from app.services.auth_service import activity_tracking_enabled
+
+
+@pytest.fixture
+def users():
+    users = mongomock.MongoClient().ibn_blockchain.users
+    users.insert_one({'user_id': 'u1', 'last_activity': '2025-01-01T00:00:00+00:00'})
+    return users
+
+
+def test_timestamps_are_stored_as_utc_iso_strings(users):
+    buffer = ActivityBuffer(flush_interval_ms=60000)
+    later = datetime(2025, 1, 2, 9, 30, tzinfo=timezone(timedelta(hours=7)))
+    buffer.record(users, {'user_id': 'u1'}, {'last_activity': later})
+    buffer.flush()
+
+    assert users.find_one({'user_id': 'u1'})['last_activity'] == '2025-01-02T02:30:00+00:00'
+
+def test_older_flush_does_not_move_timestamps_back(users):
+    buffer = ActivityBuffer(flush_interval_ms=60000)
+    buffer.record(users, {'user_id': 'u1'}, {'last_activity': '2024-12-31T23:00:00Z'})
+    buffer.flush()
+
+    assert users.find_one({'user_id': 'u1'})['last_activity'] == '2025-01-01T00:00:00+00:00'
+
+def test_activity_tracking_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('ACTIVITY_TRACKING_ENABLED', raising=False)
+    assert not activity_tracking_enabled()
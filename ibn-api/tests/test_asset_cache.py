@@ -0,0 +1,37 @@
+"""
+Tests cho the bounded-staleness check of AssetCache
+"""
+
+import time
+
+import pytest
+
+from app.services import asset_cache as asset_cache_module
+from app.services.asset_cache import AssetCache
+
+
+class FakeAssetSync:
+    def __init__(self, synced_height, caught_up_at):
+        self.synced_height = synced_height
+        self._caught_up_at = caught_up_at
+
+    def is_running(self):
+        return True
+
+    def caught_up_at(self):
+        return self._caught_up_at
+
+@pytest.fixture
+def cache():
+    return AssetCache(blockchain_service=None, mongo=None, max_entries=10, max_staleness=5)
+
+
+def test_entry_at_the_synced_height_is_fresh_as_of_the_listener(cache, monkeypatch):
+    monkeypatch.setattr(asset_cache_module, 'get_asset_sync', lambda: FakeAssetSync(10, time.time()))
+    assert cache._is_fresh(time.time() - 60, 10, 5)
+    assert not cache._is_fresh(time.time() - 60, 9, 5)
+
+def test_unknown_chain_height_counts_as_stale(cache, monkeypatch):
+    monkeypatch.setattr(asset_cache_module, 'get_asset_sync', lambda: FakeAssetSync(None, time.time()))
+    assert not cache._is_fresh(time.time() - 60, 10, 5)
+    assert cache._is_fresh(time.time(), 10, 5)
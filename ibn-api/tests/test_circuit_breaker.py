@@ -0,0 +1,79 @@
+"""
+Tests cho CircuitBreaker
+"""
+
+import time
+
+import pytest
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+def make_breaker(**kwargs):
+    options = dict(failure_rate_threshold=0.5, slow_call_seconds=1, slow_call_rate_threshold=0.8,
+                   window_size=10, min_calls=4, open_seconds=0.05, half_open_probes=1)
+    options.update(kwargs)
+    return CircuitBreaker('test', **options)
+
+def fail():
+    raise RuntimeError('peer down')
+
+def test_stays_closed_below_min_calls():
+    breaker = make_breaker()
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == CLOSED
+
+def test_opens_on_failure_rate_and_rejects():
+    breaker = make_breaker()
+    breaker.call(lambda: 'ok')
+    breaker.call(lambda: 'ok')
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert error.value.retry_after > 0
+    assert breaker.get_status()['rejected'] == 1
+
+def test_failed_results_count_as_failures():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.call(lambda: {'success': False}, is_failure=lambda result: not result['success'])
+    assert breaker.is_open()
+
+def test_opens_on_slow_call_rate():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+def test_half_open_probe_closes_on_success():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 0)
+    time.sleep(0.06)
+
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow_request()
+    breaker.record(True, 0)
+    assert breaker.state == CLOSED
+    assert breaker.get_status()['window_calls'] == 0
+
+def test_half_open_probe_reopens_on_failure():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 0)
+    time.sleep(0.06)
+
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    assert breaker.is_open()
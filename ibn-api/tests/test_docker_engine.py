@@ -0,0 +1,109 @@
+"""
+Tests cho DockerEngineClient against the fake Docker Engine
+"""
+
+import struct
+import subprocess
+import sys
+
+import pytest
+
+from app.services import blockchain_service as blockchain_module
+from app.services.docker_engine import (
+    DockerEngineClient, DockerEngineError, DockerEngineTimeout, DockerEngineUnavailable, demux_stream,
+    get_docker_engine
+)
+from app.utils.fake_docker_engine import FakeDockerEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    server = FakeDockerEngine(str(tmp_path / 'docker.sock'), containers=['cli'])
+    server.serve_in_background()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(engine):
+    client = DockerEngineClient(socket_path=engine.socket_path, pool_size=2, timeout=10)
+    yield client
+    client.close()
+
+
+def test_demux_stream_splits_frames():
+    frames = b''.join(struct.pack('>BxxxL', stream, len(payload)) + payload
+                      for stream, payload in ((1, b'out1 '), (2, b'err'), (1, b'out2')))
+    assert demux_stream(frames) == (b'out1 out2', b'err')
+
+def test_exec_run_returns_exit_code_and_output(client):
+    exit_code, stdout, stderr = client.exec_run('cli', [
+        sys.executable, '-c', "import sys; print('peer chaincode query'); sys.stderr.write('warning'); sys.exit(3)"
+    ])
+    assert exit_code == 3
+    assert stdout == 'peer chaincode query\n'
+    assert stderr == 'warning'
+
+def test_exec_run_passes_arguments_without_a_shell(client):
+    _, stdout, _ = client.exec_run('cli', [sys.executable, '-c', 'import sys; print(sys.argv[1])', '{"Args":["$HOME"]}'])
+    assert stdout == '{"Args":["$HOME"]}\n'
+
+def test_keep_alive_connections_are_reused(client, engine):
+    for _ in range(3):
+        assert client.exec_run('cli', [sys.executable, '-c', 'pass'])[0] == 0
+    stats = client.get_stats()
+    assert stats['requests'] == 9
+    # One hijacked start connection per exec, create / inspect share a pooled one
+    assert stats['connections_opened'] == 4
+    assert engine.connections == 4
+
+def test_unknown_container_raises(client):
+    with pytest.raises(DockerEngineUnavailable, match='No such container'):
+        client.exec_run('missing', ['true'])
+
+def test_exec_timeout_raises(client):
+    with pytest.raises(DockerEngineTimeout):
+        client.exec_run('cli', [sys.executable, '-c', 'import time; time.sleep(2)'], timeout=0.3)
+
+def test_missing_socket_raises(tmp_path):
+    client = DockerEngineClient(socket_path=str(tmp_path / 'none.sock'))
+    with pytest.raises(DockerEngineUnavailable, match='unreachable'):
+        client.exec_run('cli', ['true'])
+
+
+class FailingEngine:
+    def __init__(self, error):
+        self.error = error
+
+    def exec_run(self, container, argv, timeout=None):
+        raise self.error
+
+@pytest.fixture
+def docker_exec_calls(monkeypatch):
+    calls = []
+    def run(command, **kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout='from docker exec', stderr='')
+    monkeypatch.setattr(blockchain_module.subprocess, 'run', run)
+    monkeypatch.setattr(blockchain_module, 'get_peer_session_pool', lambda container: None)
+    return calls
+
+def test_engine_unavailable_falls_back_to_docker_exec(monkeypatch, docker_exec_calls):
+    monkeypatch.setattr(blockchain_module, 'get_docker_engine',
+                        lambda: FailingEngine(DockerEngineUnavailable('Exec create failed (500): boom')))
+    result = blockchain_module.BlockchainService()._run_peer_command(['peer', 'version'])
+    assert result['success'] is True
+    assert result['output'] == 'from docker exec'
+    assert len(docker_exec_calls) == 1
+
+def test_engine_failure_after_start_is_not_rerun(monkeypatch, docker_exec_calls):
+    monkeypatch.setattr(blockchain_module, 'get_docker_engine',
+                        lambda: FailingEngine(DockerEngineError('Exec inspect failed (500): boom')))
+    result = blockchain_module.BlockchainService()._run_peer_command(['peer', 'version'])
+    assert result['success'] is False
+    assert 'Exec inspect failed' in result['error']
+    assert docker_exec_calls == []
+
+def test_engine_transport_is_opt_in(monkeypatch):
+    monkeypatch.delenv('DOCKER_TRANSPORT', raising=False)
+    assert get_docker_engine() is None
@@ -0,0 +1,161 @@
+"""
+Tests cho GatewayClient against the stub gateway peer
+"""
+
+import json
+import socket
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.services import fabric_protos
+from app.services.fabric_gateway import GatewayClient, SigningIdentity
+from app.utils.stub_peer import StubPeer, create_test_identity
+
+
+@pytest.fixture(scope='module')
+def identity(tmp_path_factory):
+    return create_test_identity(str(tmp_path_factory.mktemp('msp')))
+
+@pytest.fixture(scope='module')
+def peer(identity):
+    peer = StubPeer()
+    server = peer.serve(port=0)
+    peer.seed(identity, 'InitLedger')
+    yield peer
+    server.stop(None)
+
+@pytest.fixture
+def gateway(identity, peer):
+    client = GatewayClient(identity, [f'127.0.0.1:{peer.port}'], timeout=5, commit_timeout=5)
+    yield client
+    client.close()
+
+def unused_endpoint():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'127.0.0.1:{sock.getsockname()[1]}'
+
+
+def test_evaluate_reads_seeded_asset(gateway):
+    result = gateway.evaluate('ReadAsset', ['asset1'])
+    assert result['success']
+    assert json.loads(result['output'])['ID'] == 'asset1'
+    assert result['payload'] == result['output'].encode('utf-8')
+
+def test_evaluate_chaincode_error_is_not_unavailable(gateway):
+    result = gateway.evaluate('ReadAsset', ['missing-asset'])
+    assert not result['success']
+    assert not result['unavailable']
+    assert 'does not exist' in result['error']
+
+def test_submit_commits_and_updates_state(gateway):
+    result = gateway.submit('CreateAsset', ['gw-test-1', 'blue', 5, 'Alice', 300])
+    assert result['success'], result['error']
+    assert len(result['tx_id']) == 64
+    assert result['block_number'] >= 1
+
+    transferred = gateway.submit('TransferAsset', ['gw-test-1', 'Bob'])
+    assert transferred['success'], transferred['error']
+    assert json.loads(gateway.evaluate('ReadAsset', ['gw-test-1'])['output'])['owner'] == 'Bob'
+
+def test_endorsement_failure_is_reported(gateway):
+    result = gateway.submit('CreateAsset', ['asset1', 'blue', 5, 'Alice', 300])
+    assert not result['success']
+    assert not result['unavailable']
+    assert 'already exists' in result['error']
+
+def test_committed_block_is_readable_through_qscc(gateway, peer):
+    result = gateway.submit('CreateAsset', ['gw-test-2', 'red', 3, 'Carol', 100])
+    assert result['success'], result['error']
+
+    info = gateway.evaluate('GetChainInfo', ['mychannel'], chaincode_name='qscc')
+    assert fabric_protos.parse_blockchain_info(info['payload']) == len(peer.blocks)
+
+    raw_block = gateway.evaluate('GetBlockByNumber', ['mychannel', result['block_number']], chaincode_name='qscc')
+    block = fabric_protos.parse_block(raw_block['payload'], 'ibn-basic')
+    assert block['number'] == result['block_number']
+    (transaction,) = block['transactions']
+    assert transaction['tx_id'] == result['tx_id']
+    assert transaction['function'] == 'CreateAsset'
+    assert transaction['valid']
+    assert [write['key'] for write in transaction['writes']] == ['gw-test-2']
+
+def test_invalid_signature_is_rejected(identity, peer):
+    # Certificate of the real identity, signing key of another
+    impostor = SigningIdentity(identity.msp_id, identity.certificate, ec.generate_private_key(ec.SECP256R1()))
+    client = GatewayClient(impostor, [f'127.0.0.1:{peer.port}'], timeout=5)
+    try:
+        result = client.evaluate('ReadAsset', ['asset1'])
+    finally:
+        client.close()
+    assert not result['success']
+    assert not result['unavailable']
+    assert 'signature' in result['error']
+
+def test_fails_over_to_the_next_endpoint(identity, peer):
+    client = GatewayClient(identity, [unused_endpoint(), f'127.0.0.1:{peer.port}'], timeout=5)
+    try:
+        result = client.evaluate('ReadAsset', ['asset1'])
+    finally:
+        client.close()
+    assert result['success']
+
+def test_unreachable_gateway_is_unavailable(identity):
+    client = GatewayClient(identity, [unused_endpoint()], timeout=2)
+    try:
+        result = client.evaluate('ReadAsset', ['asset1'])
+    finally:
+        client.close()
+    assert not result['success']
+    assert result['unavailable']
+
+def test_commit_timeout_after_send_is_status_unknown(identity, peer):
+    client = GatewayClient(identity, [f'127.0.0.1:{peer.port}'], timeout=5, commit_timeout=0.2)
+    peer.block_time = 1
+    try:
+        result = client.submit('CreateAsset', ['gw-test-3', 'green', 1, 'Dave', 10])
+        assert not result['success']
+        assert result['status_unknown']
+        assert not result['unavailable']
+
+        # The transaction was sent once and commits, its status can be asked for again
+        settled = client.commit_status(result['tx_id'], timeout=5)
+        assert settled['success'] and settled['status'] == 'VALID'
+    finally:
+        peer.block_time = 0
+        client.close()
+
+def test_blockchain_service_does_not_resubmit_after_send(identity, peer, monkeypatch):
+    from app.services.blockchain_service import BlockchainService
+
+    service = BlockchainService(GatewayClient(identity, [f'127.0.0.1:{peer.port}'], timeout=5, commit_timeout=0.2))
+    cli_calls = []
+    monkeypatch.setattr(service, '_execute_peer_command', lambda command: cli_calls.append(command))
+    peer.block_time = 1
+    try:
+        result = service.transfer_asset('asset2', 'Erin')
+    finally:
+        peer.block_time = 0
+        service.gateway.close()
+    assert cli_calls == []
+    assert not result['success']
+    assert result['status_unknown'] and len(result['tx_id']) == 64
+
+def test_init_ledger_route_stores_the_seeded_assets(gateway, monkeypatch):
+    import mongomock
+    from app import create_app, mongo
+    from app.routes import assets as assets_routes
+    from app.services import mongo_pool
+    from app.services.blockchain_service import BlockchainService
+
+    monkeypatch.setattr(mongo_pool, 'MongoClient', mongomock.MongoClient)
+    monkeypatch.setattr(mongo_pool, '_client', None)
+    monkeypatch.setattr(assets_routes, 'blockchain_service', BlockchainService(gateway))
+    app = create_app()
+
+    response = app.test_client().post('/api/assets/init-ledger')
+    assert response.status_code == 200
+    owners = {doc['asset_id']: doc['owner'] for doc in mongo.db.assets.find()}
+    assert owners['asset1'] == 'Tomoko' and len(owners) == 6
+    assert mongo.db.stats.find_one({'_id': 'dashboard'})['assets']['total'] == 6
@@ -0,0 +1,66 @@
+"""
+Tests cho PeerSessionPool and the BlockchainService session fallback
+"""
+
+import subprocess
+
+import pytest
+
+from app.services import blockchain_service as blockchain_module
+from app.services.peer_session_pool import PeerSessionPool, SessionError, SessionUnavailable
+
+
+@pytest.fixture
+def pool():
+    pool = PeerSessionPool('cli', size=1, argv=['sh'])
+    yield pool
+    pool.close()
+
+
+def test_execute_runs_on_a_persistent_session(pool):
+    assert pool.execute('echo one') == (0, 'one\n', '')
+    assert pool.execute('echo two >&2; exit 4') == (4, '', 'two\n')
+    assert pool.get_stats()['sessions'] == 1
+
+def test_session_that_cannot_start_is_unavailable():
+    pool = PeerSessionPool('cli', size=1, argv=['/nonexistent/sh'])
+    with pytest.raises(SessionUnavailable, match='Cannot start session'):
+        pool.execute('echo ok')
+
+def test_session_exiting_after_the_command_was_sent_is_not_unavailable(pool):
+    with pytest.raises(SessionError) as excinfo:
+        pool.execute('kill -9 $$', timeout=5)
+    assert not isinstance(excinfo.value, SessionUnavailable)
+
+
+class FailingPool:
+    def __init__(self, error):
+        self.error = error
+
+    def execute(self, command, timeout=30):
+        raise self.error
+
+@pytest.fixture
+def docker_exec_calls(monkeypatch):
+    calls = []
+    def run(command, **kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout='from docker exec', stderr='')
+    monkeypatch.setattr(blockchain_module.subprocess, 'run', run)
+    monkeypatch.setattr(blockchain_module, 'get_docker_engine', lambda: None)
+    return calls
+
+def test_unavailable_session_falls_back_to_docker_exec(monkeypatch, docker_exec_calls):
+    monkeypatch.setattr(blockchain_module, 'get_peer_session_pool',
+                        lambda container: FailingPool(SessionUnavailable('No session available')))
+    result = blockchain_module.BlockchainService()._run_peer_command(['peer', 'version'])
+    assert result['success'] is True
+    assert len(docker_exec_calls) == 1
+
+def test_session_failure_after_send_is_not_rerun(monkeypatch, docker_exec_calls):
+    monkeypatch.setattr(blockchain_module, 'get_peer_session_pool',
+                        lambda container: FailingPool(SessionError('Session exited')))
+    result = blockchain_module.BlockchainService()._run_peer_command(['peer', 'version'])
+    assert result['success'] is False
+    assert result['error'] == 'Session exited'
+    assert docker_exec_calls == []
@@ -0,0 +1,100 @@
+"""
+Tests cho SingleFlight
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def run_concurrently(group, key, fn, callers):
+    results, errors = [], []
+
+    def caller():
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+def wait_for_callers(group, callers):
+    # Every caller has joined the in-flight call before it is released
+    while group.get_stats()['calls'] < callers:
+        time.sleep(0.001)
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def query():
+        executions.append(1)
+        release.wait(5)
+        return {'success': True, 'data': [1, 2]}
+
+    threads, results, errors = run_concurrently(group, ('ReadAsset', 'asset1'), query, 5)
+    wait_for_callers(group, 5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert executions == [1]
+    assert errors == []
+    assert results == [{'success': True, 'data': [1, 2]}] * 5
+    stats = group.get_stats()
+    assert stats['executions'] == 1
+    assert stats['coalesced'] == 4
+    assert stats['coalesced_by_function'] == {'ReadAsset': 4}
+    assert stats['in_flight'] == 0
+
+def test_callers_get_independent_copies():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def query():
+        release.wait(5)
+        return {'data': []}
+
+    threads, results, _ = run_concurrently(group, ('GetAllAssets',), query, 2)
+    wait_for_callers(group, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    results[0]['data'].append('changed')
+    assert results[1] == {'data': []}
+
+def test_error_is_raised_to_every_waiting_caller():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def query():
+        release.wait(5)
+        raise RuntimeError('peer down')
+
+    threads, results, errors = run_concurrently(group, ('ReadAsset', 'asset1'), query, 3)
+    wait_for_callers(group, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == []
+    assert len(errors) == 3 and all(isinstance(error, RuntimeError) for error in errors)
+
+def test_different_keys_and_later_calls_execute_again():
+    group = SingleFlight()
+    assert group.do(('ReadAsset', 'a'), lambda: 1) == 1
+    assert group.do(('ReadAsset', 'b'), lambda: 2) == 2
+    assert group.do(('ReadAsset', 'a'), lambda: 3) == 3
+    assert group.get_stats()['executions'] == 3
+
+    with pytest.raises(ValueError):
+        group.do(('ReadAsset', 'a'), lambda: int('x'))
+    assert group.do(('ReadAsset', 'a'), lambda: 4) == 4
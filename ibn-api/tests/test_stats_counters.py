@@ -0,0 +1,128 @@
+"""
+Tests cho the materialized dashboard counters
+"""
+
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from app.services import stats_counters
+from app.services.stats_counters import (
+    apply_update, find_before, record_asset_changes, record_transaction_changes,
+    rebuild_stats, get_materialized_stats, ASSET_STATS_FIELDS, TRANSACTION_STATS_FIELDS
+)
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().ibn_blockchain
+
+def today():
+    return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+def asset(asset_id, owner, value, status='active', created_at=None):
+    return {'asset_id': asset_id, 'owner': owner, 'appraised_value': value, 'status': status,
+            'created_at': created_at or datetime.utcnow()}
+
+def transaction(tx_id, function_name, status, timestamp=None):
+    return {'tx_id': tx_id, 'function_name': function_name, 'status': status,
+            'timestamp': timestamp or datetime.utcnow()}
+
+def write_assets(db, docs):
+    """Upsert assets the way the write paths do, reporting the diffs"""
+    before = find_before(db.assets, 'asset_id', [doc['asset_id'] for doc in docs], ASSET_STATS_FIELDS)
+    changes = []
+    for doc in docs:
+        update = {'$set': {key: value for key, value in doc.items() if key != 'created_at'},
+                  '$setOnInsert': {'created_at': doc['created_at']}}
+        db.assets.update_one({'asset_id': doc['asset_id']}, update, upsert=True)
+        changes.append((before.get(doc['asset_id']), apply_update(before.get(doc['asset_id']), update)))
+    record_asset_changes(db, changes)
+
+def write_transactions(db, docs):
+    before = find_before(db.transactions, 'tx_id', [doc['tx_id'] for doc in docs], TRANSACTION_STATS_FIELDS)
+    changes = []
+    for doc in docs:
+        update = {'$set': doc}
+        db.transactions.update_one({'tx_id': doc['tx_id']}, update, upsert=True)
+        changes.append((before.get(doc['tx_id']), apply_update(before.get(doc['tx_id']), update)))
+    record_transaction_changes(db, changes)
+
+
+def test_apply_update_keeps_set_on_insert_for_new_documents_only():
+    update = {'$set': {'owner': 'Bob'}, '$setOnInsert': {'status': 'active'}}
+    assert apply_update(None, update) == {'owner': 'Bob', 'status': 'active'}
+    assert apply_update({'owner': 'Alice', 'status': 'transferred'}, update) == \
+        {'owner': 'Bob', 'status': 'transferred'}
+
+def test_create_and_transfer_move_owner_totals(db):
+    rebuild_stats(db)
+    write_assets(db, [asset('a1', 'Alice', 100), asset('a2', 'Alice', 50), asset('a3', 'Bob', 10)])
+    write_assets(db, [asset('a1', 'Bob', 100, status='transferred')])
+
+    owners = {doc['_id']: (doc['asset_count'], doc['total_value']) for doc in db.owner_stats.find()}
+    assert owners == {'Alice': (1, 50), 'Bob': (2, 110)}
+    stats = db.stats.find_one({'_id': 'dashboard'})
+    assert stats['assets'] == {'total': 3, 'active': 2}
+
+def test_transaction_status_change_moves_counts(db):
+    rebuild_stats(db)
+    write_transactions(db, [transaction('t1', 'CreateAsset', 'pending'), transaction('t2', None, 'failed')])
+    write_transactions(db, [transaction('t1', 'CreateAsset', 'success')])
+
+    stats = db.stats.find_one({'_id': 'dashboard'})
+    assert stats['transactions'] == {'total': 2, 'pending': 0, 'failed': 1, 'success': 1}
+    assert stats['functions']['CreateAsset'] == {'count': 1, 'success_count': 1}
+    # Zero deltas are not written
+    assert stats['functions'][stats_counters.UNKNOWN_FUNCTION] == {'count': 1}
+
+def test_counters_match_a_rebuild(db):
+    rebuild_stats(db)
+    write_assets(db, [asset(f'a{i}', f'owner{i % 3}', i * 10) for i in range(10)])
+    write_assets(db, [asset('a1', 'owner2', 10, status='transferred'), asset('a10', 'owner0', 5)])
+    write_transactions(db, [transaction(f't{i}', 'CreateAsset', ('success', 'failed', 'pending')[i % 3])
+                            for i in range(9)])
+    write_transactions(db, [transaction('t2', 'CreateAsset', 'success')])
+
+    incremental = get_materialized_stats(db, today())
+    rebuild_stats(db)
+    assert get_materialized_stats(db, today()) == incremental
+
+def test_daily_counts_only_for_the_day_written(db):
+    rebuild_stats(db)
+    old = datetime.utcnow() - timedelta(days=3)
+    write_assets(db, [asset('old', 'Alice', 1, created_at=old), asset('new', 'Alice', 1)])
+    write_transactions(db, [transaction('old', 'CreateAsset', 'success', timestamp=old),
+                            transaction('new', 'CreateAsset', 'success')])
+
+    asset_stats, transaction_stats = get_materialized_stats(db, today())
+    assert asset_stats['recent_24h'] == 1
+    assert transaction_stats['recent_24h'] == 1
+
+def test_reads_before_the_first_rebuild_aggregate_the_collections(db):
+    db.assets.insert_many([asset(f'a{i}', 'Alice', 10) for i in range(5)])
+    write_assets(db, [asset('a5', 'Bob', 10)])
+    assert 'rebuilt_at' not in db.stats.find_one({'_id': 'dashboard'})
+
+    asset_stats, _ = get_materialized_stats(db, today())
+    assert asset_stats['total'] == 6
+    assert [owner['_id'] for owner in asset_stats['top_owners']] == ['Alice', 'Bob']
+    # The request does not rebuild, that is left to database_init / rebuild_stats
+    assert 'rebuilt_at' not in db.stats.find_one({'_id': 'dashboard'})
+
+def test_rebuild_replaces_owner_stats(db):
+    write_assets(db, [asset('a1', 'Alice', 10), asset('a2', 'Bob', 5)])
+    db.owner_stats.insert_one({'_id': 'Gone', 'asset_count': 1, 'total_value': 1})
+    rebuild_stats(db)
+    rebuild_stats(db)
+
+    owners = {doc['_id']: (doc['asset_count'], doc['total_value']) for doc in db.owner_stats.find()}
+    assert owners == {'Alice': (1, 10), 'Bob': (1, 5)}
+
+def test_counter_failures_do_not_raise(db, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('write failed')
+    monkeypatch.setattr(stats_counters, '_write', fail)
+    record_asset_changes(db, [(None, asset('a1', 'Alice', 1))])
+    record_transaction_changes(db, [(None, transaction('t1', 'CreateAsset', 'success'))])
@@ -0,0 +1,73 @@
+"""
+Tests cho the transactions listing cursor (keyset on timestamp, _id)
+"""
+
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from app import create_app, mongo
+from app.routes.transactions import _encode_cursor, _decode_cursor
+from app.services import mongo_pool
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(mongo_pool, 'MongoClient', mongomock.MongoClient)
+    monkeypatch.setattr(mongo_pool, '_client', None)
+    app = create_app()
+    start = datetime(2025, 1, 1)
+    # Pairs of transactions share a timestamp, so pages must break ties on _id
+    mongo.db.transactions.insert_many([
+        {'tx_id': f'tx{i}', 'function_name': 'CreateAsset' if i % 3 else 'TransferAsset',
+         'status': 'success', 'timestamp': start + timedelta(minutes=i // 2)}
+        for i in range(25)
+    ])
+    return app.test_client()
+
+def list_all(client, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        body = client.get('/api/transactions/', query_string=query).get_json()
+        assert body['success']
+        pages.append([tx['tx_id'] for tx in body['data']])
+        cursor = body['next']
+        assert body['has_more'] == (cursor is not None)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    tx_doc = {'timestamp': datetime(2025, 3, 4, 5, 6, 7, 890000), '_id': ObjectId()}
+    cursor = _encode_cursor(tx_doc)
+    assert '=' not in cursor and '+' not in cursor and '/' not in cursor
+    assert _decode_cursor(cursor) == {'$or': [
+        {'timestamp': {'$lt': tx_doc['timestamp']}},
+        {'timestamp': tx_doc['timestamp'], '_id': {'$lt': tx_doc['_id']}}
+    ]}
+
+@pytest.mark.parametrize('cursor', ['not-base64!', 'e30', 'eyJ0IjogIngiLCAiaSI6ICJ5In0'])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        _decode_cursor(cursor)
+
+def test_pages_cover_every_transaction_once_newest_first(client):
+    pages = list_all(client, limit=4)
+    assert [len(page) for page in pages] == [4] * 6 + [1]
+    ids = [tx_id for page in pages for tx_id in page]
+    assert sorted(ids) == sorted(f'tx{i}' for i in range(25))
+
+    timestamps = [mongo.db.transactions.find_one({'tx_id': tx_id})['timestamp'] for tx_id in ids]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+def test_pages_follow_the_filter(client):
+    ids = [tx_id for page in list_all(client, limit=3, function='TransferAsset') for tx_id in page]
+    assert sorted(ids) == sorted(f'tx{i}' for i in range(0, 25, 3))
+
+def test_invalid_cursor_is_a_bad_request(client):
+    response = client.get('/api/transactions/', query_string={'cursor': 'e30'})
+    assert response.status_code == 400
+    assert not response.get_json()['success']